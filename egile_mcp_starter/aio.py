@@ -0,0 +1,114 @@
+"""Run blocking generation work from asyncio code.
+
+Rendering and file system work run on a thread pool shared by every event
+loop and every call, whose size is the maximum number of generations running
+at once: further calls wait for a free slot without blocking their loop.
+Synchronous callers such as the generation server take slots from the same
+pool with ``run_in_slot``, so a single limit applies to the whole process.
+
+Cancelling an awaiting task stops its generation at the next step (for
+instance between two rendered files) and waits for it to clean up, so no
+staging directory or slot is left behind once the cancellation propagates.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+# Default number of generations running at the same time
+DEFAULT_MAX_CONCURRENCY = 4
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+_executor_lock = threading.Lock()
+
+
+class GenerationCancelled(Exception):
+    """Raised in a worker thread to stop a generation whose caller gave up."""
+
+
+def get_max_concurrency() -> int:
+    """Get the maximum number of generations running at once."""
+    return _max_concurrency
+
+
+def set_max_concurrency(limit: int) -> None:
+    """Set the maximum number of generations running at once.
+
+    Generations already running or waiting for a slot finish under the
+    previous limit.
+
+    Args:
+        limit: Maximum number of concurrent generations
+
+    Raises:
+        ValueError: If the limit is not positive
+    """
+    global _executor, _max_concurrency
+
+    if limit < 1:
+        raise ValueError(f"Concurrency limit must be positive, got {limit}")
+    with _executor_lock:
+        if _executor is not None and limit != _max_concurrency:
+            _executor.shutdown(wait=False)
+            _executor = None
+        _max_concurrency = limit
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared generation thread pool, created on first use."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_concurrency, thread_name_prefix="egile-generate"
+            )
+        return _executor
+
+
+def run_in_slot(func: Callable[[], T]) -> T:
+    """Run a blocking function in a generation slot, waiting for its result.
+
+    Must not be called from a generation slot, which would wait for itself
+    once every slot is taken.
+
+    Args:
+        func: Function called in a worker thread
+
+    Returns:
+        The result of ``func``
+    """
+    return _get_executor().submit(func).result()
+
+
+async def run_cancellable(func: Callable[[threading.Event], T]) -> T:
+    """Run a blocking function in a generation slot.
+
+    Args:
+        func: Function called in a worker thread with an event set when the
+            caller is cancelled; it should check it regularly and raise
+            ``GenerationCancelled`` once set
+
+    Returns:
+        The result of ``func``
+
+    Raises:
+        asyncio.CancelledError: If the caller is cancelled
+    """
+    cancelled = threading.Event()
+    work = _get_executor().submit(func, cancelled)
+    try:
+        return await asyncio.wrap_future(work)
+    except asyncio.CancelledError:
+        # A pending call never starts; a running one stops at its next step
+        cancelled.set()
+        if not work.cancel():
+            try:
+                await asyncio.wrap_future(work)
+            except Exception:
+                pass
+        raise
@@ -0,0 +1,180 @@
+"""Streaming of generated projects into zip and tar.gz archives."""
+
+import os
+import tarfile
+import time
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from typing import IO, Iterator, List, NamedTuple, Optional
+
+# Archive formats supported by ArchiveWriter
+FORMATS = ("zip", "tar.gz")
+
+
+class ArchiveMember(NamedTuple):
+    """A file or directory to add to an archive."""
+
+    path: str  # POSIX path inside the archive
+    content: Optional[bytes]  # None for directories
+    mode: int = 0o644
+
+
+def archive_format(path: str) -> str:
+    """Infer the archive format from a file name.
+
+    Args:
+        path: Archive file name
+
+    Returns:
+        One of ``FORMATS``
+
+    Raises:
+        ValueError: If the extension is not supported
+    """
+    name = str(path).lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tar.gz"
+    raise ValueError(
+        f"Cannot infer the archive format of '{path}'. "
+        f"Supported formats: {', '.join(FORMATS)}"
+    )
+
+
+class ChunkSink:
+    """Write-only file object buffering bytes until they are drained.
+
+    It is not seekable, so archive writers stream into it sequentially.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty sink."""
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        """Buffer written bytes."""
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """Nothing to flush; data is kept until drained."""
+
+    def drain(self) -> Iterator[bytes]:
+        """Yield and forget the bytes written so far.
+
+        Yields:
+            A single chunk, if anything was written since the last drain
+        """
+        if self._chunks:
+            chunk = b"".join(self._chunks)
+            self._chunks.clear()
+            yield chunk
+
+
+class ArchiveWriter:
+    """Write members one at a time into a zip or tar.gz stream.
+
+    The target only needs a ``write`` method; it is never seeked, so sockets,
+    HTTP response bodies and ``ChunkSink`` all work. Only the member being
+    added is held in memory.
+    """
+
+    def __init__(self, fileobj: IO[bytes], fmt: str = "zip") -> None:
+        """Start an archive.
+
+        Args:
+            fileobj: Binary file object receiving the archive
+            fmt: One of ``FORMATS``
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if fmt not in FORMATS:
+            raise ValueError(
+                f"Unsupported archive format '{fmt}'. "
+                f"Supported formats: {', '.join(FORMATS)}"
+            )
+        self.format = fmt
+        self._mtime = time.time()
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        if fmt == "zip":
+            self._zip = zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED)
+        else:
+            self._tar = tarfile.open(fileobj=fileobj, mode="w|gz")
+
+    def add(self, member: ArchiveMember) -> None:
+        """Append a file or directory to the archive.
+
+        Args:
+            member: Member to add
+        """
+        if self._zip is not None:
+            self._add_zip(self._zip, member)
+        elif self._tar is not None:
+            self._add_tar(self._tar, member)
+
+    def _add_zip(self, archive: zipfile.ZipFile, member: ArchiveMember) -> None:
+        date_time = time.localtime(self._mtime)[:6]
+        if member.content is None:
+            info = zipfile.ZipInfo(member.path.rstrip("/") + "/", date_time)
+            info.external_attr = (0o40000 | 0o755) << 16 | 0x10
+            archive.writestr(info, b"")
+            return
+        info = zipfile.ZipInfo(member.path, date_time)
+        info.external_attr = (0o100000 | member.mode) << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        archive.writestr(info, member.content)
+
+    def _add_tar(self, archive: tarfile.TarFile, member: ArchiveMember) -> None:
+        info = tarfile.TarInfo(member.path)
+        info.mtime = int(self._mtime)
+        if member.content is None:
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            archive.addfile(info)
+            return
+        info.mode = member.mode
+        info.size = len(member.content)
+        archive.addfile(info, BytesIO(member.content))
+
+    def close(self) -> None:
+        """Write the archive trailer. The target file object is left open."""
+        if self._zip is not None:
+            self._zip.close()
+        elif self._tar is not None:
+            self._tar.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def iter_directory(project_path: Path) -> Iterator[ArchiveMember]:
+    """List a project directory on disk as archive members, in sorted order.
+
+    Files are read one at a time as the members are consumed.
+
+    Args:
+        project_path: Project directory; its name prefixes every member
+
+    Yields:
+        The project directory, its subdirectories and its files
+    """
+    prefix = Path(project_path).name
+    yield ArchiveMember(prefix, None)
+    for root, dirs, files in os.walk(project_path):
+        dirs.sort()
+        relative = Path(root).relative_to(project_path).as_posix()
+        base = prefix if relative == "." else f"{prefix}/{relative}"
+        for name in dirs:
+            yield ArchiveMember(f"{base}/{name}", None)
+        for name in sorted(files):
+            path = Path(root) / name
+            mode = path.stat().st_mode & 0o777
+            yield ArchiveMember(f"{base}/{name}", path.read_bytes(), mode)
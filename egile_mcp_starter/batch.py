@@ -0,0 +1,215 @@
+"""Batch generation of many projects from a manifest."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional
+
+import yaml  # type: ignore
+
+if TYPE_CHECKING:
+    from .plugins.isolation import HookFailure, HookLimits, HookPool
+
+
+class BatchEntry(NamedTuple):
+    """A single project to generate in a batch."""
+
+    template: str
+    context: Dict[str, Any]
+    output_dir: str
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating a single batch entry."""
+
+    entry: BatchEntry
+    project_path: Optional[Path] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    hook_failure: Optional["HookFailure"] = None  # Set if an isolated hook failed
+
+    @property
+    def ok(self) -> bool:
+        """Whether the entry was generated successfully."""
+        return self.error is None
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """Load a batch manifest file.
+
+    The manifest is a YAML mapping with a ``projects`` list. Every project
+    may set ``template``, ``context`` and ``output_dir``; missing values are
+    taken from the optional ``defaults`` mapping. Relative output directories
+    are resolved against the directory containing the manifest.
+
+    Example::
+
+        max_workers: 8
+        defaults:
+          template: mcp
+          output_dir: generated
+          context:
+            author_name: Platform Team
+        projects:
+          - context: {project_name: Team A Server}
+          - template: rag
+            context: {project_name: Team B Search, vector_db: qdrant}
+
+    Args:
+        manifest_path: Path to the manifest file
+
+    Returns:
+        Dictionary with the parsed ``entries`` and optional ``max_workers``
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    path = Path(manifest_path)
+    with open(path, encoding="utf-8") as fh:
+        data = yaml.safe_load(fh) or {}
+
+    if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+        raise ValueError(f"Manifest '{manifest_path}' must define a 'projects' list")
+
+    defaults = data.get("defaults") or {}
+    base_dir = path.resolve().parent
+    entries = []
+    for index, project in enumerate(data["projects"]):
+        if not isinstance(project, dict):
+            raise ValueError(f"Manifest project #{index} must be a mapping")
+
+        context = dict(defaults.get("context") or {})
+        context.update(project.get("context") or {})
+        output_dir = Path(project.get("output_dir", defaults.get("output_dir", ".")))
+        entries.append(
+            BatchEntry(
+                template=project.get("template", defaults.get("template", "mcp")),
+                context=context,
+                output_dir=str(base_dir / output_dir),
+            )
+        )
+
+    return {"entries": entries, "max_workers": data.get("max_workers")}
+
+
+# Per-process state shared by every entry a worker renders
+_worker_options: Dict[str, Any] = {}
+_hook_pool: Optional["HookPool"] = None
+
+
+def _init_worker(
+    options: Dict[str, Any], hook_limits: Optional["HookLimits"] = None
+) -> None:
+    """Warm up a worker process: build the registry and resolve template paths."""
+    from .plugins.registry import get_registry
+
+    global _hook_pool
+    _worker_options.clear()
+    _worker_options.update(options)
+    if hook_limits is not None:
+        from .plugins.isolation import HookPool
+
+        # Hook workers live as long as this process, across entries
+        _hook_pool = HookPool(hook_limits)
+
+    registry = get_registry()
+    for name in registry.get_plugin_names():
+        registry.get_template_path(name)
+
+
+def _generate_entry(entry: BatchEntry) -> BatchResult:
+    """Generate one batch entry in the current process."""
+    from .generator import MCPProjectGenerator
+
+    entry = BatchEntry(*entry)
+    start = time.perf_counter()
+    try:
+        generator = MCPProjectGenerator(
+            output_dir=entry.output_dir,
+            no_input=True,
+            template=entry.template,
+            extra_context=entry.context,
+            hook_pool=_hook_pool,
+            **_worker_options,
+        )
+        project_path = generator.generate()
+    except Exception as e:
+        return BatchResult(
+            entry,
+            error=str(e),
+            duration=time.perf_counter() - start,
+            hook_failure=_find_hook_failure(e),
+        )
+
+    return BatchResult(entry, project_path, duration=time.perf_counter() - start)
+
+
+def _find_hook_failure(error: BaseException) -> Optional["HookFailure"]:
+    """Get the isolated hook failure that caused an error, if any."""
+    from .plugins.isolation import HookError
+
+    cause: Optional[BaseException] = error
+    while cause is not None:
+        if isinstance(cause, HookError):
+            return cause.failure
+        cause = cause.__cause__
+    return None
+
+
+def _close_hook_pool() -> None:
+    """Stop the hook workers of the current process."""
+    global _hook_pool
+    if _hook_pool is not None:
+        _hook_pool.close()
+        _hook_pool = None
+
+
+def run_batch(
+    entries: Iterable[BatchEntry],
+    max_workers: Optional[int] = None,
+    config_file: Optional[str] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    engine: str = "cookiecutter",
+    hook_limits: Optional["HookLimits"] = None,
+) -> List[BatchResult]:
+    """Generate batch entries, in parallel when more than one worker is useful.
+
+    Args:
+        entries: ``(template, context, output_dir)`` entries to generate
+        max_workers: Number of worker processes (default: CPU count)
+        config_file: Path to cookiecutter config file
+        use_cache: Reuse previously rendered projects
+        cache_dir: Override the render cache location
+        engine: Rendering engine used by every worker
+        hook_limits: Run the hooks of external plugins isolated under these
+            limits, in hook workers each batch worker starts once and reuses
+
+    Returns:
+        One result per entry, in the order the entries were given
+    """
+    batch = [BatchEntry(*entry) for entry in entries]
+    options = {
+        "config_file": config_file,
+        "use_cache": use_cache,
+        "cache_dir": cache_dir,
+        "engine": engine,
+    }
+    workers = min(max_workers or os.cpu_count() or 1, len(batch))
+
+    if workers <= 1:
+        _init_worker(options, hook_limits)
+        try:
+            return [_generate_entry(entry) for entry in batch]
+        finally:
+            _close_hook_pool()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(options, hook_limits),
+    ) as executor:
+        return list(executor.map(_generate_entry, batch))
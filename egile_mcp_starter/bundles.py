@@ -0,0 +1,503 @@
+"""Templates shipped as single-file bundles.
+
+A template plugin's ``get_template_path()`` may return either a template
+directory containing ``cookiecutter.json`` or a bundle: a zip archive of that
+directory's contents. The archive's central directory is the file index, so
+the in-memory renderer reads members directly from the bundle, with random
+access and without extracting anything.
+
+Both layouts are accessed through ``TemplateSource``. Loose directories keep
+working unchanged, which is what development checkouts use. Bundles are
+created with ``create_bundle`` (or ``egile-mcp-starter bundle``). The
+cookiecutter engine only renders directories, so it gets a bundle extracted
+once per bundle content under the cache root.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import stat
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from binaryornot import helpers as binary_helpers
+from binaryornot.check import is_binary
+from jinja2 import BaseLoader, Environment, FileSystemLoader, TemplateNotFound
+
+from .cache import get_cache_root, hash_directory
+from .fastcopy import copy_file, copy_stream
+
+BUNDLE_SUFFIX = ".zip"
+
+# Timestamp of every bundle member, so bundles of identical templates match
+_BUNDLE_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+def is_bundle(path: Path) -> bool:
+    """Check whether a template path points at a bundle.
+
+    Args:
+        path: Value returned by ``TemplatePlugin.get_template_path``
+
+    Returns:
+        True for a zip file, False for a directory (or anything else)
+    """
+    return Path(path).is_file() and zipfile.is_zipfile(path)
+
+
+class TemplateSource(ABC):
+    """Read-only access to the files of a template.
+
+    Paths are POSIX paths relative to the template directory (the one
+    containing ``cookiecutter.json``), with ``""`` for the directory itself.
+    """
+
+    def __init__(self, location: Path) -> None:
+        """Initialize the source.
+
+        Args:
+            location: Template directory or bundle
+        """
+        self.location = Path(location)
+
+    @abstractmethod
+    def read_bytes(self, path: str) -> bytes:
+        """Read a file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        pass
+
+    @abstractmethod
+    def open(self, path: str) -> IO[bytes]:
+        """Open a file for reading in binary mode.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        pass
+
+    @abstractmethod
+    def size(self, path: str) -> int:
+        """Size of a file in bytes."""
+        pass
+
+    @abstractmethod
+    def mode(self, path: str) -> int:
+        """Permission bits of a file."""
+        pass
+
+    @abstractmethod
+    def signature(self, path: str) -> Tuple[int, int]:
+        """A pair of numbers that changes whenever the file content may have."""
+        pass
+
+    @abstractmethod
+    def is_binary(self, path: str) -> bool:
+        """Check whether a file is binary, as ``binaryornot`` decides."""
+        pass
+
+    @abstractmethod
+    def listdir(self, path: str) -> Tuple[List[str], List[str]]:
+        """Names of the subdirectories and files of a directory, sorted.
+
+        Raises:
+            FileNotFoundError: If the directory does not exist
+        """
+        pass
+
+    @abstractmethod
+    def digest(self) -> str:
+        """Content hash of the whole template."""
+        pass
+
+    @abstractmethod
+    def loader(self, search_path: List[str]) -> BaseLoader:
+        """Create a Jinja loader for templates below some directories.
+
+        Args:
+            search_path: Directories searched in order, relative to the
+                template directory
+        """
+        pass
+
+    def copy_to(self, path: str, destination: Path, mode: Optional[int] = None) -> None:
+        """Copy a file verbatim without holding it in memory.
+
+        Args:
+            path: File to copy
+            destination: File to create or truncate
+            mode: Permission bits of the destination
+        """
+        with self.open(path) as fsrc:
+            copy_stream(fsrc, destination, mode)
+
+    def is_dir(self, path: str) -> bool:
+        """Check whether a directory exists."""
+        try:
+            self.listdir(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        return True
+
+    def walk(self, path: str = "") -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Walk a directory top-down, like ``os.walk``.
+
+        Removing names from the yielded directory list prunes the walk.
+
+        Args:
+            path: Directory to walk
+
+        Yields:
+            Directory path, its subdirectory names and its file names
+        """
+        dirs, files = self.listdir(path)
+        yield path, dirs, files
+        for name in dirs:
+            yield from self.walk(f"{path}/{name}" if path else name)
+
+
+# ``(path, mode, size, mtime_ns)`` of every file of a template directory
+_Snapshot = List[Tuple[str, int, int, int]]
+
+# Digests of template directories, with the snapshot they were computed for
+_directory_digests: Dict[Path, Tuple[_Snapshot, str]] = {}
+
+
+def _snapshot_directory(path: Path) -> _Snapshot:
+    """Record the metadata of the files ``hash_directory`` reads."""
+    snapshot = []
+    for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+        info = file_path.stat()
+        relative = file_path.relative_to(path).as_posix()
+        snapshot.append((relative, info.st_mode, info.st_size, info.st_mtime_ns))
+    return snapshot
+
+
+class DirectorySource(TemplateSource):
+    """A template made of loose files in a directory."""
+
+    def _path(self, path: str) -> Path:
+        return self.location / path if path else self.location
+
+    def read_bytes(self, path: str) -> bytes:
+        return self._path(path).read_bytes()
+
+    def open(self, path: str) -> IO[bytes]:
+        return open(self._path(path), "rb")
+
+    def size(self, path: str) -> int:
+        return os.stat(self._path(path)).st_size
+
+    def copy_to(self, path: str, destination: Path, mode: Optional[int] = None) -> None:
+        copy_file(self._path(path), destination, mode)
+
+    def mode(self, path: str) -> int:
+        return stat.S_IMODE(os.stat(self._path(path)).st_mode)
+
+    def signature(self, path: str) -> Tuple[int, int]:
+        info = os.stat(self._path(path))
+        return info.st_mtime_ns, info.st_size
+
+    def is_binary(self, path: str) -> bool:
+        return bool(is_binary(str(self._path(path))))
+
+    def listdir(self, path: str) -> Tuple[List[str], List[str]]:
+        dirs: List[str] = []
+        files: List[str] = []
+        with os.scandir(self._path(path)) as entries:
+            for entry in entries:
+                (dirs if entry.is_dir() else files).append(entry.name)
+        return sorted(dirs), sorted(files)
+
+    def digest(self) -> str:
+        # Hashing large verbatim assets on every cache lookup would cost about
+        # as much as rendering: reuse the digest until a file changes
+        snapshot = _snapshot_directory(self.location)
+        cached = _directory_digests.get(self.location)
+        if cached is not None and cached[0] == snapshot:
+            return cached[1]
+        digest = hash_directory(self.location)
+        _directory_digests[self.location] = (snapshot, digest)
+        return digest
+
+    def loader(self, search_path: List[str]) -> BaseLoader:
+        return FileSystemLoader([str(self._path(path)) for path in search_path])
+
+
+class BundleSource(TemplateSource):
+    """A template packed into a single zip bundle.
+
+    The central directory is read once; members are then read on demand.
+    Reads are serialized on a lock, so a source can be shared by render
+    threads.
+    """
+
+    def __init__(self, location: Path) -> None:
+        super().__init__(location)
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(self.location)
+        self._members: Dict[str, zipfile.ZipInfo] = {}
+        self._dirs: Dict[str, Tuple[Set[str], Set[str]]] = {"": (set(), set())}
+        for info in self._zip.infolist():
+            name = info.filename.rstrip("/")
+            parts = name.split("/")
+            for depth in range(1, len(parts)):
+                parent, child = "/".join(parts[: depth - 1]), parts[depth - 1]
+                self._dirs[parent][0].add(child)
+                self._dirs.setdefault("/".join(parts[:depth]), (set(), set()))
+            parent = "/".join(parts[:-1])
+            if info.is_dir():
+                self._dirs[parent][0].add(parts[-1])
+                self._dirs.setdefault(name, (set(), set()))
+            else:
+                self._dirs[parent][1].add(parts[-1])
+                self._members[name] = info
+        self._digest: Optional[str] = None
+
+    def _info(self, path: str) -> zipfile.ZipInfo:
+        try:
+            return self._members[path]
+        except KeyError:
+            raise FileNotFoundError(f"'{path}' is not in bundle '{self.location}'")
+
+    def read_bytes(self, path: str) -> bytes:
+        info = self._info(path)
+        with self._lock:
+            return self._zip.read(info)
+
+    def open(self, path: str) -> IO[bytes]:
+        info = self._info(path)
+        with self._lock:
+            return self._zip.open(info)
+
+    def size(self, path: str) -> int:
+        return self._info(path).file_size
+
+    def mode(self, path: str) -> int:
+        return stat.S_IMODE(self._info(path).external_attr >> 16) or 0o644
+
+    def signature(self, path: str) -> Tuple[int, int]:
+        info = self._info(path)
+        return info.CRC, info.file_size
+
+    def is_binary(self, path: str) -> bool:
+        has_binary_extension: Optional[Callable[[str], bool]] = getattr(
+            binary_helpers, "has_binary_extension", None
+        )
+        if has_binary_extension is not None and has_binary_extension(path):
+            return True
+        chunk_size = getattr(binary_helpers, "CHUNK_SIZE", 1024)
+        with self._lock, self._zip.open(self._info(path)) as member:
+            chunk = member.read(chunk_size)
+        return bool(binary_helpers.is_binary_string(chunk))
+
+    def listdir(self, path: str) -> Tuple[List[str], List[str]]:
+        if path not in self._dirs:
+            if path in self._members:
+                raise NotADirectoryError(path)
+            raise FileNotFoundError(f"'{path}' is not in bundle '{self.location}'")
+        dirs, files = self._dirs[path]
+        return sorted(dirs), sorted(files)
+
+    def digest(self) -> str:
+        if self._digest is None:
+            digest = hashlib.sha256()
+            with open(self.location, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def loader(self, search_path: List[str]) -> BaseLoader:
+        return BundleLoader(self, search_path)
+
+
+class BundleLoader(BaseLoader):
+    """Jinja loader reading templates straight from a bundle."""
+
+    def __init__(self, source: BundleSource, search_path: List[str]) -> None:
+        """Initialize the loader.
+
+        Args:
+            source: Bundle to read from
+            search_path: Directories searched in order, relative to the
+                template directory
+        """
+        self.source = source
+        self.search_path = search_path
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> Tuple[str, Optional[str], Optional[Callable[[], bool]]]:
+        """Load a template's source from the bundle."""
+        for directory in self.search_path:
+            path = f"{directory}/{template}" if directory else template
+            try:
+                content = self.source.read_bytes(path)
+            except FileNotFoundError:
+                continue
+            filename = f"{self.source.location}/{path}"
+            return content.decode("utf-8"), filename, lambda: True
+        raise TemplateNotFound(template)
+
+
+_sources: Dict[Tuple[Path, int, int], TemplateSource] = {}
+
+
+def open_source(template_path: Path) -> TemplateSource:
+    """Open a template directory or bundle, reusing it within the process.
+
+    Bundles are reopened when their file changes.
+
+    Args:
+        template_path: Value returned by ``TemplatePlugin.get_template_path``
+
+    Returns:
+        The template source
+    """
+    location = Path(template_path).resolve()
+    if not is_bundle(location):
+        return DirectorySource(location)
+    info = location.stat()
+    key = (location, info.st_mtime_ns, info.st_size)
+    if key not in _sources:
+        _sources[key] = BundleSource(location)
+    return _sources[key]
+
+
+def resolve_template_path(template_dir: Path) -> Path:
+    """Locate a template shipped either loose or as a sibling bundle.
+
+    The loose directory wins when present (development checkouts), otherwise
+    ``<template_dir>.zip`` is used, as in distributions that only ship
+    bundles.
+
+    Args:
+        template_dir: Loose template directory
+
+    Returns:
+        The directory, or its bundle if only the bundle exists
+    """
+    template_dir = Path(template_dir)
+    if template_dir.is_dir():
+        return template_dir
+    bundle = template_dir.with_name(template_dir.name + BUNDLE_SUFFIX)
+    return bundle if bundle.is_file() else template_dir
+
+
+def create_bundle(template_dir: Path, bundle_path: Path) -> Path:
+    """Pack a template directory into a bundle.
+
+    Members are stored in sorted order with fixed timestamps and their
+    permission bits, so identical templates produce identical bundles.
+
+    Args:
+        template_dir: Template directory containing ``cookiecutter.json``
+        bundle_path: Bundle to create (overwritten if it exists)
+
+    Returns:
+        Path to the bundle
+
+    Raises:
+        ValueError: If the directory is not a cookiecutter template
+    """
+    template_dir = Path(template_dir)
+    if not (template_dir / "cookiecutter.json").is_file():
+        raise ValueError(f"'{template_dir}' has no cookiecutter.json")
+
+    source = DirectorySource(template_dir)
+    bundle_path = Path(bundle_path)
+    tmp = bundle_path.with_name(f".{bundle_path.name}.{os.getpid()}.tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as bundle:
+        for root, dirs, files in source.walk():
+            for name in dirs:
+                path = f"{root}/{name}" if root else name
+                info = zipfile.ZipInfo(f"{path}/", _BUNDLE_DATE)
+                info.external_attr = (stat.S_IFDIR | 0o755) << 16
+                bundle.writestr(info, b"")
+            for name in files:
+                path = f"{root}/{name}" if root else name
+                info = zipfile.ZipInfo(path, _BUNDLE_DATE)
+                info.external_attr = (stat.S_IFREG | source.mode(path)) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                bundle.writestr(info, source.read_bytes(path))
+    os.replace(tmp, bundle_path)
+    return bundle_path
+
+
+def materialize_template(template_path: Path) -> Path:
+    """Get a template directory for engines that need files on disk.
+
+    Directories are returned as is. Bundles are extracted once per content
+    into ``<cache root>/bundles/<digest>/``.
+
+    Args:
+        template_path: Value returned by ``TemplatePlugin.get_template_path``
+
+    Returns:
+        A template directory containing ``cookiecutter.json``
+    """
+    source = open_source(template_path)
+    if isinstance(source, DirectorySource):
+        return source.location
+
+    target = get_cache_root() / "bundles" / source.digest()[:32]
+    if (target / "cookiecutter.json").is_file():
+        return target
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        for root, dirs, files in source.walk():
+            (staging / root).mkdir(parents=True, exist_ok=True)
+            for name in files:
+                path = f"{root}/{name}" if root else name
+                (staging / path).write_bytes(source.read_bytes(path))
+                os.chmod(staging / path, source.mode(path))
+        try:
+            os.replace(staging, target)
+        except OSError:
+            if not (target / "cookiecutter.json").is_file():
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def read_template_file(template_path: Path, name: str) -> bytes:
+    """Read a top-level file of a template directory or bundle.
+
+    Args:
+        template_path: Value returned by ``TemplatePlugin.get_template_path``
+        name: File name, e.g. ``cookiecutter.json``
+
+    Returns:
+        The file content
+
+    Raises:
+        FileNotFoundError: If the template has no such file
+    """
+    return open_source(template_path).read_bytes(name)
+
+
+def detect_newline(content: bytes) -> Optional[str]:
+    """Detect the newline style of a template file like cookiecutter does.
+
+    Args:
+        content: Raw file content
+
+    Returns:
+        The newline style(s) seen while reading the first line, as reported by
+        a universal-newlines text stream
+    """
+    with io.TextIOWrapper(io.BytesIO(content), encoding="utf-8") as rd:
+        rd.readline()
+        newlines = rd.newlines
+    return newlines[0] if isinstance(newlines, tuple) else newlines
@@ -0,0 +1,265 @@
+"""On-disk, content-addressed cache of rendered projects."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fastcopy import copy2
+
+CACHE_DIR_ENV = "EGILE_MCP_STARTER_CACHE_DIR"
+DEFAULT_MAX_CACHE_SIZE = 512 * 1024 * 1024  # 512 MiB
+
+# Bumped whenever generated projects change shape (e.g. a new manifest file),
+# so that renders cached by older versions are not reused
+CACHE_FORMAT = 2
+
+_ENTRY_FILE = "entry.json"
+_PROJECT_DIR = "project"
+
+
+def get_cache_root() -> Path:
+    """Get the root directory shared by all egile-mcp-starter caches.
+
+    The location can be overridden with the ``EGILE_MCP_STARTER_CACHE_DIR``
+    environment variable and otherwise follows ``XDG_CACHE_HOME``.
+
+    Returns:
+        Path to the cache root (not necessarily existing yet)
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / "egile-mcp-starter"
+
+
+def hash_directory(path: Path) -> str:
+    """Compute a content hash of a directory tree.
+
+    The hash covers relative paths, file contents and the executable bit,
+    so any change that would alter the rendered output changes the hash.
+
+    Args:
+        path: Directory to hash
+
+    Returns:
+        Hex digest of the directory contents
+    """
+    digest = hashlib.sha256()
+    for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+        relative = file_path.relative_to(path).as_posix()
+        executable = os.access(file_path, os.X_OK)
+        digest.update(f"{relative}\0{int(executable)}\0".encode("utf-8"))
+        with open(file_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _config_digest(config_file: Optional[str]) -> str:
+    """Hash the cookiecutter user config that may feed default values."""
+    candidate = config_file or os.environ.get("COOKIECUTTER_CONFIG")
+    config_path = Path(candidate) if candidate else Path.home() / ".cookiecutterrc"
+    if not config_path.is_file():
+        return ""
+    return hashlib.sha256(config_path.read_bytes()).hexdigest()
+
+
+def compute_cache_key(
+    template_dir: Path,
+    plugin_version: str,
+    context: Dict[str, Any],
+    config_file: Optional[str] = None,
+    source_date_epoch: Optional[int] = None,
+) -> str:
+    """Compute the cache key for a render.
+
+    Args:
+        template_dir: Template directory or bundle returned by the plugin
+        plugin_version: Version of the template plugin
+        context: Final context after ``pre_generate_hook``
+        config_file: Optional cookiecutter config file
+        source_date_epoch: Epoch of a reproducible render, whose dates and
+            file metadata depend on it
+
+    Returns:
+        Hex digest identifying the render
+    """
+    from .bundles import open_source
+
+    payload = {
+        "format": CACHE_FORMAT,
+        "template": open_source(template_dir).digest(),
+        "plugin_version": plugin_version,
+        "context": context,
+        "config": _config_digest(config_file),
+    }
+    if source_date_epoch is not None:
+        payload["source_date_epoch"] = source_date_epoch
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _snapshot(project_dir: Path) -> Tuple[Dict[str, List[int]], int]:
+    """Record size and mtime of every file so tampering can be detected."""
+    files: Dict[str, List[int]] = {}
+    total = 0
+    for file_path in sorted(p for p in project_dir.rglob("*") if p.is_file()):
+        stat = file_path.stat()
+        files[file_path.relative_to(project_dir).as_posix()] = [
+            stat.st_size,
+            stat.st_mtime_ns,
+        ]
+        total += stat.st_size
+    return files, total
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered project trees.
+
+    Each entry lives in ``<root>/renders/<key>/`` and holds a pristine copy of
+    the rendered project plus a small ``entry.json`` describing it. Entries
+    are materialized into the output directory with ``fastcopy.copy2``, which
+    clones files where the file system supports reflinks and copies them
+    otherwise, so generated projects never share data with the cache or with
+    each other.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_size: int = DEFAULT_MAX_CACHE_SIZE,
+    ) -> None:
+        """Initialize the render cache.
+
+        Args:
+            root: Cache root directory (default: ``get_cache_root()``)
+            max_size: Maximum total size of cached files in bytes
+        """
+        self.root = Path(root) if root else get_cache_root()
+        self.renders_dir = self.root / "renders"
+        self.max_size = max_size
+
+    def get(self, key: str) -> Optional[Path]:
+        """Look up a cached render.
+
+        Args:
+            key: Cache key from ``compute_cache_key``
+
+        Returns:
+            Path to the cached project directory, or None on a miss
+        """
+        entry_dir = self.renders_dir / key
+        entry_file = entry_dir / _ENTRY_FILE
+        try:
+            entry = json.loads(entry_file.read_text(encoding="utf-8"))
+            project_dir = entry_dir / _PROJECT_DIR / str(entry["project_dir"])
+            files, _ = _snapshot(project_dir)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # An entry edited in place would silently change later projects
+        if files != entry["files"]:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        _touch(entry_file)  # Mark as recently used
+        return project_dir
+
+    def put(self, key: str, project_dir: Path) -> Optional[Path]:
+        """Store a freshly rendered project in the cache.
+
+        Args:
+            key: Cache key from ``compute_cache_key``
+            project_dir: Rendered project directory to copy into the cache
+
+        Returns:
+            Path to the cached project directory, or None if nothing was stored
+        """
+        project_dir = Path(project_dir)
+        if not project_dir.is_dir():
+            return None
+
+        self.renders_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.renders_dir))
+        try:
+            cached_project = staging / _PROJECT_DIR / project_dir.name
+            shutil.copytree(project_dir, cached_project, copy_function=copy2)
+            files, size = _snapshot(cached_project)
+            entry = {"project_dir": project_dir.name, "size": size, "files": files}
+            (staging / _ENTRY_FILE).write_text(json.dumps(entry), encoding="utf-8")
+
+            entry_dir = self.renders_dir / key
+            try:
+                os.rename(staging, entry_dir)
+            except OSError:
+                # Another process stored the same render first
+                return self.get(key)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        self.evict()
+        return self.get(key)
+
+    def materialize(self, cached_project: Path, output_dir: Path) -> Path:
+        """Recreate a cached project inside ``output_dir``.
+
+        Args:
+            cached_project: Path returned by ``get``
+            output_dir: Directory where the project should be created
+
+        Returns:
+            Path to the materialized project
+
+        Raises:
+            FileExistsError: If the project directory already exists
+        """
+        target = Path(output_dir) / cached_project.name
+        if target.exists():
+            raise FileExistsError(f'Error: "{target}" directory already exists')
+
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        shutil.copytree(cached_project, target, copy_function=copy2)
+        return target
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits its budget."""
+        entries = []
+        total = 0
+        if not self.renders_dir.is_dir():
+            return
+
+        for entry_dir in self.renders_dir.iterdir():
+            entry_file = entry_dir / _ENTRY_FILE
+            try:
+                size = json.loads(entry_file.read_text(encoding="utf-8"))["size"]
+                last_used = entry_file.stat().st_mtime_ns
+            except (OSError, ValueError, KeyError):
+                continue
+            entries.append((last_used, size, entry_dir))
+            total += size
+
+        for _, size, entry_dir in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached render."""
+        shutil.rmtree(self.renders_dir, ignore_errors=True)
+
+
+def _touch(path: Path) -> None:
+    """Set the mtime of ``path`` to now, with nanosecond precision."""
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
@@ -1,15 +1,19 @@
 """CLI interface for egile-mcp-starter."""
 
 import sys
-from typing import List
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import click
 
 from .generator import MCPProjectGenerator
 from .plugins.registry import get_registry
 
+if TYPE_CHECKING:
+    from .plan import GenerationPlan
 
-@click.command()
+
+@click.group(invoke_without_command=True)
 @click.option(
     "--output-dir",
     "-o",
@@ -45,7 +49,67 @@ from .plugins.registry import get_registry
     is_flag=True,
     help="List all available templates and exit",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always render from scratch instead of reusing cached renders",
+)
+@click.option(
+    "--engine",
+    default="cookiecutter",
+    type=click.Choice(["cookiecutter", "memory"]),
+    help="Rendering engine (memory renders the tree in memory, then writes it "
+    "in one pass)",
+)
+@click.option(
+    "--render-workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Threads rendering files concurrently with --engine memory",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show which files would be created, changed or skipped, without "
+    "writing anything",
+)
+@click.option(
+    "--diff",
+    is_flag=True,
+    help="With --dry-run, show unified diffs of files that would change",
+)
+@click.option(
+    "--archive",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the project into a .zip or .tar.gz archive instead of a " "directory",
+)
+@click.option(
+    "--lock-from",
+    metavar="SOURCE",
+    help="Resolve the template's dependencies into requirements.lock from a "
+    "wheelhouse directory or index URL",
+)
+@click.option(
+    "--bootstrap-env",
+    is_flag=True,
+    help="Create the project's .venv from a shared, cached environment with "
+    "the template's dependencies",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print a JSON breakdown of where generation time went instead of the "
+    "usual summary",
+)
+@click.option(
+    "--reproducible",
+    is_flag=True,
+    help="Generate a byte-identical tree for identical inputs, with dates "
+    "pinned to SOURCE_DATE_EPOCH, and print its digest",
+)
+@click.pass_context
 def main(
+    ctx: click.Context,
     output_dir: str,
     no_input: bool,
     config_file: str,
@@ -54,6 +118,16 @@ def main(
     verbose: bool,
     template: str,
     list_templates: bool,
+    no_cache: bool,
+    engine: str,
+    render_workers: int,
+    dry_run: bool,
+    diff: bool,
+    archive: Optional[str],
+    lock_from: Optional[str],
+    bootstrap_env: bool,
+    profile: bool,
+    reproducible: bool,
 ) -> None:
     """
     Generate a new MCP server project using the FASTMCP framework.
@@ -69,18 +143,21 @@ def main(
     - mcp: Standard MCP server template
     - rag: RAG-enabled server with vector database support
     """
+    if ctx.invoked_subcommand is not None:
+        return
+
     # Get the registry for template information
     registry = get_registry()
 
     # Handle list templates option
     if list_templates:
         click.echo("Available templates:")
-        for plugin in registry.list_plugins():
-            click.echo(f"  {plugin.name}: {plugin.description}")
+        for info in registry.list_plugin_info():
+            click.echo(f"  {info.name}: {info.description}")
         return
 
     # Validate template choice
-    if not registry.get_plugin(template):
+    if template not in registry.get_plugin_names():
         available = ", ".join(registry.get_plugin_names())
         click.echo(f"Error: Template '{template}' not found.", err=True)
         click.echo(f"Available templates: {available}", err=True)
@@ -95,28 +172,546 @@ def main(
             verbose=verbose,
             template=template,
             project_name=project_name,
+            use_cache=not no_cache,
+            engine=engine,
+            render_workers=render_workers,
+            lock_source=lock_from,
+            bootstrap_env=bootstrap_env,
         )
 
-        project_path = generator.generate()
-
-        click.echo("✅ MCP server project generated successfully!")
-        click.echo(f"📁 Project location: {project_path}")
-        click.echo(f"🚀 Template used: {template}")
-        click.echo("")
-        click.echo("Next steps:")
-        project_name = (
-            project_path.name
-            if hasattr(project_path, "name")
-            else str(project_path).split("/")[-1]
+        if dry_run:
+            _print_plan(generator.generate(plan_only=True, diff=diff))
+            return
+
+        if archive:
+            from .archive import archive_format
+
+            fmt = archive_format(archive)
+            with open(archive, "wb") as fileobj:
+                generator.write_archive(fileobj, fmt)
+            click.echo(f"📦 MCP server project archived to: {archive}")
+            return
+
+        _generate(generator, template, bootstrap_env, profile, reproducible)
+
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+
+def _generate(
+    generator: MCPProjectGenerator,
+    template: str,
+    bootstrap_env: bool,
+    profile: bool,
+    reproducible: bool,
+) -> None:
+    """Generate a project into its directory and report the outcome."""
+    if profile:
+        click.echo(
+            generator.generate(profile=True, reproducible=reproducible).to_json()
         )
-        click.echo(f"  cd {project_name}")
-        click.echo("  pip install -e .")
-        click.echo("  # Start developing your MCP server!")
+        return
+
+    if reproducible:
+        project_path, digest = generator.generate(reproducible=True)
+        _print_next_steps(project_path, template, bootstrap_env)
+        click.echo(f"🔏 Tree digest: sha256:{digest}")
+        return
+
+    project_path = generator.generate()
+    _print_next_steps(project_path, template, bootstrap_env)
+
+
+def _print_next_steps(project_path: Path, template: str, bootstrap_env: bool) -> None:
+    """Print the outcome of a generation and how to start working on it."""
+    click.echo("✅ MCP server project generated successfully!")
+    click.echo(f"📁 Project location: {project_path}")
+    click.echo(f"🚀 Template used: {template}")
+    click.echo("")
+    click.echo("Next steps:")
+    project_name = (
+        project_path.name
+        if hasattr(project_path, "name")
+        else str(project_path).split("/")[-1]
+    )
+    click.echo(f"  cd {project_name}")
+    if bootstrap_env:
+        click.echo("  source .venv/bin/activate")
+    click.echo("  pip install -e .")
+    click.echo("  # Start developing your MCP server!")
+
+
+def _print_plan(plan: "GenerationPlan") -> None:
+    """Print a dry-run generation plan."""
+    click.echo(f"📋 Dry run for {plan.project_path} (nothing written)")
+    for planned in plan.files:
+        if planned.action == "change":
+            sizes = f"{planned.existing_size} → {planned.size} bytes"
+        elif planned.action == "skip":
+            sizes = f"{planned.size} bytes, unchanged"
+        else:
+            sizes = f"{planned.size} bytes"
+        click.echo(f"  {planned.action:<6} {planned.path} ({sizes})")
+    click.echo(
+        f"Would create {len(plan.created)}, change {len(plan.changed)} and skip "
+        f"{len(plan.skipped)} files ({plan.total_bytes} bytes)"
+    )
+    for planned in plan.changed:
+        if planned.diff:
+            click.echo(planned.diff, nl=False)
+
+
+@main.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--workers",
+    "-j",
+    type=int,
+    default=None,
+    help="Number of worker processes (default: manifest value or CPU count)",
+)
+@click.option("--config-file", help="User configuration file")
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always render from scratch instead of reusing cached renders",
+)
+@click.option(
+    "--engine",
+    default="cookiecutter",
+    type=click.Choice(["cookiecutter", "memory"]),
+    help="Rendering engine used by every worker",
+)
+@click.option(
+    "--isolate-hooks",
+    is_flag=True,
+    help="Run the hooks of external plugins in separate, time-bounded processes",
+)
+@click.option(
+    "--hook-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=60.0,
+    show_default=True,
+    help="Seconds an isolated hook may run",
+)
+@click.option(
+    "--hook-memory",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Memory limit of isolated hooks, in MiB (default: unlimited)",
+)
+def batch(
+    manifest: str,
+    workers: Optional[int],
+    config_file: str,
+    no_cache: bool,
+    engine: str,
+    isolate_hooks: bool,
+    hook_timeout: float,
+    hook_memory: Optional[int],
+) -> None:
+    """Generate every project listed in a YAML MANIFEST."""
+    from .batch import load_manifest
+    from .plugins.isolation import HookLimits
+
+    try:
+        loaded = load_manifest(manifest)
+    except (OSError, ValueError) as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+    results = MCPProjectGenerator.generate_many(
+        loaded["entries"],
+        max_workers=workers or loaded["max_workers"],
+        config_file=config_file,
+        use_cache=not no_cache,
+        engine=engine,
+        hook_limits=(
+            HookLimits(hook_timeout, hook_memory and hook_memory * 1024 * 1024)
+            if isolate_hooks
+            else None
+        ),
+    )
+
+    failures = 0
+    for result in results:
+        if result.ok:
+            click.echo(f"✅ {result.project_path} ({result.duration:.2f}s)")
+        else:
+            failures += 1
+            click.echo(
+                f"❌ {result.entry.template} -> {result.entry.output_dir}: "
+                f"{result.error}",
+                err=True,
+            )
+
+    click.echo(f"Generated {len(results) - failures}/{len(results)} projects")
+    if failures:
+        sys.exit(1)
+
+
+@main.command()
+@click.option(
+    "--template",
+    "-t",
+    "templates",
+    multiple=True,
+    help="Template to precompile (default: all registered templates)",
+)
+def precompile(templates: Tuple[str, ...]) -> None:
+    """Compile bundled templates into the persistent bytecode cache.
+
+    Run this once after installation (for example in a Docker build) so that
+    every later generation on the host skips Jinja compilation.
+    """
+    from .rendering import get_bytecode_cache, get_renderer
+
+    registry = get_registry()
+    names = list(templates) or registry.get_plugin_names()
+    for name in names:
+        template_path = registry.get_template_path(name)
+        if template_path is None:
+            click.echo(f"❌ Error: Template '{name}' not found.", err=True)
+            sys.exit(1)
+        count = get_renderer(template_path).precompile()
+        click.echo(f"✅ {name}: compiled {count} template files")
+
+    cache = get_bytecode_cache()
+    if cache is not None:
+        click.echo(f"📁 Bytecode cache: {cache.path}")
+
+
+@main.command()
+@click.option(
+    "--template",
+    "-t",
+    "templates",
+    multiple=True,
+    help="Template to bundle (default: all registered templates)",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    help="Directory for the bundles (default: next to each template)",
+)
+def bundle(templates: Tuple[str, ...], output_dir: Optional[str]) -> None:
+    """Pack templates into single-file bundles.
+
+    A bundle is read directly by the renderer, so distributions can ship one
+    file per template instead of a directory tree.
+    """
+    from .bundles import BUNDLE_SUFFIX, create_bundle, is_bundle
+
+    registry = get_registry()
+    names = list(templates) or registry.get_plugin_names()
+    for name in names:
+        template_path = registry.get_template_path(name)
+        if template_path is None:
+            click.echo(f"❌ Error: Template '{name}' not found.", err=True)
+            sys.exit(1)
+        if is_bundle(template_path):
+            click.echo(f"⏭️  {name}: already a bundle ({template_path})")
+            continue
 
+        directory = Path(output_dir) if output_dir else template_path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / (template_path.name + BUNDLE_SUFFIX)
+        try:
+            create_bundle(template_path, target)
+        except ValueError as e:
+            click.echo(f"❌ Error: {e}", err=True)
+            sys.exit(1)
+        click.echo(f"✅ {name}: bundled to {target}")
+
+
+@main.command()
+@click.argument(
+    "project_dir", default=".", type=click.Path(exists=True, file_okay=False)
+)
+@click.option("--config-file", help="User configuration file")
+@click.option(
+    "--set",
+    "assignments",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="Change a context variable during the update (repeatable)",
+)
+def update(
+    project_dir: str, config_file: Optional[str], assignments: Tuple[str, ...]
+) -> None:
+    """Update a generated project to the current version of its template.
+
+    Only files whose template or context variables changed are re-rendered,
+    and local edits are preserved with a three-way merge. Conflicting edits
+    are left with conflict markers and make the command exit non-zero.
+    """
+    from .update import update_project
+
+    extra_context = _parse_assignments(assignments)
+    try:
+        result = update_project(
+            Path(project_dir), extra_context=extra_context, config_file=config_file
+        )
     except Exception as e:
         click.echo(f"❌ Error: {e}", err=True)
         sys.exit(1)
 
+    for path, status in sorted(result.changes.items()):
+        icon = "⚠️ " if status == "conflict" else "✅"
+        click.echo(f"{icon} {status}: {path}")
+    total = result.rendered + result.skipped
+    click.echo(f"Re-rendered {result.rendered}/{total} template files")
+    if result.conflicts:
+        click.echo(f"Resolve {len(result.conflicts)} conflicts before committing")
+        sys.exit(1)
+
+
+def _parse_assignments(assignments: Tuple[str, ...]) -> Dict[str, Any]:
+    """Parse ``--set KEY=VALUE`` options, exiting on invalid ones."""
+    extra_context: Dict[str, Any] = {}
+    for assignment in assignments:
+        key, sep, value = assignment.partition("=")
+        if not sep or not key:
+            click.echo(
+                f"❌ Error: Invalid --set '{assignment}', expected KEY=VALUE", err=True
+            )
+            sys.exit(1)
+        extra_context[key] = value
+    return extra_context
+
+
+@main.command()
+@click.option(
+    "--template",
+    "-t",
+    default="mcp",
+    help="Template to watch (default: mcp)",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    default=".",
+    help="Output directory for the rendered project",
+)
+@click.option("--config-file", help="User configuration file")
+@click.option(
+    "--set",
+    "assignments",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="Set a context variable (repeatable)",
+)
+@click.option(
+    "--interval",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="Seconds between two scans of the template directory",
+)
+def watch(
+    template: str,
+    output_dir: str,
+    config_file: Optional[str],
+    assignments: Tuple[str, ...],
+    interval: float,
+) -> None:
+    """Re-render a project whenever its template changes.
+
+    Only the output files affected by each change are re-rendered, so
+    template authors can iterate on a template and inspect the result.
+    """
+    from .watch import TemplateWatcher, WatchResult
+
+    try:
+        watcher = TemplateWatcher(
+            template,
+            output_dir,
+            extra_context=_parse_assignments(assignments),
+            config_file=config_file,
+        )
+    except ValueError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+    def report(result: WatchResult) -> None:
+        if result.error:
+            click.echo(f"❌ Error: {result.error}", err=True)
+            return
+        click.echo(
+            f"🔄 {result.project_path}: re-rendered {result.rendered} files, "
+            f"wrote {len(result.written)}, removed {len(result.removed)} "
+            f"in {result.duration * 1000:.0f} ms"
+        )
+
+    click.echo(f"👀 Watching {watcher.template_dir} (Ctrl+C to stop)")
+    try:
+        watcher.run(report, interval=interval)
+    except KeyboardInterrupt:
+        click.echo("👋 Stopped watching")
+
+
+@main.command("validate-matrix")
+@click.option(
+    "--template",
+    "-t",
+    "templates",
+    multiple=True,
+    help="Template to validate (default: all registered templates)",
+)
+@click.option(
+    "--mode",
+    default="pairwise",
+    type=click.Choice(["full", "sampled", "pairwise"]),
+    help="Every combination, a random sample, or a set covering every pair "
+    "of choice values",
+)
+@click.option(
+    "--samples",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Combinations per template with --mode sampled",
+)
+@click.option("--seed", default=0, type=int, help="Random seed for --mode sampled")
+@click.option(
+    "--workers",
+    "-j",
+    type=int,
+    default=None,
+    help="Number of worker processes (default: CPU count)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Re-validate combinations that passed in a previous run",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Report every combination")
+def validate_matrix(
+    templates: Tuple[str, ...],
+    mode: str,
+    samples: int,
+    seed: int,
+    workers: Optional[int],
+    no_cache: bool,
+    verbose: bool,
+) -> None:
+    """Render choice combinations of templates and byte-compile the output."""
+    from .matrix import run_matrix, summarize
+
+    names = list(templates) or get_registry().get_plugin_names()
+    try:
+        results = run_matrix(names, mode, samples, seed, workers, not no_cache)
+    except ValueError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+    for result in results:
+        values = ", ".join(f"{k}={v}" for k, v in result.combination.values.items())
+        label = f"{result.combination.template} [{values}]"
+        if not result.ok:
+            click.echo(f"❌ {label}", err=True)
+            for failure in [result.error] if result.error else result.failures:
+                click.echo(f"     {failure}", err=True)
+        elif verbose:
+            timing = "cached" if result.cached else f"{result.duration:.3f}s"
+            click.echo(f"✅ {label} ({result.files} files, {timing})")
+
+    for name in names:
+        summary = summarize([r for r in results if r.combination.template == name])
+        click.echo(
+            f"{name}: {summary['combinations'] - summary['failed']}/"
+            f"{summary['combinations']} combinations passed "
+            f"({summary['cached']} cached, mean render "
+            f"{summary['mean_duration']:.3f}s, max {summary['max_duration']:.3f}s)"
+        )
+    if any(not result.ok for result in results):
+        sys.exit(1)
+
+
+@main.command("rebuild-plugin-cache")
+def rebuild_plugin_cache() -> None:
+    """Rescan entry points and rebuild the external plugin discovery cache.
+
+    The cache is refreshed automatically when installed packages change; use
+    this command after editing a plugin installed in development mode.
+    """
+    from .plugins.discovery import (
+        discover_entry_point_plugins,
+        get_discovery_cache_path,
+    )
+
+    infos = discover_entry_point_plugins(refresh=True)
+    for info in infos:
+        click.echo(f"✅ {info.name}: {info.module}.{info.class_name}")
+    click.echo(f"Discovered {len(infos)} external template plugins")
+    click.echo(f"📁 Discovery cache: {get_discovery_cache_path()}")
+
+
+@main.command()
+@click.option(
+    "--transport",
+    default="stdio",
+    type=click.Choice(["stdio", "http"]),
+    help="MCP transport to serve on",
+)
+@click.option(
+    "--host", default="127.0.0.1", help="Address to bind with --transport http"
+)
+@click.option(
+    "--port", default=8000, type=int, help="Port to bind with --transport http"
+)
+@click.option(
+    "--max-concurrency",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Generations running at the same time; further requests wait",
+)
+@click.option(
+    "--render-workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Threads rendering files concurrently within each generation",
+)
+@click.option(
+    "--root",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Directory plan_project may read (default: current directory)",
+)
+def serve(
+    transport: str,
+    host: str,
+    port: int,
+    max_concurrency: int,
+    render_workers: int,
+    root: Optional[str],
+) -> None:
+    """Serve project generation as MCP tools from a long-running process.
+
+    Templates are loaded and compiled once at start-up, then the
+    list_templates, generate_project and plan_project tools are served.
+    Requires fastmcp (pip install egile-mcp-starter[serve]).
+    """
+    from .server import GenerationService, create_server
+
+    service = GenerationService(max_concurrency, render_workers, root)
+    try:
+        server = create_server(service)
+    except ImportError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+    # With the stdio transport, stdout carries the protocol
+    for name, count in service.warm_up().items():
+        click.echo(f"🔥 {name}: compiled {count} template files", err=True)
+    if transport == "http":
+        click.echo(f"🚀 Serving MCP tools on http://{host}:{port}", err=True)
+        server.run(transport="http", host=host, port=port)
+    else:
+        click.echo("🚀 Serving MCP tools on stdio", err=True)
+        server.run(transport="stdio")
+
 
 # Dynamically populate template choices
 def _get_template_choices() -> List[str]:
@@ -0,0 +1,265 @@
+"""Shared, content-addressed virtual environments for generated projects.
+
+Installing the dependencies of a generated project (for RAG projects,
+multi-gigabyte ML stacks) is done once per dependency set and Python version
+into ``<cache root>/envs/<key>/``. Each project then gets its own ``.venv``:
+a fresh virtual environment, created without seeding pip, whose
+``site-packages`` (pip included) are hardlinked from the cached one and whose
+console scripts are rewritten to point at it.
+
+pip replaces files rather than editing them in place, so installing,
+upgrading or removing packages in a project's environment never alters the
+cached one.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .cache import get_cache_root
+from .fastcopy import link_or_copy
+from .lock import LOCK_FILE, get_lock_source, normalize_requirements
+
+VENV_DIR = ".venv"
+
+# Records where a cached environment was built, to relocate its scripts
+PREFIX_FILE = "egile-mcp-starter-prefix"
+
+# Bumped whenever the layout of cached environments changes
+ENV_FORMAT = 1
+
+
+def find_interpreter(python_version: Optional[str]) -> str:
+    """Find an interpreter for a ``python_version`` choice.
+
+    Args:
+        python_version: ``X.Y`` version, or None for the running interpreter
+
+    Returns:
+        Path to the interpreter
+
+    Raises:
+        ValueError: If no such interpreter is on ``PATH``
+    """
+    current = f"{sys.version_info.major}.{sys.version_info.minor}"
+    if not python_version or python_version == current:
+        return sys.executable
+    interpreter = shutil.which(f"python{python_version}")
+    if interpreter is None:
+        raise ValueError(f"Python {python_version} was not found on PATH")
+    return interpreter
+
+
+def environment_key(
+    requirements: Iterable[str],
+    python_version: Optional[str],
+    lock: Optional[str] = None,
+    source: Optional[str] = None,
+) -> str:
+    """Compute the key of a cached environment.
+
+    Args:
+        requirements: Requirement specifiers
+        python_version: ``X.Y`` version of the environment's interpreter
+        lock: Content of ``requirements.lock``, which pins the environment
+            exactly and takes precedence over the requirements
+        source: Wheelhouse directory or index URL packages come from
+
+    Returns:
+        Hex digest identifying the environment
+    """
+    payload = {
+        "format": ENV_FORMAT,
+        "python": python_version or f"{sys.version_info[0]}.{sys.version_info[1]}",
+        "platform": sys.platform,
+        "packages": lock if lock is not None else normalize_requirements(requirements),
+        "source": None if lock is not None or not source else source,
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _run(command: List[str], action: str) -> None:
+    """Run a command, turning failures into ValueError."""
+    process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode != 0:
+        detail = process.stderr.strip().splitlines()[-1:] or ["command failed"]
+        raise ValueError(f"Could not {action}: {detail[0]}")
+
+
+def _site_packages(env_dir: Path) -> Path:
+    """Locate the ``site-packages`` directory of a virtual environment."""
+    candidates = sorted(env_dir.glob("lib/python*/site-packages"))
+    candidates.append(env_dir / "Lib" / "site-packages")
+    for candidate in candidates:
+        if candidate.is_dir():
+            return candidate
+    raise ValueError(f"No site-packages directory in environment '{env_dir}'")
+
+
+def _scripts_dir(env_dir: Path) -> Path:
+    """Directory of a virtual environment's executables."""
+    return env_dir / ("Scripts" if os.name == "nt" else "bin")
+
+
+class EnvironmentCache:
+    """Content-addressed store of populated virtual environments."""
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """Open the environment cache.
+
+        Args:
+            directory: Cache directory (default: ``<cache root>/envs``)
+        """
+        self.directory = Path(directory or get_cache_root() / "envs")
+
+    def get_or_create(
+        self,
+        key: str,
+        interpreter: str,
+        install_args: List[str],
+    ) -> Path:
+        """Get a cached environment, populating it on a miss.
+
+        The environment is built next to its final location and renamed into
+        place, so concurrent generations never see a partial environment.
+
+        Args:
+            key: Key from ``environment_key``
+            interpreter: Interpreter the environment is created with
+            install_args: Arguments to ``pip install`` populating it, empty
+                for an environment without packages
+
+        Returns:
+            Path to the cached environment
+
+        Raises:
+            ValueError: If the environment cannot be created or populated
+        """
+        env_dir = self.directory / key
+        if (env_dir / PREFIX_FILE).is_file():
+            return env_dir
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        building = self.directory / f"{key}.{os.getpid()}.tmp"
+        shutil.rmtree(building, ignore_errors=True)
+        try:
+            _run(
+                [interpreter, "-m", "venv", str(building)],
+                f"create a Python environment with {interpreter}",
+            )
+            if install_args:
+                _run(
+                    [
+                        str(_scripts_dir(building) / "python"),
+                        "-m",
+                        "pip",
+                        "install",
+                        "--disable-pip-version-check",
+                        "--quiet",
+                        *install_args,
+                    ],
+                    "install the project dependencies",
+                )
+            (building / PREFIX_FILE).write_text(str(building), encoding="utf-8")
+            try:
+                os.replace(building, env_dir)
+            except OSError:
+                if not (env_dir / PREFIX_FILE).is_file():
+                    raise  # Lost a race only if the winner is complete
+        finally:
+            shutil.rmtree(building, ignore_errors=True)
+        return env_dir
+
+    def clone(self, env_dir: Path, interpreter: str, target: Path) -> Path:
+        """Create a project environment from a cached one.
+
+        Args:
+            env_dir: Cached environment from ``get_or_create``
+            interpreter: Interpreter the cached environment was created with
+            target: Directory of the new environment (must not exist)
+
+        Returns:
+            Path to the new environment
+
+        Raises:
+            ValueError: If the environment cannot be created
+        """
+        _run(
+            [interpreter, "-m", "venv", "--without-pip", str(target)],
+            f"create a Python environment with {interpreter}",
+        )
+        site_packages = _site_packages(target)
+        shutil.rmtree(site_packages)
+        shutil.copytree(
+            _site_packages(env_dir), site_packages, copy_function=link_or_copy
+        )
+
+        # Console scripts embed the interpreter path of the environment they
+        # were installed into, either in the shebang or in a /bin/sh trampoline
+        build_prefix = (env_dir / PREFIX_FILE).read_bytes()
+        scripts = _scripts_dir(target)
+        for script in sorted(_scripts_dir(env_dir).iterdir()):
+            destination = scripts / script.name
+            if destination.exists() or destination.is_symlink() or script.is_dir():
+                continue  # Interpreter links and activation scripts
+            content = script.read_bytes()
+            content = content.replace(build_prefix, str(target).encode("utf-8"))
+            destination.write_bytes(content)
+            shutil.copymode(script, destination)
+        return target
+
+
+def bootstrap_environment(
+    project_path: Path,
+    requirements: Iterable[str],
+    python_version: Optional[str] = None,
+    source: Optional[str] = None,
+    cache: Optional[EnvironmentCache] = None,
+) -> Path:
+    """Create the ``.venv`` of a generated project from the environment cache.
+
+    When the project has a ``requirements.lock``, the environment is
+    installed from it without dependency resolution and keyed on it;
+    otherwise it is keyed on the requirements themselves.
+
+    Args:
+        project_path: Path to the generated project
+        requirements: Requirement specifiers of the project
+        python_version: ``X.Y`` version, or None for the running interpreter
+        source: Wheelhouse directory or index URL packages come from (default:
+            pip's configured index)
+        cache: Environment cache (default: under the cache root)
+
+    Returns:
+        Path to the project's environment
+
+    Raises:
+        ValueError: If the environment cannot be created
+    """
+    target = Path(project_path) / VENV_DIR
+    if target.exists():
+        raise ValueError(f"Environment '{target}' already exists")
+
+    lock_path = Path(project_path) / LOCK_FILE
+    lock = lock_path.read_text(encoding="utf-8") if lock_path.is_file() else None
+    wanted = normalize_requirements(requirements)
+    if lock is not None:
+        install_args = ["--no-deps", "-r", str(lock_path)]
+        if "--hash=" in lock:
+            install_args.append("--require-hashes")
+    else:
+        install_args = list(wanted)
+    if install_args and source:
+        install_args = get_lock_source(source).pip_args + install_args
+
+    interpreter = find_interpreter(python_version)
+    cache = cache or EnvironmentCache()
+    key = environment_key(wanted, python_version, lock, source)
+    env_dir = cache.get_or_create(key, interpreter, install_args)
+    return cache.clone(env_dir, interpreter, target)
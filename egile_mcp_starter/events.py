@@ -0,0 +1,95 @@
+"""Structured events emitted while generating a project."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Optional
+
+
+class GenerationEvent:
+    """Base class of every event yielded by ``generate_iter``."""
+
+    kind: ClassVar[str] = "event"
+
+
+@dataclass
+class PluginResolved(GenerationEvent):
+    """The template plugin and its template directory were resolved."""
+
+    kind: ClassVar[str] = "plugin_resolved"
+
+    template: str
+    version: str
+    template_dir: Path
+
+
+@dataclass
+class HookRun(GenerationEvent):
+    """A plugin hook (``pre_generate`` or ``post_generate``) finished."""
+
+    kind: ClassVar[str] = "hook_run"
+
+    hook: str
+    duration: float  # Seconds
+
+
+@dataclass
+class ContextFinalized(GenerationEvent):
+    """The context overrides passed to the template are final."""
+
+    kind: ClassVar[str] = "context_finalized"
+
+    context: Dict[str, Any]
+
+
+@dataclass
+class CacheHit(GenerationEvent):
+    """The project was materialized from the render cache, not rendered."""
+
+    kind: ClassVar[str] = "cache_hit"
+
+    key: str
+
+
+@dataclass
+class FileRendered(GenerationEvent):
+    """A project file was rendered.
+
+    With the cookiecutter engine, files are only reported once cookiecutter
+    has written the whole project, so their duration is unknown.
+    """
+
+    kind: ClassVar[str] = "file_rendered"
+
+    path: str  # POSIX path relative to the project directory
+    size: int  # Bytes
+    duration: Optional[float] = None  # Seconds spent rendering the file
+    compile_duration: Optional[float] = None  # Part of it compiling the template
+
+
+@dataclass
+class PhaseCompleted(GenerationEvent):
+    """A generation phase without an event of its own finished.
+
+    Only yielded by ``generate_iter(phases=True)``. Phases are
+    ``engine_import``, ``registry_lookup``, ``default_context``,
+    ``cookiecutter`` (rendering and writing with the cookiecutter engine),
+    ``template_context`` and ``write`` (memory engine), ``manifest``,
+    ``normalize`` and ``digest`` (reproducible generations), ``cache_store``,
+    ``lock`` and ``publish``.
+    """
+
+    kind: ClassVar[str] = "phase_completed"
+
+    phase: str
+    duration: float  # Seconds
+
+
+@dataclass
+class ProjectGenerated(GenerationEvent):
+    """The project was generated; always the last event."""
+
+    kind: ClassVar[str] = "project_generated"
+
+    project_path: Path
+    duration: float  # Seconds, from plugin resolution to the end of hooks
+    tree_digest: Optional[str] = None  # Reproducible generations only
@@ -0,0 +1,242 @@
+"""Fast, constant-memory copies of large files.
+
+Template files copied verbatim (``_copy_without_render`` matches and binary
+files) can be large assets such as models, fixtures or sample corpora.
+``copy_file`` copies them with the fastest mechanism available, falling back
+to the next one when the platform or file system does not support it:
+
+1. ``reflink``: the copy shares the source's data blocks until either file is
+   modified (``FICLONE`` on Linux file systems such as Btrfs or XFS);
+2. ``copy_file_range``: the kernel copies the data, possibly server-side on
+   network file systems;
+3. ``sendfile``: the kernel copies the data through the page cache;
+4. ``chunked``: the data is read and written in fixed-size chunks.
+
+None of them holds more than a chunk of the file in memory.
+"""
+
+import errno
+import os
+import shutil
+import sys
+from typing import IO, Callable, List, Optional, Tuple, Union
+
+# Bytes read and written at once by chunked copies
+CHUNK_SIZE = 1024 * 1024
+
+# Linux ioctl cloning a whole file: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Largest range handed to the kernel in one call
+_MAX_RANGE = 1 << 30
+
+# Errors meaning that a mechanism does not work for a pair of files, rather
+# than that copying itself failed
+_UNSUPPORTED = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSOCK,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EXDEV,
+}
+
+PathLike = Union[str, "os.PathLike[str]"]
+# Copies from an offset up to a size, returning the offset reached
+_Method = Callable[[int, int, int, int], int]
+
+
+def _reflink(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    """Clone the whole file, if nothing was copied yet."""
+    if offset or not sys.platform.startswith("linux"):
+        return offset
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError as e:
+        if e.errno in _UNSUPPORTED:
+            return offset
+        raise
+    return size
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    """Copy with ``os.copy_file_range`` (Linux)."""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        return offset
+    while offset < size:
+        count = min(size - offset, _MAX_RANGE)
+        try:
+            copied = copy_file_range(src_fd, dst_fd, count, offset, offset)
+        except OSError as e:
+            if e.errno in _UNSUPPORTED:
+                return offset
+            raise
+        if not copied:
+            break  # The source shrank
+        offset += copied
+    return offset
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    """Copy with ``os.sendfile``, which writes at the destination position."""
+    sendfile = getattr(os, "sendfile", None)
+    if sendfile is None:
+        return offset
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while offset < size:
+        try:
+            copied = sendfile(dst_fd, src_fd, offset, min(size - offset, _MAX_RANGE))
+        except OSError as e:
+            if e.errno in _UNSUPPORTED:
+                return offset
+            raise
+        if not copied:
+            break
+        offset += copied
+    return offset
+
+
+def _chunked(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    """Copy by reading and writing chunks, up to the end of the source."""
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while True:
+        chunk = os.read(src_fd, CHUNK_SIZE)
+        if not chunk:
+            return offset
+        _write_all(dst_fd, chunk)
+        offset += len(chunk)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write data to a descriptor, retrying partial writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+# Copy mechanisms, fastest first
+METHODS: List[Tuple[str, _Method]] = [
+    ("reflink", _reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _sendfile),
+    ("chunked", _chunked),
+]
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def copy_file(src: PathLike, dst: PathLike, mode: Optional[int] = None) -> str:
+    """Copy a file's content with the fastest available mechanism.
+
+    Args:
+        src: File to copy
+        dst: Destination file, created or truncated
+        mode: Permission bits of the destination (default: left to the umask
+            for new files, unchanged for existing ones)
+
+    Returns:
+        Name of the mechanism that completed the copy, from ``METHODS``
+
+    Raises:
+        OSError: If the copy fails for another reason than a mechanism being
+            unsupported
+    """
+    with open(src, "rb") as fsrc:
+        src_fd = fsrc.fileno()
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, _WRITE_FLAGS, 0o666 if mode is None else mode)
+        try:
+            name = _copy_fds(src_fd, dst_fd, size)
+            if mode is not None and hasattr(os, "fchmod"):
+                os.fchmod(dst_fd, mode)
+        finally:
+            os.close(dst_fd)
+    return name
+
+
+def _copy_fds(src_fd: int, dst_fd: int, size: int) -> str:
+    """Copy between descriptors, falling back through ``METHODS``."""
+    if not size:
+        return METHODS[-1][0]  # Nothing to copy
+    offset = 0
+    for name, method in METHODS:
+        offset = method(src_fd, dst_fd, offset, size)
+        if offset >= size:
+            return name
+    return METHODS[-1][0]  # The source shrank while being copied
+
+
+def copy_stream(fsrc: IO[bytes], dst: PathLike, mode: Optional[int] = None) -> int:
+    """Copy a readable binary stream into a file, one chunk at a time.
+
+    Used for sources that are not files on disk, such as bundle members.
+
+    Args:
+        fsrc: Stream to copy, read to its end
+        dst: Destination file, created or truncated
+        mode: Permission bits of the destination (see ``copy_file``)
+
+    Returns:
+        Number of bytes copied
+    """
+    dst_fd = os.open(dst, _WRITE_FLAGS, 0o666 if mode is None else mode)
+    copied = 0
+    try:
+        while True:
+            chunk = fsrc.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            _write_all(dst_fd, chunk)
+            copied += len(chunk)
+        if mode is not None and hasattr(os, "fchmod"):
+            os.fchmod(dst_fd, mode)
+    finally:
+        os.close(dst_fd)
+    return copied
+
+
+def copy2(src: PathLike, dst: PathLike) -> PathLike:
+    """Copy a file with its metadata, like ``shutil.copy2``.
+
+    Suitable as the ``copy_function`` of ``shutil.copytree``.
+
+    Args:
+        src: File to copy
+        dst: Destination file
+
+    Returns:
+        The destination
+    """
+    copy_file(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def link_or_copy(src: PathLike, dst: PathLike) -> PathLike:
+    """Hardlink a file, falling back to ``copy2`` where links are unsupported.
+
+    Suitable as the ``copy_function`` of ``shutil.copytree``. A hardlink
+    shares the file itself, so writing through either path changes both:
+    only link files that are never modified in place, such as the installed
+    packages of a cached environment. Files users may edit, like generated
+    project files, must be copied with ``copy2`` instead.
+
+    Args:
+        src: File to link
+        dst: Destination file
+
+    Returns:
+        The destination
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        copy2(src, dst)
+    return dst
@@ -0,0 +1,186 @@
+"""Declarative mapping of template files to the features that enable them.
+
+A template directory may contain a ``features.json`` file next to
+``cookiecutter.json``, listing files and directories of the project template
+that are only generated when a feature is enabled::
+
+    {
+      "version": 1,
+      "rules": [
+        {
+          "feature": "docker",
+          "paths": ["Dockerfile", "docker-compose.yml"],
+          "when": {"use_docker": ["y"]}
+        },
+        {
+          "feature": "multiple_licenses",
+          "paths": ["LICENSE"],
+          "unless": {"license": ["None"]}
+        }
+      ]
+    }
+
+Paths are unrendered and relative to the ``{{cookiecutter.xxx}}`` project
+template directory. A rule is enabled when every ``when`` variable has one of
+the listed values and no ``unless`` variable does. Paths of disabled rules,
+including whole subtrees, are skipped before anything is read or rendered:
+the in-memory renderer prunes them from its walk, and cookiecutter renders a
+mirror of the template that leaves them out (see ``mirror_template``).
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set
+
+from .fastcopy import copy2
+
+FEATURES_FILE = "features.json"
+FEATURES_VERSION = 1
+
+
+@dataclass
+class FeatureRule:
+    """Template paths generated only when a condition on the context holds."""
+
+    feature: str  # Name reported by ``TemplatePlugin.get_supported_features``
+    paths: List[str]
+    when: Dict[str, List[str]] = field(default_factory=dict)
+    unless: Dict[str, List[str]] = field(default_factory=dict)
+
+    def is_enabled(self, variables: Dict[str, Any]) -> bool:
+        """Check whether the rule's paths are generated.
+
+        Args:
+            variables: Cookiecutter variables (``context["cookiecutter"]``)
+
+        Returns:
+            True if every ``when`` condition holds and no ``unless`` one does
+        """
+        if any(str(variables.get(k)) not in v for k, v in self.when.items()):
+            return False
+        return not any(str(variables.get(k)) in v for k, v in self.unless.items())
+
+
+@dataclass
+class FeatureManifest:
+    """Feature rules of a template."""
+
+    rules: List[FeatureRule] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, template_dir: Path) -> "FeatureManifest":
+        """Load the feature manifest of a template directory.
+
+        Args:
+            template_dir: Template directory containing ``cookiecutter.json``,
+                or template bundle
+
+        Returns:
+            The manifest, empty if the template has no ``features.json``
+
+        Raises:
+            ValueError: If the manifest is invalid
+        """
+        from .bundles import read_template_file
+
+        path = Path(template_dir) / FEATURES_FILE
+        try:
+            data = json.loads(read_template_file(template_dir, FEATURES_FILE))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Invalid feature manifest '{path}': {e}") from e
+
+        try:
+            if data.get("version") != FEATURES_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')}")
+            rules = [FeatureRule(**rule) for rule in data["rules"]]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid feature manifest '{path}': {e}") from e
+        return cls(rules)
+
+    @property
+    def features(self) -> List[str]:
+        """Names of the features referenced by the rules, sorted."""
+        return sorted({rule.feature for rule in self.rules})
+
+    def disabled_paths(self, context: Dict[str, Any]) -> Set[str]:
+        """Template paths that must not be generated for a context.
+
+        Args:
+            context: Full cookiecutter context
+
+        Returns:
+            Unrendered POSIX paths relative to the project template directory
+        """
+        variables = context["cookiecutter"]
+        return {
+            path
+            for rule in self.rules
+            if not rule.is_enabled(variables)
+            for path in rule.paths
+        }
+
+    def check(self, supported: Iterable[str]) -> None:
+        """Check that every feature of the manifest is a supported feature.
+
+        Args:
+            supported: Features reported by the template plugin
+
+        Raises:
+            ValueError: If a rule refers to an unsupported feature
+        """
+        unknown = sorted(set(self.features) - set(supported))
+        if unknown:
+            raise ValueError(
+                f"Feature manifest refers to unsupported features: {', '.join(unknown)}"
+            )
+
+
+def is_disabled(path: str, disabled: Set[str]) -> bool:
+    """Check whether a template path is, or is inside, a disabled path.
+
+    Args:
+        path: POSIX path relative to the project template directory
+        disabled: Paths from ``FeatureManifest.disabled_paths``
+
+    Returns:
+        True if the path must not be generated
+    """
+    return any(path == d or path.startswith(d + "/") for d in disabled)
+
+
+def mirror_template(
+    template_dir: Path, root_name: str, disabled: Set[str], destination: Path
+) -> None:
+    """Mirror a template directory without the paths of disabled features.
+
+    Cookiecutter renders every file it finds, so it is given the mirror
+    instead of the template. Files are symbolic links to the template's,
+    which cookiecutter only reads, following them; they are copied where
+    links cannot be created.
+
+    Args:
+        template_dir: Template directory containing ``cookiecutter.json``
+        root_name: Name of the project template directory inside it
+        disabled: Paths from ``FeatureManifest.disabled_paths``
+        destination: Directory to create the mirror in
+    """
+    template_dir = Path(os.path.abspath(template_dir))
+    for root, dirs, files in os.walk(template_dir):
+        relative = Path(root).relative_to(template_dir).as_posix()
+        parts = relative.split("/")
+        if parts[0] == root_name:
+            # Paths below the project template directory, as rules name them
+            prefix = "/".join(parts[1:] + [""])
+            dirs[:] = [d for d in dirs if not is_disabled(prefix + d, disabled)]
+            files = [f for f in files if not is_disabled(prefix + f, disabled)]
+        target = destination / relative
+        target.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            try:
+                os.symlink(os.path.join(root, name), target / name)
+            except OSError:
+                copy2(os.path.join(root, name), target / name)
@@ -1,14 +1,94 @@
 """Project generator for MCP servers using cookiecutter."""
 
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-try:
-    from cookiecutter.main import cookiecutter  # type: ignore
-except ImportError:
-    cookiecutter = None
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
 
+from .events import (
+    CacheHit,
+    ContextFinalized,
+    FileRendered,
+    GenerationEvent,
+    HookRun,
+    PhaseCompleted,
+    PluginResolved,
+    ProjectGenerated,
+)
+from .plugins.base import TemplatePlugin
 from .plugins.registry import get_registry
+from .publishing import StagingDirectory
+
+if TYPE_CHECKING:
+    from .archive import ArchiveMember
+    from .batch import BatchEntry, BatchResult
+    from .plan import GenerationPlan
+    from .plugins.isolation import HookLimits, HookPool
+    from .profiling import GenerationProfile
+    from .rendering import RenderedTree, TemplateRenderer
+    from .reproducible import ReproducibleProject
+
+# Rendering engines supported by MCPProjectGenerator
+ENGINES = ("cookiecutter", "memory")
+
+# Sub-generators yielding events and returning the generated project path
+_RenderSteps = Generator[GenerationEvent, None, str]
+
+
+def __getattr__(name: str) -> Any:
+    """Import cookiecutter on first access.
+
+    Importing ``cookiecutter.main`` pulls in ``requests`` and friends, which
+    would dominate the start-up time of commands that never render anything.
+    """
+    if name == "cookiecutter":
+        try:
+            from cookiecutter.main import cookiecutter  # type: ignore
+        except ImportError:
+            cookiecutter = None
+        globals()["cookiecutter"] = cookiecutter
+        return cookiecutter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get_cookiecutter() -> Any:
+    """Get the cookiecutter entry point, or None if it is not installed."""
+    return getattr(sys.modules[__name__], "cookiecutter")
+
+
+def _list_files(project_path: Path) -> Iterator[Tuple[str, int]]:
+    """List the files of a generated project with their sizes, in sorted order.
+
+    Args:
+        project_path: Generated project directory
+
+    Yields:
+        POSIX paths relative to the project directory and sizes in bytes
+    """
+    for root, dirs, files in os.walk(project_path):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(root) / name
+            yield path.relative_to(project_path).as_posix(), path.stat().st_size
 
 
 class MCPProjectGenerator:
@@ -23,6 +103,14 @@ class MCPProjectGenerator:
         verbose: bool = False,
         template: str = "mcp",
         project_name: Optional[str] = None,
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
+        extra_context: Optional[Dict[str, Any]] = None,
+        engine: str = "cookiecutter",
+        render_workers: int = 1,
+        lock_source: Optional[str] = None,
+        bootstrap_env: bool = False,
+        hook_pool: Optional["HookPool"] = None,
     ):
         """Initialize the MCP project generator.
 
@@ -34,6 +122,23 @@ class MCPProjectGenerator:
             verbose: Enable verbose output
             template: Name of the template to use (default: "mcp")
             project_name: Override the project name
+            use_cache: Reuse previously rendered projects for identical
+                non-interactive generations
+            cache_dir: Override the render cache location
+            extra_context: Context values overriding the plugin defaults
+            engine: Rendering engine, either "cookiecutter" or "memory" (render
+                the whole tree in memory, then write it in one pass)
+            render_workers: Number of threads rendering files concurrently with
+                the memory engine (file writes are capped at
+                ``rendering.MAX_IO_WORKERS``); output does not depend on it
+            lock_source: Wheelhouse directory or index URL to resolve the
+                plugin's dependencies from into ``requirements.lock``
+            bootstrap_env: Create the project's ``.venv`` after the plugin's
+                ``post_generate_hook`` by cloning a cached environment with
+                its dependencies (installed from ``lock_source`` if given)
+            hook_pool: Run the hooks of external plugins (discovered via entry
+                points) in this pool's worker processes, under its timeout
+                and memory limit; a failing hook raises a ``HookError``
         """
         self.output_dir = Path(output_dir).resolve()
         self.no_input = no_input or default_config
@@ -41,9 +146,24 @@ class MCPProjectGenerator:
         self.verbose = verbose
         self.template_name = template
         self.project_name = project_name
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.extra_context = dict(extra_context or {})
 
-        # Get the template registry
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine '{engine}'. Available engines: {', '.join(ENGINES)}"
+            )
+        self.engine = engine
+        self.render_workers = max(1, render_workers)
+        self.lock_source = lock_source
+        self.bootstrap_env = bootstrap_env
+        self.hook_pool = hook_pool
+
+        # Get the template registry (discovering plugins on first use)
+        registry_start = time.perf_counter()
         self.registry = get_registry()
+        self._registry_duration = time.perf_counter() - registry_start
 
         # Validate template exists
         if not self.registry.get_plugin(template):
@@ -52,80 +172,1075 @@ class MCPProjectGenerator:
                 f"Template '{template}' not found. Available templates: {available}"
             )
 
-    def generate(self) -> Path:
+    @overload
+    def generate(
+        self,
+        plan_only: Literal[False] = False,
+        diff: bool = False,
+        profile: Literal[False] = False,
+        reproducible: Literal[False] = False,
+    ) -> Path: ...
+
+    @overload
+    def generate(
+        self,
+        plan_only: Literal[True],
+        diff: bool = False,
+        profile: bool = False,
+        reproducible: bool = False,
+    ) -> "GenerationPlan": ...
+
+    @overload
+    def generate(
+        self,
+        plan_only: Literal[False] = False,
+        diff: bool = False,
+        *,
+        profile: Literal[True],
+        reproducible: bool = False,
+    ) -> "GenerationProfile": ...
+
+    @overload
+    def generate(
+        self,
+        plan_only: Literal[False] = False,
+        diff: bool = False,
+        profile: Literal[False] = False,
+        *,
+        reproducible: Literal[True],
+    ) -> "ReproducibleProject": ...
+
+    def generate(
+        self,
+        plan_only: bool = False,
+        diff: bool = False,
+        profile: bool = False,
+        reproducible: bool = False,
+    ) -> Union[Path, "GenerationPlan", "GenerationProfile", "ReproducibleProject"]:
         """Generate a new MCP server project.
 
+        Args:
+            plan_only: Only compute which files would be created, changed or
+                skipped, without writing anything (see ``plan``)
+            diff: With ``plan_only``, include unified diffs of changed files
+            profile: Return a per-phase timing profile of the generation
+                instead of the project path (ignored with ``plan_only``)
+            reproducible: Generate a byte-identical tree for identical inputs
+                (see ``reproducible``) and return it with its digest
+
+        Returns:
+            Path to the generated project directory, the generation plan if
+            ``plan_only`` is set, the generation profile if ``profile`` is, or
+            the project path and tree digest if ``reproducible`` is
+
+        Raises:
+            Exception: If project generation fails
+        """
+        if plan_only:
+            return self.plan(with_diffs=diff)
+
+        if profile:
+            from .profiling import GenerationProfile
+
+            return GenerationProfile.from_events(
+                self.generate_iter(phases=True, reproducible=reproducible)
+            )
+
+        generated = None
+        for event in self.generate_iter(reproducible=reproducible):
+            if isinstance(event, ProjectGenerated):
+                generated = event
+        assert generated is not None
+        if reproducible:
+            from .reproducible import ReproducibleProject
+
+            assert generated.tree_digest is not None
+            return ReproducibleProject(generated.project_path, generated.tree_digest)
+        return generated.project_path
+
+    async def agenerate(self) -> Path:
+        """Generate a new MCP server project without blocking the event loop.
+
+        Rendering and file system work run on a thread pool shared by every
+        call, with at most ``aio.get_max_concurrency()`` generations running
+        at once (see ``aio.set_max_concurrency``); further calls wait for a
+        slot. Cancelling the call stops the generation at its next step and
+        removes what it rendered, unless the project was already published.
+
         Returns:
             Path to the generated project directory
 
         Raises:
+            asyncio.CancelledError: If the call is cancelled
             Exception: If project generation fails
         """
+        from .aio import run_cancellable
+
+        return await run_cancellable(self._generate_until_cancelled)
+
+    def _generate_until_cancelled(self, cancelled: threading.Event) -> Path:
+        """Generate the project, stopping between steps once ``cancelled`` is set.
+
+        Cancellation is honoured until the project is published, so a
+        published project always has its ``post_generate_hook`` applied.
+
+        Raises:
+            GenerationCancelled: If generation stopped before publishing
+        """
+        from .aio import GenerationCancelled
+
+        project_path = None
+        published = False
+        steps = self._generation_steps()
+        try:
+            for event in steps:
+                if isinstance(event, ProjectGenerated):
+                    project_path = event.project_path
+                elif isinstance(event, PhaseCompleted) and event.phase == "publish":
+                    published = True
+                elif cancelled.is_set() and not published:
+                    raise GenerationCancelled(self.template_name)
+        finally:
+            # Unwinds the staging directory of an interrupted generation
+            steps.close()
+        assert project_path is not None
+        return project_path
+
+    def generate_iter(
+        self, phases: bool = False, reproducible: bool = False
+    ) -> Iterator[GenerationEvent]:
+        """Generate a new MCP server project, yielding progress events.
+
+        Events are yielded as generation progresses: ``PluginResolved``,
+        ``HookRun`` (``pre_generate``), ``ContextFinalized``, then either
+        ``CacheHit`` or one ``FileRendered`` per file, ``HookRun``
+        (``post_generate``) and finally ``ProjectGenerated``. Nothing is
+        printed unless ``verbose`` is set.
+
+        Args:
+            phases: Also yield ``PhaseCompleted`` events timing the phases
+                that have no event of their own
+            reproducible: Generate a byte-identical tree for identical inputs
+                (see ``reproducible``); ``ProjectGenerated`` then carries its
+                digest
+
+        Yields:
+            Generation events, ending with ``ProjectGenerated``
+
+        Raises:
+            Exception: If project generation fails
+        """
+        for event in self._generation_steps(reproducible):
+            if phases or not isinstance(event, PhaseCompleted):
+                yield event
+
+    def _generation_steps(
+        self, reproducible: bool = False
+    ) -> Generator[GenerationEvent, None, None]:
+        """Generate the project, yielding every event including phases."""
+        start = time.perf_counter()
+        cookiecutter = _get_cookiecutter()
         if cookiecutter is None:
             raise Exception(
                 "cookiecutter is not installed. Please install it with: "
                 "pip install cookiecutter"
             )
+        yield PhaseCompleted("engine_import", time.perf_counter() - start)
 
         # Get the template plugin
+        lookup_start = time.perf_counter()
         plugin = self.registry.get_plugin(self.template_name)
         if not plugin:
             raise Exception(f"Template '{self.template_name}' not found")
 
-        template_dir = plugin.get_template_path()
+        template_dir = (
+            self.registry.get_template_path(self.template_name)
+            or plugin.get_template_path()
+        )
+        yield PhaseCompleted(
+            "registry_lookup",
+            self._registry_duration + time.perf_counter() - lookup_start,
+        )
 
         if self.verbose:
             print(f"🔨 Generating MCP server project in: {self.output_dir}")
             print(f"📁 Using template: {plugin.name} ({plugin.description})")
             print(f"📂 Template directory: {template_dir}")
+        yield PluginResolved(plugin.name, plugin.version, Path(template_dir))
 
         try:
-            # Get default context from plugin
-            default_context = plugin.get_default_context()
+            phase_start = time.perf_counter()
+            context = self._default_context(plugin)
+            yield PhaseCompleted("default_context", time.perf_counter() - phase_start)
+            hook_start = time.perf_counter()
+            context = self._run_hook(plugin, "pre_generate_hook", context)
+            yield HookRun("pre_generate", time.perf_counter() - hook_start)
+            yield ContextFinalized(context)
 
-            # Override project name if provided
-            if self.project_name:
-                default_context["project_name"] = self.project_name
-                if self.verbose:
-                    print(f"🏷️  Project name override: {self.project_name}")
+            epoch = None
+            if reproducible:
+                from .reproducible import get_source_date_epoch
 
-            # Apply pre-generation hook
-            if not self.no_input:
-                # In interactive mode, cookiecutter will handle the prompts
-                context = default_context
-            else:
-                # In non-interactive mode, use defaults
-                context = default_context
+                epoch = get_source_date_epoch()
+            project_path_obj, digest, context = yield from self._staged_steps(
+                plugin, template_dir, context, epoch
+            )
+
+            # Apply post-generation hook
+            hook_start = time.perf_counter()
+            self._run_hook(plugin, "post_generate_hook", project_path_obj, context)
+            yield HookRun("post_generate", time.perf_counter() - hook_start)
+
+            if self.bootstrap_env:
+                phase_start = time.perf_counter()
+                self._bootstrap_environment(plugin, project_path_obj, context)
+                yield PhaseCompleted("environment", time.perf_counter() - phase_start)
+
+        except Exception as e:
+            raise Exception(f"Failed to generate MCP server project: {e}") from e
+
+        yield ProjectGenerated(project_path_obj, time.perf_counter() - start, digest)
+
+    def _staged_steps(
+        self,
+        plugin: TemplatePlugin,
+        template_dir: Path,
+        context: Dict[str, Any],
+        epoch: Optional[int],
+    ) -> Generator[GenerationEvent, None, Tuple[Path, Optional[str], Dict[str, Any]]]:
+        """Render the project next to the output and publish it when finished.
 
-            context = plugin.pre_generate_hook(context)
+        Args:
+            plugin: Template plugin used for generation
+            template_dir: Template directory of the plugin
+            context: Final context after ``pre_generate_hook``
+            epoch: Source date epoch of a reproducible generation, or None
+
+        Returns:
+            Path to the published project, for reproducible generations its
+            tree digest, and the context it was rendered from: ``context``,
+            or in interactive mode the one replayed from the answers
+        """
+        from .reproducible import (
+            frozen_steps,
+            frozen_time,
+            normalize_tree,
+            tree_digest,
+        )
 
-            # Use cookiecutter to generate the project
+        digest = None
+        with StagingDirectory(self.output_dir) as staging:
             if self.no_input:
-                project_path = cookiecutter(
-                    str(template_dir),
-                    output_dir=str(self.output_dir),
-                    no_input=True,
-                    extra_context=context,
-                    config_file=self.config_file,
+                with frozen_time(epoch):
+                    name = self._project_dir_name(template_dir, context)
+                if name is not None:
+                    staging.check_target(name)
+                staged_path = yield from frozen_steps(
+                    self._render_cached(
+                        plugin, template_dir, context, staging.path, epoch
+                    ),
+                    epoch,
                 )
             else:
-                project_path = cookiecutter(
-                    str(template_dir),
-                    output_dir=str(self.output_dir),
-                    no_input=False,
-                    config_file=self.config_file,
+                # In interactive mode, cookiecutter will handle the prompts
+                staged_path = yield from frozen_steps(
+                    self._render_project(
+                        plugin, template_dir, None, staging.path, epoch
+                    ),
+                    epoch,
                 )
+                context = self._replay_context(plugin, template_dir, Path(staged_path))
 
-            project_path_obj = Path(project_path)
+            if self.lock_source:
+                phase_start = time.perf_counter()
+                self._write_lock(plugin, Path(staged_path), context, self.lock_source)
+                if epoch is not None:
+                    normalize_tree(Path(staged_path), epoch)
+                yield PhaseCompleted("lock", time.perf_counter() - phase_start)
 
-            # Apply post-generation hook
-            plugin.post_generate_hook(project_path_obj, context)
+            if epoch is not None:
+                phase_start = time.perf_counter()
+                digest = tree_digest(Path(staged_path))
+                yield PhaseCompleted("digest", time.perf_counter() - phase_start)
+
+            phase_start = time.perf_counter()
+            project_path = staging.publish(Path(staged_path))
+            yield PhaseCompleted("publish", time.perf_counter() - phase_start)
+        return project_path, digest, context
+
+    def _project_dir_name(
+        self, template_dir: Path, context: Dict[str, Any]
+    ) -> Optional[str]:
+        """Render the name of the project directory ahead of the generation.
+
+        Args:
+            template_dir: Template directory of the plugin
+            context: Final context after ``pre_generate_hook``
+
+        Returns:
+            Name of the project directory, or None if only cookiecutter can
+            render the template
+        """
+        from .rendering import get_renderer
+
+        try:
+            renderer = get_renderer(template_dir)
+        except ValueError:
+            return None  # Templates with cookiecutter hooks
+        full_context = renderer.build_context(
+            context, config_file=self.config_file, output_dir=str(self.output_dir)
+        )
+        env = renderer.create_environment(full_context)
+        return renderer.render_project_dir(full_context, env)
+
+    def _replay_context(
+        self, plugin: TemplatePlugin, template_dir: Path, project_path: Path
+    ) -> Dict[str, Any]:
+        """Rebuild the hook context from the answers of an interactive render.
+
+        The prompts may change any choice the plugin derives values from, such
+        as the dependencies, so the answers are run through
+        ``pre_generate_hook`` again.
+
+        Args:
+            plugin: Template plugin used for generation
+            template_dir: Template directory of the plugin
+            project_path: Project rendered from the prompted answers
+
+        Returns:
+            Context after the plugin's ``pre_generate_hook``
+        """
+        from .manifest import ProjectManifest, stored_context
+
+        try:
+            answers = ProjectManifest.load(project_path).context
+        except ValueError:
+            # No manifest, e.g. for templates with cookiecutter hooks
+            answers = stored_context(self._recover_context(template_dir, None))
+        context: Dict[str, Any] = self._run_hook(
+            plugin,
+            "pre_generate_hook",
+            {**plugin.get_default_context(), **answers},
+        )
+        return context
+
+    def render(self) -> "RenderedTree":
+        """Render the project into memory without touching disk.
+
+        The plugin's ``pre_generate_hook`` is applied, but since nothing is
+        written its ``post_generate_hook`` is not.
+
+        Returns:
+            The rendered project tree
+
+        Raises:
+            Exception: If rendering fails
+        """
+        from .rendering import get_renderer
+
+        plugin = self.registry.get_plugin(self.template_name)
+        if not plugin:
+            raise Exception(f"Template '{self.template_name}' not found")
+
+        try:
+            context = self._build_context(plugin)
+            renderer = get_renderer(plugin.get_template_path())
+            full_context = renderer.build_context(
+                context if self.no_input else None,
+                no_input=self.no_input,
+                config_file=self.config_file,
+                output_dir=str(self.output_dir),
+            )
+            return renderer.render(full_context, max_workers=self.render_workers)
+        except Exception as e:
+            raise Exception(f"Failed to render MCP server project: {e}") from e
+
+    def plan(self, with_diffs: bool = False) -> "GenerationPlan":
+        """Plan a generation without writing anything.
+
+        The project is rendered in memory and compared with the output
+        directory: files are reported as created, changed or skipped (already
+        identical), with their sizes.
+
+        Args:
+            with_diffs: Include unified diffs of files that would change
+
+        Returns:
+            The generation plan
+
+        Raises:
+            Exception: If rendering fails
+        """
+        from .plan import build_plan
+
+        tree = self.render()
+        if self.verbose:
+            print(f"📋 Planning MCP server project in: {self.output_dir}")
+        return build_plan(tree, self.output_dir, with_diffs=with_diffs)
+
+    def write_archive(self, fileobj: IO[bytes], fmt: str = "zip") -> str:
+        """Generate the project straight into a zip or tar.gz stream.
+
+        Files are rendered in memory one at a time and appended to the archive
+        under the project directory name, including the generation manifest,
+        so memory use is bounded by the largest file. ``fileobj`` is never
+        seeked. The context and hooks are applied as by ``generate()``; plugins
+        overriding ``post_generate_hook`` and templates with cookiecutter hook
+        scripts need files on disk, so they are generated in a temporary
+        staging directory which is then archived.
+
+        Args:
+            fileobj: Binary file object receiving the archive (left open)
+            fmt: Archive format, "zip" or "tar.gz"
+
+        Returns:
+            Name of the project directory at the root of the archive
+
+        Raises:
+            Exception: If project generation fails
+        """
+        from .archive import ArchiveWriter
+
+        root = ""
+        with ArchiveWriter(fileobj, fmt) as writer:
+            for member in self._archive_members():
+                root = root or member.path
+                writer.add(member)
+        return root
+
+    def iter_archive(self, fmt: str = "zip") -> Iterator[bytes]:
+        """Generate the project as a stream of zip or tar.gz chunks.
+
+        This is ``write_archive`` for callers that pull data, such as
+        streaming HTTP responses: a chunk is yielded after each archive member.
+
+        Args:
+            fmt: Archive format, "zip" or "tar.gz"
+
+        Yields:
+            Consecutive chunks of the archive
+
+        Raises:
+            Exception: If project generation fails
+        """
+        from .archive import ArchiveWriter, ChunkSink
+
+        sink = ChunkSink()
+        with ArchiveWriter(sink, fmt) as writer:  # type: ignore[arg-type]
+            for member in self._archive_members():
+                writer.add(member)
+                yield from sink.drain()
+        yield from sink.drain()
+
+    def _archive_members(self) -> Iterator["ArchiveMember"]:
+        """Generate the project as archive members, lazily.
+
+        Yields:
+            Archive members, prefixed with the project directory name
+
+        Raises:
+            Exception: If project generation fails
+        """
+        from .archive import iter_directory
+        from .rendering import get_renderer
+
+        plugin = self.registry.get_plugin(self.template_name)
+        if not plugin:
+            raise Exception(f"Template '{self.template_name}' not found")
+        template_dir = (
+            self.registry.get_template_path(self.template_name)
+            or plugin.get_template_path()
+        )
 
-            return project_path_obj
+        try:
+            renderer = get_renderer(template_dir)
+        except ValueError:
+            renderer = None  # Cookiecutter hook scripts need files on disk
+        hook = type(plugin).post_generate_hook
+        if (
+            renderer is None
+            or hook is not TemplatePlugin.post_generate_hook
+            or self.lock_source
+        ):
+            with tempfile.TemporaryDirectory(prefix="egile-mcp-starter-") as staging:
+                staged = copy.copy(self)
+                staged.output_dir = Path(staging)
+                staged.bootstrap_env = False  # Environments are not portable
+                yield from iter_directory(staged.generate())
+            return
 
+        try:
+            yield from self._render_members(plugin, renderer)
         except Exception as e:
             raise Exception(f"Failed to generate MCP server project: {e}") from e
 
+    def _render_members(
+        self, plugin: TemplatePlugin, renderer: "TemplateRenderer"
+    ) -> Iterator["ArchiveMember"]:
+        """Render the project in memory as archive members, one file at a time.
+
+        Args:
+            plugin: Template plugin used for generation
+            renderer: Renderer of the plugin's template
+
+        Yields:
+            The project directory, its subdirectories, then each file followed
+            by its manifest blob, and finally the manifest itself
+        """
+        from .archive import ArchiveMember
+        from .manifest import (
+            MANIFEST_DIR,
+            MANIFEST_FILE,
+            OBJECTS_DIR,
+            ManifestEntry,
+            ProjectManifest,
+            analyze_source,
+            encode_blob,
+            sha256_bytes,
+            stored_context,
+        )
+        from .rendering import SourceFile, ordered_map
+
+        context = self._build_context(plugin)
+        full_context = renderer.build_context(
+            context if self.no_input else None,
+            no_input=self.no_input,
+            config_file=self.config_file,
+            output_dir=str(self.output_dir),
+        )
+        env = renderer.create_environment(full_context)
+        tree = renderer.empty_tree(full_context, env)
+        root = tree.project_dir
+        meta = f"{root}/{MANIFEST_DIR}"
+        yield ArchiveMember(root, None)
+        for directory in sorted(tree.directories):
+            yield ArchiveMember(f"{root}/{directory}", None)
+        yield ArchiveMember(meta, None)
+        yield ArchiveMember(f"{meta}/{OBJECTS_DIR}", None)
+
+        manifest = ProjectManifest(
+            plugin.name, plugin.version, stored_context(full_context)
+        )
+        blobs = set()
+        _, sources = renderer.walk(full_context)
+
+        def render(source: SourceFile) -> Tuple[SourceFile, Any]:
+            return source, renderer.render_file(source, full_context, env)
+
+        for source, rendered in ordered_map(render, sources, self.render_workers):
+            if rendered is None:
+                continue  # The file name rendered to nothing
+            yield ArchiveMember(
+                f"{root}/{rendered.path}", rendered.content, rendered.mode
+            )
+            info = analyze_source(renderer, source, full_context, env)
+            assert info is not None
+            digest = sha256_bytes(rendered.content)
+            manifest.files[source.path] = ManifestEntry(
+                path=info.path,
+                sha256=digest,
+                source_hash=info.source_hash,
+                variables=info.variables,
+                mode=info.mode,
+            )
+            if digest not in blobs:
+                blobs.add(digest)
+                yield ArchiveMember(
+                    f"{meta}/{OBJECTS_DIR}/{digest}", encode_blob(rendered.content)
+                )
+
+        content = manifest.to_json().encode("utf-8")
+        yield ArchiveMember(f"{meta}/{MANIFEST_FILE}", content)
+
+    def _write_lock(
+        self,
+        plugin: TemplatePlugin,
+        project_path: Path,
+        context: Dict[str, Any],
+        source: str,
+    ) -> None:
+        """Write the resolved dependencies of the plugin into the project.
+
+        Args:
+            plugin: Template plugin used for generation
+            project_path: Path to the generated project
+            context: Context after the plugin's ``pre_generate_hook``
+            source: Wheelhouse directory or index URL
+
+        Raises:
+            ValueError: If the dependencies cannot be resolved
+        """
+        from .lock import LOCK_FILE, lock_dependencies
+
+        dependencies = plugin.get_dependencies(context)
+        if not dependencies:
+            if self.verbose:
+                print(f"🔒 No dependencies to lock for template: {plugin.name}")
+            return
+
+        # Resolve for the project's interpreter, which bootstrap_env installs
+        # the lock into, rather than for the one running the generator
+        python_version = context.get("python_version")
+        content = lock_dependencies(
+            dependencies,
+            source,
+            python_version=python_version if isinstance(python_version, str) else None,
+        )
+        (project_path / LOCK_FILE).write_text(content, encoding="utf-8")
+        if self.verbose:
+            print(f"🔒 Locked dependencies from: {source}")
+
+    def _bootstrap_environment(
+        self, plugin: TemplatePlugin, project_path: Path, context: Dict[str, Any]
+    ) -> None:
+        """Create the project's ``.venv`` from the environment cache.
+
+        Runs in the generating process rather than in a plugin hook, so it is
+        not bound by the limits of isolated hooks.
+
+        Args:
+            plugin: Template plugin used for generation
+            project_path: Path to the generated project
+            context: Context after the plugin's ``pre_generate_hook``
+
+        Raises:
+            ValueError: If the environment cannot be created
+        """
+        from .environments import bootstrap_environment
+
+        python_version = context.get("python_version")
+        environment = bootstrap_environment(
+            project_path,
+            plugin.get_dependencies(context),
+            python_version=python_version if isinstance(python_version, str) else None,
+            source=self.lock_source,
+        )
+        if self.verbose:
+            print(f"🐍 Created project environment: {environment}")
+
+    def _build_context(self, plugin: TemplatePlugin) -> Dict[str, Any]:
+        """Build the generation context from plugin defaults and overrides.
+
+        Args:
+            plugin: Template plugin used for generation
+
+        Returns:
+            Context after the plugin's ``pre_generate_hook``
+        """
+        context: Dict[str, Any] = self._run_hook(
+            plugin, "pre_generate_hook", self._default_context(plugin)
+        )
+        return context
+
+    def _run_hook(self, plugin: TemplatePlugin, hook: str, *args: Any) -> Any:
+        """Run a plugin hook, in the hook pool for external plugins.
+
+        Args:
+            plugin: Template plugin used for generation
+            hook: Name of the hook method
+            *args: Arguments of the hook
+
+        Returns:
+            What the hook returned
+        """
+        info = self.registry.get_plugin_info(plugin.name)
+        if self.hook_pool and info and self.registry.is_external(plugin.name):
+            return self.hook_pool.call(info, hook, *args)
+        return getattr(plugin, hook)(*args)
+
+    def _default_context(self, plugin: TemplatePlugin) -> Dict[str, Any]:
+        """Merge the plugin's default context with the generator's overrides.
+
+        Args:
+            plugin: Template plugin used for generation
+
+        Returns:
+            Context before the plugin's ``pre_generate_hook``
+        """
+        # Fail fast if the template's feature rules do not match the plugin
+        plugin.get_feature_manifest()
+
+        # Get default context from plugin
+        default_context = plugin.get_default_context()
+        default_context.update(self.extra_context)
+
+        # Override project name if provided
+        if self.project_name:
+            default_context["project_name"] = self.project_name
+            if self.verbose:
+                print(f"🏷️  Project name override: {self.project_name}")
+
+        # Apply pre-generation hook
+        if not self.no_input:
+            # In interactive mode, cookiecutter will handle the prompts
+            context = default_context
+        else:
+            # In non-interactive mode, use defaults
+            context = default_context
+
+        return context
+
+    @classmethod
+    def generate_many(
+        cls,
+        entries: Iterable["BatchEntry"],
+        max_workers: Optional[int] = None,
+        config_file: Optional[str] = None,
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
+        engine: str = "cookiecutter",
+        hook_limits: Optional["HookLimits"] = None,
+    ) -> List["BatchResult"]:
+        """Generate many projects non-interactively across a process pool.
+
+        Each worker process resolves the template registry and template paths
+        once and reuses them for every entry it renders.
+
+        Args:
+            entries: ``(template, context, output_dir)`` entries to generate
+            max_workers: Number of worker processes (default: CPU count)
+            config_file: Path to cookiecutter config file
+            use_cache: Reuse previously rendered projects
+            cache_dir: Override the render cache location
+            engine: Rendering engine used by every worker
+            hook_limits: Run the hooks of external plugins in isolated worker
+                processes under these limits (see ``plugins.isolation``)
+
+        Returns:
+            One result per entry, in the order the entries were given
+        """
+        from .batch import run_batch
+
+        return run_batch(
+            entries,
+            max_workers=max_workers,
+            config_file=config_file,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            engine=engine,
+            hook_limits=hook_limits,
+        )
+
+    def _render_cached(
+        self,
+        plugin: TemplatePlugin,
+        template_dir: Path,
+        context: Dict[str, Any],
+        destination: Path,
+        epoch: Optional[int] = None,
+    ) -> _RenderSteps:
+        """Render a non-interactive project, going through the render cache.
+
+        Args:
+            plugin: Template plugin used for generation
+            template_dir: Template directory of the plugin
+            context: Final context after ``pre_generate_hook``
+            destination: Directory in which the project directory is created
+            epoch: Source date epoch of a reproducible generation, or None
+
+        Returns:
+            Path to the generated project directory
+        """
+        if not self.use_cache:
+            return (
+                yield from self._render_project(
+                    plugin, template_dir, context, destination, epoch
+                )
+            )
+
+        from .cache import RenderCache, compute_cache_key
+
+        cache = RenderCache(Path(self.cache_dir) if self.cache_dir else None)
+        key = compute_cache_key(
+            template_dir, plugin.version, context, self.config_file, epoch
+        )
+
+        cached_project = cache.get(key)
+        if cached_project is not None:
+            if self.verbose:
+                print(f"♻️  Reusing cached render: {key[:12]}")
+            yield CacheHit(key)
+            materialized = cache.materialize(cached_project, destination)
+            if epoch is not None:
+                # Cached files are already normalized: only directories change
+                from .reproducible import normalize_tree
+
+                normalize_tree(materialized, epoch)
+            return str(materialized)
+
+        project_path = yield from self._render_project(
+            plugin, template_dir, context, destination, epoch
+        )
+        phase_start = time.perf_counter()
+        try:
+            cache.put(key, Path(project_path))
+        except OSError as e:
+            # A broken cache must never fail an otherwise successful generation
+            if self.verbose:
+                print(f"⚠️  Could not store render in cache: {e}")
+        yield PhaseCompleted("cache_store", time.perf_counter() - phase_start)
+        return project_path
+
+    def _render_project(
+        self,
+        plugin: TemplatePlugin,
+        template_dir: Path,
+        context: Optional[Dict[str, Any]],
+        destination: Path,
+        epoch: Optional[int] = None,
+    ) -> _RenderSteps:
+        """Render the template with the configured engine and record it.
+
+        Args:
+            plugin: Template plugin used for generation
+            template_dir: Template directory of the plugin
+            context: Context overrides, or None to prompt for every value
+            destination: Directory in which the project directory is created
+                (the context still records ``output_dir``)
+            epoch: Source date epoch of a reproducible generation, whose file
+                metadata is normalized once rendered, or None
+
+        Yields:
+            One ``FileRendered`` event per project file
+
+        Returns:
+            Path to the generated project directory
+        """
+        from .rendering import get_renderer
+
+        full_context: Optional[Dict[str, Any]]
+        if self.engine == "memory":
+            phase_start = time.perf_counter()
+            renderer = get_renderer(template_dir)
+            full_context = renderer.build_context(
+                context,
+                no_input=self.no_input,
+                config_file=self.config_file,
+                output_dir=str(self.output_dir),
+            )
+            env = renderer.create_environment(full_context)
+            tree = renderer.empty_tree(full_context, env)
+            yield PhaseCompleted("template_context", time.perf_counter() - phase_start)
+            for rendered in renderer.iter_files(
+                full_context, env, self.render_workers, lazy_copies=True
+            ):
+                tree.files[rendered.path] = rendered
+                yield FileRendered(
+                    rendered.path,
+                    rendered.size,
+                    rendered.duration,
+                    rendered.compile_duration,
+                )
+            phase_start = time.perf_counter()
+            project_path = str(tree.write_to(destination, self.render_workers))
+            yield PhaseCompleted("write", time.perf_counter() - phase_start)
+        else:
+            from .bundles import materialize_template
+
+            phase_start = time.perf_counter()
+            template_path = materialize_template(template_dir)
+            full_context, mirror = self._mirror_template(
+                template_dir, template_path, context
+            )
+            try:
+                project_path = _get_cookiecutter()(
+                    str(mirror or template_path),
+                    output_dir=str(destination),
+                    no_input=self.no_input,
+                    extra_context=context,
+                    config_file=self.config_file,
+                )
+            finally:
+                if mirror is not None:
+                    shutil.rmtree(mirror.parent, ignore_errors=True)
+            if mirror is None:
+                full_context = self._prune_features(
+                    template_dir, Path(project_path), context
+                )
+            yield PhaseCompleted("cookiecutter", time.perf_counter() - phase_start)
+            for relative, size in _list_files(Path(project_path)):
+                yield FileRendered(relative, size)
+
+        phase_start = time.perf_counter()
+        self._write_manifest(
+            plugin, template_dir, Path(project_path), context, full_context, epoch
+        )
+        yield PhaseCompleted("manifest", time.perf_counter() - phase_start)
+
+        if epoch is not None:
+            from .reproducible import normalize_tree
+
+            phase_start = time.perf_counter()
+            normalize_tree(Path(project_path), epoch)
+            yield PhaseCompleted("normalize", time.perf_counter() - phase_start)
+        return project_path
+
+    def _write_manifest(
+        self,
+        plugin: TemplatePlugin,
+        template_dir: Path,
+        project_path: Path,
+        context: Optional[Dict[str, Any]],
+        full_context: Optional[Dict[str, Any]],
+        epoch: Optional[int] = None,
+    ) -> None:
+        """Record the freshly rendered project for later ``update`` runs.
+
+        Args:
+            plugin: Template plugin used for generation
+            template_dir: Template directory of the plugin
+            project_path: Generated project directory
+            context: Context overrides used for generation, or None if every
+                value was prompted for
+            full_context: Full cookiecutter context, or None to rebuild it
+                from ``context`` or cookiecutter's replay file
+            epoch: Source date epoch of a reproducible generation, or None
+        """
+        from .manifest import write_manifest
+        from .rendering import get_renderer
+
+        if not project_path.is_dir():
+            return
+
+        try:
+            renderer = get_renderer(template_dir)
+        except ValueError as e:
+            # Templates with cookiecutter hooks cannot be updated incrementally
+            if self.verbose:
+                print(f"⚠️  Not writing a generation manifest: {e}")
+            return
+
+        if full_context is None:
+            full_context = self._recover_context(template_dir, context)
+        write_manifest(
+            project_path,
+            plugin.name,
+            plugin.version,
+            renderer,
+            full_context,
+            normalize_modes=epoch is not None,
+        )
+
+    def _recover_context(
+        self, template_dir: Path, context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Rebuild the full context of a project rendered by cookiecutter.
+
+        Args:
+            template_dir: Template directory of the plugin
+            context: Context overrides used for generation, or None if every
+                value was prompted for
+
+        Returns:
+            Full cookiecutter context, rebuilt from ``context`` or read from
+            cookiecutter's replay file
+        """
+        from .rendering import get_renderer
+
+        if context is not None:
+            return get_renderer(template_dir).build_context(
+                context,
+                config_file=self.config_file,
+                output_dir=str(self.output_dir),
+            )
+
+        from cookiecutter.config import get_user_config  # type: ignore
+        from cookiecutter.replay import load  # type: ignore
+
+        from .bundles import materialize_template
+
+        # Cookiecutter names replays after the directory it rendered
+        replay_dir = get_user_config(config_file=self.config_file)["replay_dir"]
+        full_context: Dict[str, Any] = load(
+            replay_dir, materialize_template(template_dir).name
+        )
+        return full_context
+
+    def _mirror_template(
+        self,
+        template_dir: Path,
+        template_path: Path,
+        context: Optional[Dict[str, Any]],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Path]]:
+        """Mirror the template without the files of disabled features.
+
+        Args:
+            template_dir: Template directory or bundle of the plugin
+            template_path: Template directory cookiecutter would render
+            context: Context overrides used for generation, or None if every
+                value is prompted for
+
+        Returns:
+            Full cookiecutter context and mirror (in a temporary directory, to
+            be removed by the caller), or ``(None, None)`` if the generation
+            is interactive, the template has no feature rules or it cannot be
+            handled by the in-memory renderer (cookiecutter hook scripts)
+        """
+        from .features import mirror_template
+        from .rendering import get_renderer
+
+        if context is None:
+            return None, None  # Features depend on the answers to prompts
+        try:
+            renderer = get_renderer(template_dir)
+        except ValueError:
+            return None, None
+        if not renderer.features.rules:
+            return None, None
+
+        full_context = self._recover_context(template_dir, context)
+        disabled = renderer.features.disabled_paths(full_context)
+        # Cookiecutter names its replay file after the template directory
+        mirror = Path(tempfile.mkdtemp(prefix="egile-template-")) / template_path.name
+        try:
+            mirror_template(template_path, renderer.root_name, disabled, mirror)
+        except BaseException:
+            shutil.rmtree(mirror.parent, ignore_errors=True)
+            raise
+        return full_context, mirror
+
+    def _prune_features(
+        self,
+        template_dir: Path,
+        project_path: Path,
+        context: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Remove the files of disabled features from a cookiecutter render.
+
+        Non-interactive generations render a mirror of the template without
+        them (see ``_mirror_template``). Interactive ones only know which
+        features are enabled once cookiecutter prompted for them, so they
+        are deleted before anything else sees the project.
+
+        Args:
+            template_dir: Template directory of the plugin
+            project_path: Project directory written by cookiecutter
+            context: Context overrides used for generation, or None if every
+                value was prompted for
+
+        Returns:
+            Full cookiecutter context, or None if the template cannot be
+            handled by the in-memory renderer (cookiecutter hook scripts)
+        """
+        from .rendering import get_renderer
+
+        try:
+            renderer = get_renderer(template_dir)
+        except ValueError:
+            return None
+        if not renderer.features.rules or not project_path.is_dir():
+            return None
+
+        full_context = self._recover_context(template_dir, context)
+        env = renderer.create_environment(full_context)
+        for relative in renderer.disabled_outputs(full_context, env):
+            path = project_path / relative
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+        return full_context
+
     def get_default_context(self) -> Dict[str, Any]:
         """Get the default context variables for the template.
 
@@ -158,5 +1273,5 @@ class MCPProjectGenerator:
             Dictionary mapping template names to descriptions
         """
         return {
-            plugin.name: plugin.description for plugin in self.registry.list_plugins()
+            info.name: info.description for info in self.registry.list_plugin_info()
         }
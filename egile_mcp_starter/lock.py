@@ -0,0 +1,258 @@
+"""Offline dependency locks for generated projects.
+
+The dependencies computed by a template plugin are resolved once with pip
+against a local wheelhouse or an index mirror, and written to the generated
+project as a fully pinned, hashed requirements file. The first install of
+the project can then skip dependency resolution entirely::
+
+    pip install --no-deps --require-hashes -r requirements.lock
+
+Resolved locks are cached under the cache root, keyed by the dependency
+set, the source contents and the target interpreter.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .cache import get_cache_root
+
+LOCK_FILE = "requirements.lock"
+
+
+class LockSource(NamedTuple):
+    """Where packages are resolved from."""
+
+    location: str  # Wheelhouse directory or index URL
+    pip_args: List[str]
+    fingerprint: str  # Changes whenever the available packages may change
+
+
+class LockedPackage(NamedTuple):
+    """A pinned distribution."""
+
+    name: str
+    version: str
+    sha256: Optional[str] = None
+
+
+def _canonical_name(requirement: str) -> str:
+    """Normalized project name of a requirement (PEP 503)."""
+    name = re.split(r"[\s\[<>=!~;@]", requirement.strip(), maxsplit=1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def normalize_requirements(requirements: Iterable[str]) -> List[str]:
+    """Deduplicate requirements and drop standard library modules.
+
+    Plugins sometimes list modules such as ``sqlite3`` that ship with Python
+    and cannot be installed from an index.
+
+    Args:
+        requirements: Requirement specifiers
+
+    Returns:
+        Sorted requirements, at most one per project
+    """
+    unique: Dict[str, str] = {}
+    for requirement in requirements:
+        name = _canonical_name(requirement)
+        if not name or name.replace("-", "_") in sys.stdlib_module_names:
+            continue
+        unique.setdefault(name, requirement.strip())
+    return [unique[name] for name in sorted(unique)]
+
+
+def get_lock_source(source: str) -> LockSource:
+    """Interpret a lock source given by the user.
+
+    Args:
+        source: Wheelhouse directory, or ``http(s)://`` / ``file://`` index URL
+
+    Returns:
+        The pip arguments and fingerprint of the source
+
+    Raises:
+        ValueError: If the source is neither a directory nor a URL
+    """
+    if re.match(r"^(https?|file)://", source):
+        return LockSource(source, ["--index-url", source], source)
+
+    wheelhouse = Path(source).expanduser().resolve()
+    if not wheelhouse.is_dir():
+        raise ValueError(
+            f"Lock source '{source}' is neither a wheelhouse directory nor an "
+            "index URL"
+        )
+    digest = hashlib.sha256(str(wheelhouse).encode("utf-8"))
+    for entry in sorted(os.scandir(wheelhouse), key=lambda e: e.name):
+        if entry.is_file():
+            info = entry.stat()
+            digest.update(
+                f"\0{entry.name}\0{info.st_size}\0{info.st_mtime_ns}".encode()
+            )
+    return LockSource(
+        str(wheelhouse),
+        ["--no-index", "--find-links", str(wheelhouse)],
+        digest.hexdigest(),
+    )
+
+
+def _target_args(python_version: Optional[str], target_dir: str) -> List[str]:
+    """pip arguments resolving for another Python version than the running one.
+
+    pip only accepts a foreign Python version when installing into a target
+    directory, which stays empty in dry-run mode.
+    """
+    current = f"{sys.version_info.major}.{sys.version_info.minor}"
+    if not python_version or python_version == current:
+        return []
+    return [
+        "--python-version",
+        python_version,
+        "--only-binary=:all:",
+        "--target",
+        target_dir,
+    ]
+
+
+def resolve(
+    requirements: List[str], source: LockSource, python_version: Optional[str] = None
+) -> List[LockedPackage]:
+    """Resolve requirements to pinned distributions with pip.
+
+    Nothing is installed: pip runs in dry-run mode and reports what it would
+    install into an empty environment.
+
+    Args:
+        requirements: Requirement specifiers
+        source: Where packages are resolved from
+        python_version: Target ``X.Y`` Python version (default: running one)
+
+    Returns:
+        Pinned distributions, sorted by name
+
+    Raises:
+        ValueError: If the requirements cannot be resolved from the source
+    """
+    with tempfile.TemporaryDirectory(prefix="egile-lock-") as target_dir:
+        command = [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--dry-run",
+            "--ignore-installed",
+            "--disable-pip-version-check",
+            "--quiet",
+            "--report",
+            "-",
+            *source.pip_args,
+            *_target_args(python_version, target_dir),
+            *requirements,
+        ]
+        process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode != 0:
+        detail = process.stderr.strip().splitlines()[-1:] or ["pip failed"]
+        raise ValueError(
+            f"Could not resolve dependencies from {source.location}: {detail[0]}"
+        )
+
+    report: Dict[str, Any] = json.loads(process.stdout)
+    packages = []
+    for item in report.get("install", []):
+        metadata = item["metadata"]
+        hashes = item.get("download_info", {}).get("archive_info", {}).get("hashes")
+        packages.append(
+            LockedPackage(
+                _canonical_name(metadata["name"]),
+                metadata["version"],
+                (hashes or {}).get("sha256"),
+            )
+        )
+    return sorted(packages)
+
+
+def format_lock(
+    packages: List[LockedPackage], source: LockSource, python_version: str
+) -> str:
+    """Render pinned distributions as a requirements file.
+
+    Hashes are only written when every distribution has one, since pip's
+    hash-checking mode requires them all.
+
+    Args:
+        packages: Pinned distributions
+        source: Where they were resolved from
+        python_version: Python version they were resolved for
+
+    Returns:
+        Content of the lock file
+    """
+    hashed = all(package.sha256 for package in packages)
+    options = "--no-deps --require-hashes" if hashed else "--no-deps"
+    lines = [
+        f"# Resolved by egile-mcp-starter for Python {python_version} "
+        f"from {source.location}",
+        f"# Install without resolving: pip install {options} -r {LOCK_FILE}",
+    ]
+    for package in packages:
+        pin = f"{package.name}=={package.version}"
+        lines.append(f"{pin} \\\n    --hash=sha256:{package.sha256}" if hashed else pin)
+    return "\n".join(lines) + "\n"
+
+
+def lock_dependencies(
+    requirements: Iterable[str],
+    source: str,
+    python_version: Optional[str] = None,
+    use_cache: bool = True,
+) -> str:
+    """Build the lock file content for a dependency set, reusing cached locks.
+
+    Args:
+        requirements: Requirement specifiers (standard library modules and
+            duplicates are dropped)
+        source: Wheelhouse directory or index URL
+        python_version: Target ``X.Y`` Python version (default: running one)
+        use_cache: Reuse a lock resolved earlier for the same inputs
+
+    Returns:
+        Content of the lock file
+
+    Raises:
+        ValueError: If the source is invalid or resolution fails
+    """
+    lock_source = get_lock_source(source)
+    wanted = normalize_requirements(requirements)
+    target = python_version or f"{sys.version_info.major}.{sys.version_info.minor}"
+    payload = {
+        "requirements": wanted,
+        "source": lock_source.fingerprint,
+        "python": target,
+        "platform": [sys.platform, platform.machine()],
+    }
+    key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    cache_path = get_cache_root() / "locks" / f"{key}.lock"
+    if use_cache:
+        try:
+            return cache_path.read_text(encoding="utf-8")
+        except OSError:
+            pass
+
+    content = format_lock(resolve(wanted, lock_source, target), lock_source, target)
+    tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass  # Caching is an optimization only
+    return content
@@ -0,0 +1,389 @@
+"""Per-project generation manifest used for incremental updates.
+
+Every generated project contains a ``.egile-mcp-starter`` directory holding
+``manifest.json`` and the pristine content of each rendered file, stored as
+compressed, content-addressed blobs. The manifest records the template, its
+version, the context and, for each template file, the hash of its source,
+the context variables it depends on and the hash of its rendered output.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Set
+
+from jinja2 import Environment, nodes
+
+from .fastcopy import CHUNK_SIZE
+from .reproducible import normalized_mode
+
+if TYPE_CHECKING:
+    from .rendering import SourceFile, TemplateRenderer
+
+MANIFEST_DIR = ".egile-mcp-starter"
+MANIFEST_FILE = "manifest.json"
+OBJECTS_DIR = "objects"  # Pristine file content, by SHA-256
+MANIFEST_VERSION = 1
+
+# Files larger than this are stored with fast rather than best compression
+LARGE_BLOB_SIZE = 8 * 1024 * 1024
+
+# Marker for files depending on the whole context (includes, macros, loops
+# over ``cookiecutter`` ...): any context change re-renders them
+ALL_VARIABLES = "*"
+
+# Context entries describing where and how a project was rendered rather
+# than what it contains
+_HOST_KEYS = ("_template", "_output_dir", "_repo_dir", "_checkout")
+
+
+def sha256_bytes(content: bytes) -> str:
+    """Hex SHA-256 digest of some content."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def sha256_stream(stream: IO[bytes]) -> str:
+    """Hex SHA-256 digest of a binary stream, read one chunk at a time."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_variables(env: Environment, source: str) -> List[str]:
+    """Find the ``cookiecutter`` variables a template string depends on.
+
+    Args:
+        env: Jinja environment with the template's extensions loaded
+        source: Template source (file content or templated path)
+
+    Returns:
+        Sorted variable names, or ``["*"]`` if the dependencies cannot be
+        determined statically
+    """
+    found: Set[str] = set()
+    whole_context = False
+
+    def visit(node: nodes.Node) -> None:
+        nonlocal whole_context
+        if isinstance(node, (nodes.Include, nodes.Import, nodes.FromImport)):
+            whole_context = True
+        elif isinstance(node, nodes.Extends):
+            whole_context = True
+        elif isinstance(node, (nodes.Getattr, nodes.Getitem)) and _is_context(
+            node.node
+        ):
+            if isinstance(node, nodes.Getattr):
+                found.add(node.attr)
+                return
+            if isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str):
+                found.add(node.arg.value)
+                return
+            whole_context = True
+        elif _is_context(node):
+            whole_context = True
+        for child in node.iter_child_nodes():
+            visit(child)
+
+    visit(env.parse(source))
+    return [ALL_VARIABLES] if whole_context else sorted(found)
+
+
+def _is_context(node: nodes.Node) -> bool:
+    """Whether a node refers to the ``cookiecutter`` context itself."""
+    return isinstance(node, nodes.Name) and node.name == "cookiecutter"
+
+
+def stored_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip host-specific entries from a full cookiecutter context.
+
+    Args:
+        context: Full cookiecutter context
+
+    Returns:
+        The ``cookiecutter`` variables worth recording in a manifest
+    """
+    return {
+        key: value
+        for key, value in context["cookiecutter"].items()
+        if key not in _HOST_KEYS
+    }
+
+
+@dataclass
+class ManifestEntry:
+    """Generation record of a single template file."""
+
+    path: str  # Rendered path, relative to the project directory
+    sha256: str  # Hash of the rendered content (also the blob name)
+    source_hash: str  # Hash of the template file
+    variables: List[str] = field(default_factory=list)
+    mode: int = 0o644
+
+
+@dataclass
+class ProjectManifest:
+    """Generation record of a whole project."""
+
+    template: str
+    template_version: str
+    context: Dict[str, Any]
+    files: Dict[str, ManifestEntry] = field(default_factory=dict)  # By source
+    version: int = MANIFEST_VERSION
+
+    @classmethod
+    def load(cls, project_dir: Path) -> "ProjectManifest":
+        """Load the manifest of a generated project.
+
+        Args:
+            project_dir: Generated project directory
+
+        Returns:
+            The project manifest
+
+        Raises:
+            ValueError: If the project has no readable manifest
+        """
+        path = Path(project_dir) / MANIFEST_DIR / MANIFEST_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')}")
+            files = {
+                source: ManifestEntry(**entry)
+                for source, entry in data.pop("files").items()
+            }
+            return cls(files=files, **data)
+        except FileNotFoundError:
+            raise ValueError(
+                f"'{project_dir}' has no {MANIFEST_DIR}/{MANIFEST_FILE}; "
+                "it was not generated by egile-mcp-starter or predates manifests"
+            ) from None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid manifest '{path}': {e}") from e
+
+    def to_json(self) -> str:
+        """Serialize the manifest as written to ``manifest.json``."""
+        data = asdict(self)
+        data["files"] = {
+            source: data["files"][source] for source in sorted(data["files"])
+        }
+        return json.dumps(data, indent=2, sort_keys=False, default=str) + "\n"
+
+    def save(self, project_dir: Path) -> None:
+        """Write the manifest and drop blobs it no longer references.
+
+        Args:
+            project_dir: Generated project directory
+        """
+        manifest_dir = Path(project_dir) / MANIFEST_DIR
+        manifest_dir.mkdir(exist_ok=True)
+        write_atomic(manifest_dir / MANIFEST_FILE, self.to_json().encode("utf-8"))
+
+        referenced = {entry.sha256 for entry in self.files.values()}
+        objects_dir = manifest_dir / OBJECTS_DIR
+        if objects_dir.is_dir():
+            for blob in objects_dir.iterdir():
+                if blob.name not in referenced:
+                    blob.unlink()
+
+
+def write_atomic(path: Path, content: bytes, mode: Optional[int] = None) -> None:
+    """Replace a file with new content, never modifying the old file in place.
+
+    The content is written to a temporary file next to ``path`` and renamed
+    over it, so readers never see a partial file and other links to the old
+    file keep the old content.
+
+    Args:
+        path: File to write, created with its parent directories if missing
+        content: New content
+        mode: Permission bits (default: left to the umask)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        with open(fd, "wb") as fh:
+            fh.write(content)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def store_blob(project_dir: Path, content: bytes) -> str:
+    """Store pristine file content in the project's blob store.
+
+    Args:
+        project_dir: Generated project directory
+        content: Rendered file content
+
+    Returns:
+        Content hash, under which the blob can be read back
+    """
+    digest = sha256_bytes(content)
+    objects_dir = Path(project_dir) / MANIFEST_DIR / OBJECTS_DIR
+    blob = objects_dir / digest
+    if not blob.exists():
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        blob.write_bytes(encode_blob(content))
+    return digest
+
+
+def store_file_blob(project_dir: Path, path: Path) -> str:
+    """Store a project file in the project's blob store without loading it.
+
+    Equivalent to ``store_blob(project_dir, path.read_bytes())``, except that
+    large files are compressed faster (blobs decode the same way).
+
+    Args:
+        project_dir: Generated project directory
+        path: File to store
+
+    Returns:
+        Content hash, under which the blob can be read back
+    """
+    objects_dir = Path(project_dir) / MANIFEST_DIR / OBJECTS_DIR
+    objects_dir.mkdir(parents=True, exist_ok=True)
+    tmp = objects_dir / f".{os.getpid()}.{threading.get_ident()}.tmp"
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            fast = os.fstat(src.fileno()).st_size > LARGE_BLOB_SIZE
+            compressor = zlib.compressobj(1 if fast else 9)
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(compressor.compress(chunk))
+            dst.write(compressor.flush())
+        blob = objects_dir / digest.hexdigest()
+        if blob.exists():
+            tmp.unlink()
+        else:
+            os.replace(tmp, blob)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return digest.hexdigest()
+
+
+def encode_blob(content: bytes) -> bytes:
+    """Encode file content as stored in ``objects/<sha256>``."""
+    return zlib.compress(content, 9)
+
+
+def read_blob(project_dir: Path, digest: str) -> Optional[bytes]:
+    """Read pristine file content back from the project's blob store.
+
+    Args:
+        project_dir: Generated project directory
+        digest: Content hash returned by ``store_blob``
+
+    Returns:
+        The content, or None if the blob is missing or corrupted
+    """
+    try:
+        content = zlib.decompress(
+            (Path(project_dir) / MANIFEST_DIR / OBJECTS_DIR / digest).read_bytes()
+        )
+    except (OSError, zlib.error):
+        return None
+    return content if sha256_bytes(content) == digest else None
+
+
+class SourceInfo(NamedTuple):
+    """What a template file renders to, short of rendering its content."""
+
+    path: str
+    source_hash: str
+    variables: List[str]
+    mode: int
+
+
+def analyze_source(
+    renderer: "TemplateRenderer",
+    source: "SourceFile",
+    context: Dict[str, Any],
+    env: Environment,
+) -> Optional[SourceInfo]:
+    """Resolve the output path and dependencies of a template file.
+
+    Args:
+        renderer: Renderer of the template
+        source: Template file from ``TemplateRenderer.walk``
+        context: Full cookiecutter context
+        env: Environment from ``TemplateRenderer.create_environment``
+
+    Returns:
+        Information about the file, or None if its name renders to nothing
+    """
+    path = renderer.output_path(source, context, env)
+    if path is None:
+        return None
+
+    variables = set(find_variables(env, source.copy_root or source.path))
+    if renderer.is_rendered(source, context):
+        raw = renderer.read_source(source)
+        source_hash = sha256_bytes(raw)
+        variables.update(find_variables(env, raw.decode("utf-8")))
+    else:
+        with renderer.stream_source(source) as stream:  # Possibly a large asset
+            source_hash = sha256_stream(stream)
+    if ALL_VARIABLES in variables:
+        variables = {ALL_VARIABLES}
+    mode = renderer.source_mode(source) & 0o777
+    return SourceInfo(path, source_hash, sorted(variables), mode)
+
+
+def write_manifest(
+    project_dir: Path,
+    template: str,
+    template_version: str,
+    renderer: "TemplateRenderer",
+    context: Dict[str, Any],
+    normalize_modes: bool = False,
+) -> ProjectManifest:
+    """Record a freshly generated project in its manifest.
+
+    Must run before any ``post_generate_hook`` so the recorded content is the
+    pristine template output.
+
+    Args:
+        project_dir: Generated project directory
+        template: Name of the template plugin
+        template_version: Version of the template plugin
+        renderer: Renderer of the template
+        context: Full cookiecutter context used for generation
+        normalize_modes: Record the canonical modes of reproducible
+            generations (see ``reproducible.normalized_mode``) instead of the
+            template files' modes
+
+    Returns:
+        The written manifest
+    """
+    manifest = ProjectManifest(template, template_version, stored_context(context))
+    env = renderer.create_environment(context)
+    _, sources = renderer.walk(context)
+    for source in sources:
+        info = analyze_source(renderer, source, context, env)
+        if info is None:
+            continue
+        output = Path(project_dir) / info.path
+        if not output.is_file():
+            continue  # Not generated, e.g. removed by a cookiecutter hook
+        manifest.files[source.path] = ManifestEntry(
+            path=info.path,
+            sha256=store_file_blob(project_dir, output),
+            source_hash=info.source_hash,
+            variables=info.variables,
+            mode=normalized_mode(info.mode) if normalize_modes else info.mode,
+        )
+
+    manifest.save(project_dir)
+    return manifest
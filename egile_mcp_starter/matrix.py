@@ -0,0 +1,394 @@
+"""Validation of every choice combination of a template.
+
+Choice variables (lists in ``cookiecutter.json``) are expanded into
+combinations, either exhaustively, as a random sample or as a pairwise
+covering set. Each combination is rendered in memory on a process pool and
+every rendered Python file is byte-compiled. Combinations that passed are
+remembered per template content, so unchanged templates validate instantly.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .bundles import open_source, read_template_file
+from .cache import get_cache_root
+
+# Ways of choosing the combinations to validate
+MODES = ("full", "sampled", "pairwise")
+
+Choices = Dict[str, List[str]]
+
+
+class Combination(NamedTuple):
+    """A template and one value for each of its choice variables."""
+
+    template: str
+    values: Dict[str, str]
+
+
+@dataclass
+class MatrixResult:
+    """Outcome of validating a single combination."""
+
+    combination: Combination
+    files: int = 0  # Rendered files
+    failures: List[str] = field(default_factory=list)  # "path:line: message"
+    error: Optional[str] = None  # Rendering error
+    duration: float = 0.0  # Seconds to render and compile
+    cached: bool = False  # Passed in a previous run, not rendered again
+
+    @property
+    def ok(self) -> bool:
+        """Whether the combination rendered to valid Python."""
+        return self.error is None and not self.failures
+
+
+def get_choices(template_dir: Path) -> Choices:
+    """Read the choice variables of a template.
+
+    Args:
+        template_dir: Template directory containing ``cookiecutter.json``, or
+            template bundle
+
+    Returns:
+        Choice variables and their values, in ``cookiecutter.json`` order
+    """
+    variables = json.loads(read_template_file(template_dir, "cookiecutter.json"))
+    return {
+        name: [str(value) for value in values]
+        for name, values in variables.items()
+        if isinstance(values, list) and values and not name.startswith("_")
+    }
+
+
+def count_combinations(choices: Choices) -> int:
+    """Size of the full matrix of a template's choices."""
+    total = 1
+    for values in choices.values():
+        total *= len(values)
+    return total
+
+
+def expand_full(choices: Choices) -> List[Dict[str, str]]:
+    """Every combination of choices.
+
+    Args:
+        choices: Choice variables from ``get_choices``
+
+    Returns:
+        All combinations, in lexicographic order of the choice lists
+    """
+    names = list(choices)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(choices[name] for name in names))
+    ]
+
+
+def expand_sampled(choices: Choices, size: int, seed: int = 0) -> List[Dict[str, str]]:
+    """A reproducible random sample of distinct combinations.
+
+    The full matrix is never materialized: sampled indexes are decoded as
+    mixed-radix numbers.
+
+    Args:
+        choices: Choice variables from ``get_choices``
+        size: Number of combinations (capped at the size of the matrix)
+        seed: Random seed
+
+    Returns:
+        Sampled combinations, in matrix order
+    """
+    total = count_combinations(choices)
+    indexes = sorted(random.Random(seed).sample(range(total), min(size, total)))
+    combinations = []
+    for index in indexes:
+        values = {}
+        for name in reversed(list(choices)):
+            index, digit = divmod(index, len(choices[name]))
+            values[name] = choices[name][digit]
+        combinations.append({name: values[name] for name in choices})
+    return combinations
+
+
+def expand_pairwise(choices: Choices) -> List[Dict[str, str]]:
+    """A covering set in which every pair of values of two variables appears.
+
+    Uses a deterministic greedy construction: each new combination starts
+    from an uncovered pair and picks, for every other variable, the value
+    covering the most remaining pairs.
+
+    Args:
+        choices: Choice variables from ``get_choices``
+
+    Returns:
+        Combinations covering every pair of choice values
+    """
+    names = list(choices)
+    if len(names) < 2:
+        return expand_full(choices)
+
+    Pair = Tuple[Tuple[int, str], Tuple[int, str]]
+    uncovered: Set[Pair] = {
+        ((i, a), (j, b))
+        for i, j in itertools.combinations(range(len(names)), 2)
+        for a in choices[names[i]]
+        for b in choices[names[j]]
+    }
+
+    def pairs(row: Dict[int, str]) -> Set[Pair]:
+        items = sorted(row.items())
+        return set(itertools.combinations(items, 2))
+
+    combinations = []
+    while uncovered:
+        (i, a), (j, b) = min(uncovered)
+        row = {i: a, j: b}
+        for k in range(len(names)):
+            if k in row:
+                continue
+            row[k] = max(
+                choices[names[k]],
+                key=lambda value: len(pairs({**row, k: value}) & uncovered),
+            )
+        uncovered -= pairs(row)
+        combinations.append({names[k]: row[k] for k in range(len(names))})
+    return combinations
+
+
+def expand(
+    choices: Choices, mode: str = "full", size: int = 100, seed: int = 0
+) -> List[Dict[str, str]]:
+    """Choose the combinations to validate.
+
+    Args:
+        choices: Choice variables from ``get_choices``
+        mode: One of ``MODES``
+        size: Number of combinations in "sampled" mode
+        seed: Random seed in "sampled" mode
+
+    Returns:
+        Combinations of choice values
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode == "full":
+        return expand_full(choices)
+    if mode == "sampled":
+        return expand_sampled(choices, size, seed)
+    if mode == "pairwise":
+        return expand_pairwise(choices)
+    raise ValueError(f"Unknown mode '{mode}'. Available modes: {', '.join(MODES)}")
+
+
+class MatrixCache:
+    """Combinations of a template that already validated successfully.
+
+    Entries are keyed on the template content, plugin version and Python
+    version, so any change that could alter the outcome starts afresh.
+    """
+
+    def __init__(
+        self, template_dir: Path, version: str, directory: Optional[Path] = None
+    ) -> None:
+        """Open the cache of a template.
+
+        Args:
+            template_dir: Template directory containing ``cookiecutter.json``
+            version: Version of the template plugin
+            directory: Cache directory (default: ``<cache root>/matrix``)
+        """
+        fingerprint = "|".join(
+            [open_source(Path(template_dir)).digest(), version, sys.version]
+        )
+        key = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        self.path = Path(directory or get_cache_root() / "matrix") / f"{key}.json"
+        try:
+            self.passed: Set[str] = set(json.loads(self.path.read_text("utf-8")))
+        except (OSError, ValueError, TypeError):
+            self.passed = set()
+
+    @staticmethod
+    def key(values: Dict[str, str]) -> str:
+        """Cache key of a combination."""
+        return json.dumps(values, sort_keys=True)
+
+    def save(self) -> None:
+        """Write the cache atomically, ignoring I/O errors."""
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(sorted(self.passed)), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def _init_worker() -> None:
+    """Warm up a worker process: load every plugin and its compiled templates."""
+    from .plugins.registry import get_registry
+    from .rendering import get_renderer
+
+    registry = get_registry()
+    for name in registry.get_plugin_names():
+        template_path = registry.get_template_path(name)
+        try:
+            if template_path is not None:
+                get_renderer(template_path)
+        except ValueError:
+            pass  # Reported when one of its combinations is validated
+
+
+def validate_combination(combination: Combination) -> MatrixResult:
+    """Render one combination in memory and byte-compile its Python files.
+
+    The plugin's defaults and ``pre_generate_hook`` are applied as during
+    generation.
+
+    Args:
+        combination: Template and choice values
+
+    Returns:
+        The validation result
+    """
+    from .plugins.registry import get_registry
+    from .rendering import get_renderer
+
+    combination = Combination(*combination)
+    result = MatrixResult(combination)
+    start = time.perf_counter()
+    try:
+        registry = get_registry()
+        plugin = registry.get_plugin(combination.template)
+        if plugin is None:
+            raise ValueError(f"Template '{combination.template}' not found")
+        context = plugin.get_default_context()
+        context.update(combination.values)
+        context = plugin.pre_generate_hook(context)
+        renderer = get_renderer(
+            registry.get_template_path(plugin.name) or plugin.get_template_path()
+        )
+        full_context = renderer.build_context(context)
+        for rendered in renderer.iter_files(full_context):
+            result.files += 1
+            if not rendered.path.endswith(".py"):
+                continue
+            try:
+                compile(rendered.content, rendered.path, "exec", dont_inherit=True)
+            except SyntaxError as e:
+                result.failures.append(f"{rendered.path}:{e.lineno}: {e.msg}")
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def run_matrix(
+    templates: Iterable[str],
+    mode: str = "pairwise",
+    size: int = 100,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> List[MatrixResult]:
+    """Validate the choice combinations of several templates.
+
+    Args:
+        templates: Names of the templates to validate
+        mode: One of ``MODES``
+        size: Number of combinations per template in "sampled" mode
+        seed: Random seed in "sampled" mode
+        max_workers: Number of worker processes (default: CPU count)
+        use_cache: Skip combinations that passed in a previous run
+
+    Returns:
+        One result per combination, in template then matrix order
+
+    Raises:
+        ValueError: If a template or the mode is unknown
+    """
+    from .plugins.registry import get_registry
+
+    registry = get_registry()
+    results: List[Optional[MatrixResult]] = []
+    pending: List[Tuple[int, Combination]] = []
+    caches: Dict[str, MatrixCache] = {}
+    for name in templates:
+        plugin = registry.get_plugin(name)
+        if plugin is None:
+            raise ValueError(f"Template '{name}' not found")
+        template_dir = registry.get_template_path(name) or plugin.get_template_path()
+        if use_cache:
+            caches[name] = MatrixCache(template_dir, plugin.version)
+        for values in expand(get_choices(template_dir), mode, size, seed):
+            combination = Combination(name, values)
+            if name in caches and MatrixCache.key(values) in caches[name].passed:
+                results.append(MatrixResult(combination, cached=True))
+            else:
+                pending.append((len(results), combination))
+                results.append(None)
+
+    validated = _validate_all([c for _, c in pending], max_workers)
+    for (index, _), result in zip(pending, validated):
+        results[index] = result
+        cache = caches.get(result.combination.template)
+        if cache is not None and result.ok:
+            cache.passed.add(MatrixCache.key(result.combination.values))
+    for cache in caches.values():
+        cache.save()
+    return [result for result in results if result is not None]
+
+
+def _validate_all(
+    combinations: List[Combination], max_workers: Optional[int]
+) -> Iterator[MatrixResult]:
+    """Validate combinations on a process pool, yielding results in order."""
+    workers = min(max_workers or os.cpu_count() or 1, len(combinations))
+    if workers <= 1:
+        _init_worker()
+        yield from map(validate_combination, combinations)
+        return
+
+    chunksize = max(1, len(combinations) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+        yield from ex.map(validate_combination, combinations, chunksize=chunksize)
+
+
+def summarize(results: List[MatrixResult]) -> Dict[str, Any]:
+    """Aggregate validation results.
+
+    Args:
+        results: Results from ``run_matrix``
+
+    Returns:
+        Counts of combinations, failures and cache hits, and the mean and
+        maximum render time of the rendered combinations
+    """
+    rendered = [r.duration for r in results if not r.cached]
+    return {
+        "combinations": len(results),
+        "failed": sum(not r.ok for r in results),
+        "cached": sum(r.cached for r in results),
+        "mean_duration": sum(rendered) / len(rendered) if rendered else 0.0,
+        "max_duration": max(rendered, default=0.0),
+    }
@@ -0,0 +1,117 @@
+"""Line-based three-way merge of text files."""
+
+from difflib import SequenceMatcher
+from typing import List, NamedTuple, Sequence, Tuple
+
+CONFLICT_START = b"<<<<<<< local\n"
+CONFLICT_BASE = b"||||||| base\n"
+CONFLICT_SEPARATOR = b"=======\n"
+CONFLICT_END = b">>>>>>> template\n"
+
+
+class MergeResult(NamedTuple):
+    """Outcome of a three-way merge."""
+
+    content: bytes
+    conflicts: int  # Number of conflicting regions marked in ``content``
+
+
+def _sync_regions(
+    base: Sequence[bytes], local: Sequence[bytes], other: Sequence[bytes]
+) -> List[Tuple[int, int, int, int, int, int]]:
+    """Find regions of ``base`` left unchanged on both sides.
+
+    Returns:
+        ``(base_start, base_end, local_start, local_end, other_start,
+        other_end)`` tuples, ending with an empty sentinel region
+    """
+    local_blocks = SequenceMatcher(None, base, local, autojunk=False)
+    other_blocks = SequenceMatcher(None, base, other, autojunk=False)
+    local_matches = local_blocks.get_matching_blocks()
+    other_matches = other_blocks.get_matching_blocks()
+
+    regions = []
+    i = j = 0
+    while i < len(local_matches) and j < len(other_matches):
+        local_base, local_start, local_len = local_matches[i]
+        other_base, other_start, other_len = other_matches[j]
+
+        # Intersect the two matching base ranges
+        start = max(local_base, other_base)
+        end = min(local_base + local_len, other_base + other_len)
+        if start < end:
+            local_offset = local_start + start - local_base
+            other_offset = other_start + start - other_base
+            regions.append(
+                (
+                    start,
+                    end,
+                    local_offset,
+                    local_offset + end - start,
+                    other_offset,
+                    other_offset + end - start,
+                )
+            )
+
+        if local_base + local_len < other_base + other_len:
+            i += 1
+        else:
+            j += 1
+
+    regions.append((len(base), len(base), len(local), len(local)) + (len(other),) * 2)
+    return regions
+
+
+def merge3(base: bytes, local: bytes, other: bytes) -> MergeResult:
+    """Merge two descendants of a common ancestor, line by line.
+
+    Changes made on only one side are applied. Regions changed differently on
+    both sides are kept as conflicts delimited by git-style markers, with the
+    local version first.
+
+    Args:
+        base: Common ancestor (the previously generated file)
+        local: Local version (the file as edited by the user)
+        other: Other version (the file rendered from the new template)
+
+    Returns:
+        Merged content and the number of conflicting regions
+    """
+    base_lines = base.splitlines(keepends=True)
+    local_lines = local.splitlines(keepends=True)
+    other_lines = other.splitlines(keepends=True)
+
+    merged: List[bytes] = []
+    conflicts = 0
+    base_pos = local_pos = other_pos = 0
+    for region in _sync_regions(base_lines, local_lines, other_lines):
+        base_start, base_end, local_start, local_end, other_start, other_end = region
+
+        base_chunk = base_lines[base_pos:base_start]
+        local_chunk = local_lines[local_pos:local_start]
+        other_chunk = other_lines[other_pos:other_start]
+        if local_chunk == other_chunk or other_chunk == base_chunk:
+            merged.extend(local_chunk)
+        elif local_chunk == base_chunk:
+            merged.extend(other_chunk)
+        else:
+            conflicts += 1
+            merged.append(CONFLICT_START)
+            merged.extend(_terminated(local_chunk))
+            merged.append(CONFLICT_BASE)
+            merged.extend(_terminated(base_chunk))
+            merged.append(CONFLICT_SEPARATOR)
+            merged.extend(_terminated(other_chunk))
+            merged.append(CONFLICT_END)
+
+        merged.extend(base_lines[base_start:base_end])
+        base_pos, local_pos, other_pos = base_end, local_end, other_end
+
+    return MergeResult(b"".join(merged), conflicts)
+
+
+def _terminated(lines: List[bytes]) -> List[bytes]:
+    """Make sure a conflict side ends with a newline before the next marker."""
+    if lines and not lines[-1].endswith((b"\n", b"\r")):
+        return lines[:-1] + [lines[-1] + b"\n"]
+    return lines
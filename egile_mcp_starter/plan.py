@@ -0,0 +1,109 @@
+"""Dry-run planning of a generation, without writing anything."""
+
+import difflib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from .rendering import RenderedTree
+
+# Actions a generation would take for each file
+CREATE = "create"  # The file does not exist yet
+CHANGE = "change"  # The file exists with different content
+SKIP = "skip"  # The file exists with identical content
+
+
+@dataclass
+class PlannedFile:
+    """What a generation would do with a single file."""
+
+    path: str  # POSIX path relative to the project directory
+    action: str
+    size: int  # Size of the rendered content in bytes
+    existing_size: Optional[int] = None  # Size on disk, if the file exists
+    diff: Optional[str] = None  # Unified diff against the existing file
+
+
+@dataclass
+class GenerationPlan:
+    """The files a generation would create, change or skip."""
+
+    project_path: Path
+    files: List[PlannedFile] = field(default_factory=list)
+
+    def _with_action(self, action: str) -> List[PlannedFile]:
+        return [planned for planned in self.files if planned.action == action]
+
+    @property
+    def created(self) -> List[PlannedFile]:
+        """Files that would be created."""
+        return self._with_action(CREATE)
+
+    @property
+    def changed(self) -> List[PlannedFile]:
+        """Existing files whose content would change."""
+        return self._with_action(CHANGE)
+
+    @property
+    def skipped(self) -> List[PlannedFile]:
+        """Existing files that are already up to date."""
+        return self._with_action(SKIP)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the rendered files in bytes."""
+        return sum(planned.size for planned in self.files)
+
+
+def _unified_diff(path: str, existing: bytes, rendered: bytes) -> str:
+    """Unified diff between the existing and the rendered content of a file."""
+    if b"\0" in existing or b"\0" in rendered:
+        return f"Binary files a/{path} and b/{path} differ\n"
+    lines = difflib.unified_diff(
+        existing.decode("utf-8", "replace").splitlines(keepends=True),
+        rendered.decode("utf-8", "replace").splitlines(keepends=True),
+        fromfile=f"a/{path}",
+        tofile=f"b/{path}",
+    )
+    return "".join(line if line.endswith("\n") else line + "\n" for line in lines)
+
+
+def build_plan(
+    tree: RenderedTree, output_dir: Path, with_diffs: bool = False
+) -> GenerationPlan:
+    """Compare a rendered tree with what already exists on disk.
+
+    Only files that already exist are read; nothing is ever written.
+
+    Args:
+        tree: Rendered project tree
+        output_dir: Directory in which the project would be created
+        with_diffs: Compute unified diffs for files that would change
+
+    Returns:
+        The generation plan, with files in sorted order
+    """
+    project_path = Path(output_dir) / tree.project_dir
+    plan = GenerationPlan(project_path)
+    for rendered in tree:
+        target = project_path / rendered.path
+        try:
+            existing = target.read_bytes() if target.is_file() else None
+        except OSError:
+            existing = None
+
+        if existing is None:
+            plan.files.append(PlannedFile(rendered.path, CREATE, rendered.size))
+            continue
+
+        planned = PlannedFile(
+            rendered.path,
+            SKIP if existing == rendered.content else CHANGE,
+            rendered.size,
+            existing_size=len(existing),
+        )
+        if with_diffs and planned.action == CHANGE:
+            planned.diff = _unified_diff(rendered.path, existing, rendered.content)
+        plan.files.append(planned)
+
+    return plan
@@ -2,7 +2,10 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from ..features import FeatureManifest
 
 
 class TemplatePlugin(ABC):
@@ -25,7 +28,8 @@ class TemplatePlugin(ABC):
         """Get the path to the cookiecutter template directory.
 
         Returns:
-            Path to the template directory containing cookiecutter.json
+            Path to the template directory containing cookiecutter.json, or
+            to a bundle of it (see ``egile_mcp_starter.bundles``)
         """
         pass
 
@@ -46,6 +50,27 @@ class TemplatePlugin(ABC):
         """
         return []
 
+    def get_feature_manifest(self) -> "FeatureManifest":
+        """Get the rules mapping template files to the features enabling them.
+
+        They are read from the ``features.json`` file of the template
+        directory; files of disabled features are never rendered. Every
+        generation loads the manifest first, so a template whose rules do
+        not match the plugin fails before anything is rendered.
+
+        Returns:
+            The feature manifest, empty if the template has none
+
+        Raises:
+            ValueError: If the manifest is invalid or refers to features
+                missing from ``get_supported_features``
+        """
+        from ..features import FeatureManifest
+
+        manifest = FeatureManifest.load(self.get_template_path())
+        manifest.check(self.get_supported_features())
+        return manifest
+
     def validate_context(self, context: Dict[str, Any]) -> bool:
         """Validate the provided context for this template.
 
@@ -68,6 +93,20 @@ class TemplatePlugin(ABC):
         """
         return context
 
+    def get_dependencies(self, context: Dict[str, Any]) -> List[str]:
+        """Get the runtime dependencies of a project generated from a context.
+
+        Used to lock the dependencies of generated projects. The default
+        returns ``_computed_dependencies`` as set by ``pre_generate_hook``.
+
+        Args:
+            context: Context returned by ``pre_generate_hook``
+
+        Returns:
+            Requirement specifiers
+        """
+        return list(context.get("_computed_dependencies", []))
+
     def post_generate_hook(self, project_path: Path, context: Dict[str, Any]) -> None:
         """Hook called after project generation.
 
@@ -21,10 +21,13 @@ class MCPTemplatePlugin(TemplatePlugin):
         """Get the path to the cookiecutter template directory.
 
         Returns:
-            Path to the template directory containing cookiecutter.json
+            Path to the template directory containing cookiecutter.json, or
+            to its bundle when only the bundle is installed
         """
+        from ...bundles import resolve_template_path
+
         # Point to the existing template directory
-        return Path(__file__).parent.parent.parent / "template"
+        return resolve_template_path(Path(__file__).parent.parent.parent / "template")
 
     def get_default_context(self) -> Dict[str, Any]:
         """Get default context variables for the template.
@@ -96,15 +99,13 @@ class MCPTemplatePlugin(TemplatePlugin):
 
         return context
 
-    def post_generate_hook(self, project_path: Path, context: Dict[str, Any]) -> None:
-        """Hook called after project generation.
+    def get_dependencies(self, context: Dict[str, Any]) -> List[str]:
+        """Get the runtime dependencies of a generated project.
 
         Args:
-            project_path: Path to the generated project
-            context: Template context variables used during generation
+            context: Context returned by ``pre_generate_hook``
+
+        Returns:
+            Requirement specifiers, as listed in the generated pyproject.toml
         """
-        # Could add post-generation steps like:
-        # - Initialize git repository
-        # - Set up virtual environment
-        # - Install pre-commit hooks
-        pass
+        return ["fastmcp>=0.1.0", "pyyaml>=6.0", "pydantic>=2.0.0"]
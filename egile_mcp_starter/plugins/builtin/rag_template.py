@@ -24,9 +24,14 @@ class RAGTemplatePlugin(TemplatePlugin):
         """Get the path to the cookiecutter template directory.
 
         Returns:
-            Path to the template directory containing cookiecutter.json
+            Path to the template directory containing cookiecutter.json, or
+            to its bundle when only the bundle is installed
         """
-        return Path(__file__).parent.parent.parent / "templates" / "rag"
+        from ...bundles import resolve_template_path
+
+        return resolve_template_path(
+            Path(__file__).parent.parent.parent / "templates" / "rag"
+        )
 
     def get_default_context(self) -> Dict[str, Any]:
         """Get default context variables for the template.
@@ -180,16 +185,3 @@ class RAGTemplatePlugin(TemplatePlugin):
             deps.append("sentence-transformers")  # for cross-encoder models
 
         return deps
-
-    def post_generate_hook(self, project_path: Path, context: Dict[str, Any]) -> None:
-        """Hook called after project generation.
-
-        Args:
-            project_path: Path to the generated project
-            context: Template context variables used during generation
-        """
-        # Could add RAG-specific post-generation steps like:
-        # - Download default embedding models
-        # - Initialize vector database
-        # - Create sample documents for testing
-        pass
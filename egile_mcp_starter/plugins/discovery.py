@@ -0,0 +1,134 @@
+"""Cached discovery of external template plugins via entry points."""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+from ..cache import get_cache_root
+from .registry import PluginInfo
+
+ENTRY_POINT_GROUP = "egile_mcp_starter.templates"
+
+_CACHE_VERSION = 1
+_METADATA_SUFFIXES = (".dist-info", ".egg-info", ".egg-link")
+
+
+def get_discovery_cache_path() -> Path:
+    """Get the location of the entry-point discovery cache.
+
+    Each Python environment (``sys.prefix``) has its own cache file, so
+    virtual environments sharing a cache root do not invalidate each other.
+
+    Returns:
+        Path to the cache file (not necessarily existing yet)
+    """
+    prefix = hashlib.sha256(sys.prefix.encode("utf-8")).hexdigest()[:16]
+    return get_cache_root() / "plugins" / f"entry_points-{prefix}.json"
+
+
+def compute_environment_key(paths: Optional[List[str]] = None) -> str:
+    """Fingerprint the installed distributions.
+
+    The key covers the modification time of every directory on the import
+    path and the set of distribution metadata directories it contains, so
+    installing, upgrading or removing a package invalidates the cache.
+
+    Args:
+        paths: Import path entries to inspect (default: ``sys.path``)
+
+    Returns:
+        Hex digest identifying the current set of installed distributions
+    """
+    digest = hashlib.sha256(f"{sys.version}\0{_CACHE_VERSION}\0".encode("utf-8"))
+    for entry in sys.path if paths is None else paths:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+            names = sorted(
+                name
+                for name in os.listdir(entry or ".")
+                if name.endswith(_METADATA_SUFFIXES)
+            )
+        except OSError:
+            continue  # Missing directories and zip files are not scanned
+        digest.update(f"{entry}\0{mtime}\0".encode("utf-8"))
+        digest.update("\0".join(names).encode("utf-8"))
+        digest.update(b"\0\0")
+    return digest.hexdigest()
+
+
+def scan_entry_points() -> List[PluginInfo]:
+    """Load every entry-point plugin once and record its metadata.
+
+    Plugins that fail to load or instantiate are skipped.
+
+    Returns:
+        Metadata of the external plugins
+    """
+    from importlib.metadata import entry_points
+
+    infos = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            plugin_class = entry_point.load()
+            infos.append(PluginInfo.from_plugin(plugin_class()))
+        except Exception:
+            pass  # Skip plugins that fail to load
+    return infos
+
+
+def _write_cache(cache_path: Path, key: str, infos: List[PluginInfo]) -> None:
+    """Atomically write the discovery cache file."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    content = {"key": key, "plugins": [asdict(info) for info in infos]}
+    fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(content, fh, indent=2)
+        os.replace(tmp_name, cache_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _read_cache(cache_path: Path, key: str) -> Optional[List[PluginInfo]]:
+    """Read the discovery cache, or None if it is missing or stale."""
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if data["key"] != key:
+            return None
+        return [PluginInfo(**entry) for entry in data["plugins"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def discover_entry_point_plugins(refresh: bool = False) -> List[PluginInfo]:
+    """Get the metadata of external plugins, using the discovery cache.
+
+    Entry points are only scanned (and plugin modules only imported) when
+    the cache is missing, stale or ``refresh`` is requested. Otherwise the
+    plugins are returned as lazy metadata and imported on first use.
+
+    Args:
+        refresh: Rebuild the cache even if it is up to date
+
+    Returns:
+        Metadata of the external plugins
+    """
+    cache_path = get_discovery_cache_path()
+    key = compute_environment_key()
+    if not refresh:
+        cached = _read_cache(cache_path, key)
+        if cached is not None:
+            return cached
+
+    infos = scan_entry_points()
+    try:
+        _write_cache(cache_path, key, infos)
+    except OSError:
+        pass  # A read-only cache location only costs the scan
+    return infos
@@ -0,0 +1,295 @@
+"""Isolated, time-bounded execution of plugin hooks.
+
+Hooks of third-party plugins run arbitrary code: a slow, hanging or
+memory-hungry hook would stall or take down the generating process. A
+``HookPool`` runs them in reusable worker processes instead, each call bounded
+by a timeout and each worker by an address-space limit. A worker whose hook
+times out, runs out of memory or crashes is killed and replaced, and the
+failure is reported as a ``HookError`` carrying a structured ``HookFailure``.
+
+Workers import and instantiate each plugin class once, on its first hook
+call, and keep the instance for later calls. Hook arguments and results cross
+process boundaries, so they must be picklable, and state a plugin keeps on
+itself between ``pre_generate_hook`` and ``post_generate_hook`` is only
+shared when both calls land on the same worker.
+
+``ProcessPoolExecutor`` is not used because a running task cannot be
+stopped without breaking the whole pool.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+    from .base import TemplatePlugin
+    from .registry import PluginInfo
+
+try:
+    import resource
+
+    HAS_RLIMIT = True
+except ImportError:  # pragma: no cover - Windows
+    HAS_RLIMIT = False
+
+# Seconds a hook may run before its worker is killed
+DEFAULT_TIMEOUT = 60.0
+
+# Hooks that can be run in a pool
+HOOKS = ("pre_generate_hook", "post_generate_hook")
+
+# Seconds given to a worker to exit before it is killed
+_EXIT_GRACE = 1.0
+
+
+@dataclass(frozen=True)
+class HookLimits:
+    """Limits of isolated hook execution."""
+
+    timeout: float = DEFAULT_TIMEOUT  # Seconds per hook call
+    memory_limit: Optional[int] = None  # Bytes of address space per worker
+    workers: int = 1  # Hooks running at the same time
+
+
+@dataclass
+class HookFailure:
+    """Why an isolated hook call failed."""
+
+    plugin: str
+    hook: str
+    reason: str  # "error", "timeout", "memory" or "crash"
+    message: str
+    duration: float  # Seconds
+    traceback: Optional[str] = None  # Worker-side traceback of errors
+
+    def describe(self) -> str:
+        """Summarize the failure in one line."""
+        return f"{self.hook} of plugin '{self.plugin}' failed ({self.reason}): " + (
+            self.message
+        )
+
+
+class HookError(Exception):
+    """An isolated plugin hook failed."""
+
+    def __init__(self, failure: HookFailure) -> None:
+        """Initialize the error.
+
+        Args:
+            failure: What went wrong
+        """
+        super().__init__(failure.describe())
+        self.failure = failure
+
+
+def _limit_memory(memory_limit: Optional[int]) -> None:
+    """Cap the address space of the current process."""
+    if memory_limit and HAS_RLIMIT:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _call_hook(
+    plugins: Dict[Tuple[str, str], "TemplatePlugin"],
+    module: str,
+    class_name: str,
+    hook: str,
+    args: Tuple[Any, ...],
+) -> Any:
+    """Run a hook on the worker's instance of a plugin class."""
+    from .registry import PluginInfo
+
+    plugin = plugins.get((module, class_name))
+    if plugin is None:
+        info = PluginInfo("", "", module=module, class_name=class_name)
+        plugin = plugins[(module, class_name)] = info.load()
+    return getattr(plugin, hook)(*args)
+
+
+def _worker_main(conn: Connection, memory_limit: Optional[int]) -> None:
+    """Serve hook calls until the pool closes the connection."""
+    _limit_memory(memory_limit)
+    plugins: Dict[Tuple[str, str], "TemplatePlugin"] = {}
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send(("ok", _call_hook(plugins, *request), None))
+        except MemoryError:
+            conn.send(("memory", "MemoryError: memory limit exceeded", None))
+            return  # The worker may be left in a broken state
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", traceback.format_exc()))
+
+
+class _Worker:
+    """A worker process and the parent's end of its connection."""
+
+    def __init__(self, memory_limit: Optional[int]) -> None:
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process: "BaseProcess" = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit),
+            name="egile-hook-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self) -> None:
+        """Stop the worker, killing it if it does not exit promptly."""
+        self.conn.close()
+        self.process.join(_EXIT_GRACE)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class HookPool:
+    """Reusable worker processes running plugin hooks under limits.
+
+    The pool is thread-safe: concurrent calls run on different workers, and
+    calls beyond ``limits.workers`` wait for one to become idle. Workers are
+    started on first use.
+    """
+
+    def __init__(self, limits: Optional[HookLimits] = None) -> None:
+        """Initialize the pool.
+
+        Args:
+            limits: Timeout, memory limit and number of workers (default:
+                ``HookLimits()``)
+
+        Raises:
+            ValueError: If the limits are not positive
+        """
+        self.limits = limits or HookLimits()
+        if self.limits.workers < 1 or self.limits.timeout <= 0:
+            raise ValueError("Hook workers and timeout must be positive")
+        # Idle workers, with None standing for a worker not started yet
+        self._idle: "queue.LifoQueue[Optional[_Worker]]" = queue.LifoQueue()
+        for _ in range(self.limits.workers):
+            self._idle.put(None)
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def call(self, info: "PluginInfo", hook: str, *args: Any) -> Any:
+        """Run a hook of a plugin on a worker.
+
+        Args:
+            info: Metadata of the plugin, locating its class
+            hook: One of ``HOOKS``
+            *args: Arguments of the hook
+
+        Returns:
+            What the hook returned
+
+        Raises:
+            ValueError: If the hook cannot be run in a pool, or the pool is
+                closed
+            HookError: If the hook raised, timed out, ran out of memory or
+                crashed its worker
+        """
+        if hook not in HOOKS:
+            raise ValueError(f"Unknown plugin hook '{hook}'")
+        worker = self._acquire()
+        start = time.perf_counter()
+        try:
+            worker.conn.send((info.module, info.class_name, hook, args))
+            if not worker.conn.poll(self.limits.timeout):
+                raise self._fail(
+                    worker,
+                    HookFailure(
+                        info.name,
+                        hook,
+                        "timeout",
+                        f"did not finish within {self.limits.timeout:g}s",
+                        time.perf_counter() - start,
+                    ),
+                )
+            status, value, trace = worker.conn.recv()
+        except (EOFError, OSError):
+            exitcode = self._retire(worker)
+            raise HookError(
+                HookFailure(
+                    info.name,
+                    hook,
+                    "crash",
+                    f"worker exited with code {exitcode}",
+                    time.perf_counter() - start,
+                )
+            ) from None
+        except HookError:
+            raise  # The worker was retired
+        except BaseException:
+            self._release(worker)
+            raise
+
+        duration = time.perf_counter() - start
+        if status == "ok":
+            self._release(worker)
+            return value
+        if status == "memory":
+            raise self._fail(
+                worker, HookFailure(info.name, hook, status, value, duration)
+            )
+        self._release(worker)
+        raise HookError(HookFailure(info.name, hook, status, value, duration, trace))
+
+    def close(self) -> None:
+        """Stop every worker. Calls waiting for a worker fail."""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self) -> "HookPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _acquire(self) -> _Worker:
+        """Take an idle worker, starting it if needed."""
+        worker = self._idle.get()
+        with self._lock:
+            if self._closed:
+                self._idle.put(None)
+                raise ValueError("Hook pool is closed")
+            if worker is not None and not worker.process.is_alive():
+                # Died while idle, e.g. killed from outside the pool
+                self._workers.remove(worker)
+                worker.stop()
+                worker = None
+            if worker is None:
+                worker = _Worker(self.limits.memory_limit)
+                self._workers.append(worker)
+        return worker
+
+    def _release(self, worker: _Worker) -> None:
+        self._idle.put(worker)
+
+    def _retire(self, worker: _Worker) -> Optional[int]:
+        """Stop a worker for good, freeing its slot for a new one."""
+        worker.stop()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        self._idle.put(None)
+        return worker.process.exitcode
+
+    def _fail(self, worker: _Worker, failure: HookFailure) -> HookError:
+        """Retire a worker left unusable by a failure and report it."""
+        self._retire(worker)
+        return HookError(failure)
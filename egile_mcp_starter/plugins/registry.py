@@ -1,18 +1,81 @@
 """Template registry for managing template plugins."""
 
+import importlib
 import importlib.util
+import json
+import os
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from .base import TemplatePlugin
 
+# Precomputed metadata of the built-in plugins, so that listing templates
+# does not require importing every plugin module.
+BUILTIN_INDEX = Path(__file__).parent / "builtin" / "index.json"
+
+# Set to "1" to register entry-point plugins in the global registry
+DISCOVER_ENV = "EGILE_MCP_STARTER_DISCOVER_PLUGINS"
+
+
+@dataclass
+class PluginInfo:
+    """Metadata describing a template plugin without loading it."""
+
+    name: str
+    description: str
+    version: str = "1.0.0"
+    features: List[str] = field(default_factory=list)
+    module: str = ""  # Module defining the plugin class
+    class_name: str = ""  # Name of the plugin class in ``module``
+
+    @classmethod
+    def from_plugin(cls, plugin: TemplatePlugin) -> "PluginInfo":
+        """Build plugin metadata from a loaded plugin instance.
+
+        Args:
+            plugin: Template plugin instance
+
+        Returns:
+            Metadata describing the plugin
+        """
+        plugin_class = type(plugin)
+        return cls(
+            name=plugin.name,
+            description=plugin.description,
+            version=plugin.version,
+            features=plugin.get_supported_features(),
+            module=plugin_class.__module__,
+            class_name=plugin_class.__qualname__,
+        )
+
+    def load(self) -> TemplatePlugin:
+        """Import the plugin module and instantiate the plugin class.
+
+        Returns:
+            Template plugin instance
+        """
+        target: Any = importlib.import_module(self.module)
+        for attr in self.class_name.split("."):
+            target = getattr(target, attr)
+        plugin: TemplatePlugin = target()
+        return plugin
+
 
 class TemplateRegistry:
-    """Registry for managing template plugins."""
+    """Registry for managing template plugins.
+
+    Plugins can be registered as instances or lazily, as ``PluginInfo``
+    metadata. Lazy plugins are only imported when they are actually used,
+    which keeps listing templates cheap.
+    """
 
     def __init__(self) -> None:
         """Initialize the template registry."""
         self._plugins: Dict[str, TemplatePlugin] = {}
+        self._infos: Dict[str, PluginInfo] = {}
+        self._template_paths: Dict[str, Path] = {}
+        self._external: Set[str] = set()  # Plugins discovered via entry points
         self._discover_builtin_templates()
 
     def register(self, plugin: TemplatePlugin) -> None:
@@ -24,37 +87,116 @@ class TemplateRegistry:
         Raises:
             ValueError: If a plugin with the same name is already registered
         """
-        if plugin.name in self._plugins:
+        if plugin.name in self._infos:
             raise ValueError(f"Template plugin '{plugin.name}' is already registered")
 
+        self._infos[plugin.name] = PluginInfo.from_plugin(plugin)
         self._plugins[plugin.name] = plugin
 
+    def register_lazy(self, info: PluginInfo, external: bool = False) -> None:
+        """Register a template plugin to be imported on first use.
+
+        Args:
+            info: Metadata of the plugin, including its module and class
+            external: Whether the plugin is third-party code, whose hooks
+                generators may isolate (see ``plugins.isolation``)
+
+        Raises:
+            ValueError: If a plugin with the same name is already registered
+        """
+        if info.name in self._infos:
+            raise ValueError(f"Template plugin '{info.name}' is already registered")
+
+        self._infos[info.name] = info
+        if external:
+            self._external.add(info.name)
+
     def unregister(self, name: str) -> None:
         """Unregister a template plugin.
 
         Args:
             name: Name of the plugin to unregister
         """
+        self._infos.pop(name, None)
         self._plugins.pop(name, None)
+        self._template_paths.pop(name, None)
+        self._external.discard(name)
 
     def get_plugin(self, name: str) -> Optional[TemplatePlugin]:
-        """Get a template plugin by name.
+        """Get a template plugin by name, importing it if needed.
+
+        Args:
+            name: Name of the template plugin
+
+        Returns:
+            Template plugin or None if not found (or if it fails to load)
+        """
+        if name not in self._plugins:
+            info = self._infos.get(name)
+            if info is None:
+                return None
+            try:
+                self._plugins[name] = info.load()
+            except Exception:
+                # Skip plugins that fail to load, like eager discovery did
+                self.unregister(name)
+                return None
+        return self._plugins[name]
+
+    def get_plugin_info(self, name: str) -> Optional[PluginInfo]:
+        """Get the metadata of a template plugin without loading it.
 
         Args:
             name: Name of the template plugin
 
         Returns:
-            Template plugin or None if not found
+            Plugin metadata or None if not found
         """
-        return self._plugins.get(name)
+        return self._infos.get(name)
+
+    def is_external(self, name: str) -> bool:
+        """Check whether a plugin was discovered as third-party code.
+
+        Args:
+            name: Name of the template plugin
+
+        Returns:
+            True for plugins registered with ``external=True``
+        """
+        return name in self._external
+
+    def get_template_path(self, name: str) -> Optional[Path]:
+        """Get the template path of a plugin, resolving it only once.
+
+        Args:
+            name: Name of the template plugin
+
+        Returns:
+            Template path or None if the plugin is not registered
+        """
+        if name not in self._template_paths:
+            plugin = self.get_plugin(name)
+            if plugin is None:
+                return None
+            self._template_paths[name] = plugin.get_template_path()
+        return self._template_paths[name]
 
     def list_plugins(self) -> List[TemplatePlugin]:
-        """List all registered template plugins.
+        """List all registered template plugins, loading any lazy ones.
 
         Returns:
             List of registered template plugins
         """
-        return list(self._plugins.values())
+        plugins = [self.get_plugin(name) for name in list(self._infos)]
+        return [plugin for plugin in plugins if plugin is not None]
+
+    def list_plugin_info(self) -> List[PluginInfo]:
+        """List the metadata of all registered plugins without loading them.
+
+        Returns:
+            List of plugin metadata
+        """
+        return list(self._infos.values())
 
     def get_plugin_names(self) -> List[str]:
         """Get names of all registered template plugins.
@@ -62,26 +204,25 @@ class TemplateRegistry:
         Returns:
             List of plugin names
         """
-        return list(self._plugins.keys())
+        return list(self._infos.keys())
 
     def _discover_builtin_templates(self) -> None:
-        """Discover and register built-in template plugins."""
-        # Register the default MCP template
-        from .builtin.mcp_template import MCPTemplatePlugin
-
-        self.register(MCPTemplatePlugin())
+        """Discover and register built-in template plugins.
 
-        # Register the RAG template
-        from .builtin.rag_template import RAGTemplatePlugin
-
-        self.register(RAGTemplatePlugin())
+        Plugins listed in the built-in index are registered lazily. Any other
+        ``*_template.py`` file in the ``builtin`` directory is loaded eagerly.
+        """
+        indexed_modules = set()
+        for info in load_builtin_index():
+            self.register_lazy(info)
+            indexed_modules.add(info.module.rsplit(".", 1)[-1])
 
         # Try to discover additional built-in templates
         builtin_dir = Path(__file__).parent / "builtin"
         if builtin_dir.exists():
-            for plugin_file in builtin_dir.glob("*_template.py"):
-                if plugin_file.name in ["mcp_template.py", "rag_template.py"]:
-                    continue  # Already registered above
+            for plugin_file in sorted(builtin_dir.glob("*_template.py")):
+                if plugin_file.stem in indexed_modules:
+                    continue  # Already registered from the index
 
                 try:
                     self._load_builtin_plugin(plugin_file)
@@ -116,36 +257,74 @@ class TemplateRegistry:
                     except Exception:
                         pass  # Skip plugins that fail to instantiate
 
-    def discover_external_plugins(self) -> None:
-        """Discover external template plugins via entry points."""
-        try:
+    def discover_external_plugins(self, refresh: bool = False) -> None:
+        """Discover external template plugins via entry points.
+
+        Entry points are scanned once and their metadata cached on disk until
+        the installed distributions change. Discovered plugins are registered
+        lazily and imported on first use.
+
+        Args:
+            refresh: Rescan entry points even if the discovery cache is fresh
+        """
+        from .discovery import discover_entry_point_plugins
+
+        for info in discover_entry_point_plugins(refresh=refresh):
             try:
-                # Python 3.8+
-                from importlib.metadata import entry_points
-            except ImportError:
-                # Python < 3.8
-                from importlib_metadata import entry_points  # type: ignore
+                self.register_lazy(info, external=True)
+            except ValueError:
+                pass  # Built-in and earlier plugins take precedence
 
-            for entry_point in entry_points(group="egile_mcp_starter.templates"):
-                try:
-                    plugin_class = entry_point.load()
-                    plugin_instance = plugin_class()
-                    self.register(plugin_instance)
-                except Exception:
-                    pass  # Skip plugins that fail to load
-        except ImportError:
-            # pkg_resources not available
-            pass
+
+def load_builtin_index() -> List[PluginInfo]:
+    """Load the precomputed metadata of the built-in plugins.
+
+    Returns:
+        Metadata of the built-in plugins, or an empty list if the index is
+        missing or unreadable
+    """
+    try:
+        data = json.loads(BUILTIN_INDEX.read_text(encoding="utf-8"))
+        return [PluginInfo(**entry) for entry in data["plugins"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
 
 
-# Global registry instance
-_registry = TemplateRegistry()
+def build_builtin_index() -> Dict[str, Any]:
+    """Build the built-in plugin index by importing every built-in plugin.
+
+    Returns:
+        Index content, as stored in ``builtin/index.json``
+    """
+    from .builtin import MCPTemplatePlugin, RAGTemplatePlugin
+
+    plugins = [MCPTemplatePlugin(), RAGTemplatePlugin()]
+    return {"plugins": [asdict(PluginInfo.from_plugin(p)) for p in plugins]}
+
+
+def write_builtin_index() -> None:
+    """Regenerate ``builtin/index.json`` after changing a built-in plugin."""
+    content = json.dumps(build_builtin_index(), indent=2)
+    BUILTIN_INDEX.write_text(content + "\n", encoding="utf-8")
+
+
+# Global registry instance, created on first use
+_registry: Optional[TemplateRegistry] = None
 
 
 def get_registry() -> TemplateRegistry:
     """Get the global template registry instance.
 
+    External plugins, which run third-party code, are only registered when
+    the ``EGILE_MCP_STARTER_DISCOVER_PLUGINS`` environment variable is set to
+    ``1``, or once ``discover_external_plugins`` is called.
+
     Returns:
         Global template registry
     """
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry()
+        if os.environ.get(DISCOVER_ENV) == "1":
+            _registry.discover_external_plugins()
     return _registry
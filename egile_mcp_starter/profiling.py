@@ -0,0 +1,153 @@
+"""Per-phase timing profiles of project generation."""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .events import (
+    CacheHit,
+    FileRendered,
+    GenerationEvent,
+    HookRun,
+    PhaseCompleted,
+    PluginResolved,
+    ProjectGenerated,
+)
+
+# Number of slowest files reported by default
+DEFAULT_TOP_FILES = 10
+
+# Phases in the order they happen, as reported by ``GenerationProfile.phases``
+PHASES = (
+    "engine_import",
+    "registry_lookup",
+    "default_context",
+    "pre_generate_hook",
+    "template_context",
+    "template_compile",
+    "render",
+    "cookiecutter",
+    "write",
+    "manifest",
+    "normalize",
+    "cache_store",
+    "lock",
+    "digest",
+    "publish",
+    "post_generate_hook",
+    "environment",
+)
+
+
+@dataclass
+class FileTiming:
+    """Render timing of a single project file."""
+
+    path: str  # POSIX path relative to the project directory
+    size: int  # Bytes
+    duration: float  # Seconds, compilation included
+    compile_duration: float  # Seconds compiling (or loading) the template
+
+
+@dataclass
+class GenerationProfile:
+    """Where the time of a generation went.
+
+    Per-file times are summed across render workers, so with several workers
+    ``template_compile`` and ``render`` can exceed their wall-clock share.
+    With the cookiecutter engine, rendering and writing are a single
+    ``cookiecutter`` phase and files have no timings.
+    """
+
+    template: str = ""
+    project_path: Optional[Path] = None
+    phases: Dict[str, float] = field(default_factory=dict)  # Seconds per phase
+    files: List[FileTiming] = field(default_factory=list)
+    files_written: int = 0
+    bytes_written: int = 0
+    cached: bool = False  # Materialized from the render cache
+    total: float = 0.0  # Seconds from plugin resolution to the end of hooks
+
+    @classmethod
+    def from_events(cls, events: Iterable[GenerationEvent]) -> "GenerationProfile":
+        """Build a profile from the events of ``generate_iter(phases=True)``.
+
+        Args:
+            events: Generation events, consumed entirely
+
+        Returns:
+            The profile
+        """
+        profile = cls()
+        for event in events:
+            profile.add(event)
+        return profile
+
+    def add(self, event: GenerationEvent) -> None:
+        """Account for a generation event.
+
+        Args:
+            event: Event yielded by ``generate_iter(phases=True)``
+        """
+        if isinstance(event, PluginResolved):
+            self.template = event.template
+        elif isinstance(event, PhaseCompleted):
+            self._add_phase(event.phase, event.duration)
+        elif isinstance(event, HookRun):
+            self._add_phase(f"{event.hook}_hook", event.duration)
+        elif isinstance(event, CacheHit):
+            self.cached = True
+        elif isinstance(event, FileRendered):
+            self.files_written += 1
+            self.bytes_written += event.size
+            if event.duration is not None:
+                compiling = event.compile_duration or 0.0
+                self.files.append(
+                    FileTiming(event.path, event.size, event.duration, compiling)
+                )
+                self._add_phase("template_compile", compiling)
+                self._add_phase("render", event.duration - compiling)
+        elif isinstance(event, ProjectGenerated):
+            self.project_path = event.project_path
+            self.total = event.duration
+
+    def _add_phase(self, phase: str, duration: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    def slowest_files(self, count: int = DEFAULT_TOP_FILES) -> List[FileTiming]:
+        """Get the files that took the longest to render.
+
+        Args:
+            count: Maximum number of files
+
+        Returns:
+            Files sorted by decreasing render time
+        """
+        return sorted(self.files, key=lambda f: (-f.duration, f.path))[:count]
+
+    def to_dict(self, top: int = DEFAULT_TOP_FILES) -> Dict[str, Any]:
+        """Convert the profile to JSON-serializable data.
+
+        Args:
+            top: Number of slowest files to include
+
+        Returns:
+            Phases in execution order, totals and the slowest files
+        """
+        known = [phase for phase in PHASES if phase in self.phases]
+        extra = sorted(set(self.phases) - set(PHASES))
+        return {
+            "template": self.template,
+            "project_path": str(self.project_path) if self.project_path else None,
+            "cached": self.cached,
+            "total": self.total,
+            "phases": {phase: self.phases[phase] for phase in known + extra},
+            "files_written": self.files_written,
+            "bytes_written": self.bytes_written,
+            "slowest_files": [vars(f) for f in self.slowest_files(top)],
+        }
+
+    def to_json(self, top: int = DEFAULT_TOP_FILES) -> str:
+        """Serialize the profile as indented JSON (see ``to_dict``)."""
+        return json.dumps(self.to_dict(top), indent=2)
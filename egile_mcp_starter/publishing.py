@@ -0,0 +1,220 @@
+"""Atomic, lock-protected publication of generated projects.
+
+Generations render into a private staging directory created inside the
+output directory, then publish the finished project with a single rename.
+A project directory therefore either does not exist or is complete: a crash
+or a failed generation never leaves a half-written project behind.
+
+Publishing holds an advisory lock keyed on the target path, so concurrent
+generators targeting the same project cannot both publish: the first one
+wins and the others fail as if the project had existed from the start.
+
+Each staging directory is locked by the process using it. Staging
+directories of crashed processes are unlocked, and are removed by the next
+generation into the same output directory.
+
+Advisory locks use ``flock``; where it is unavailable (Windows), only
+generators within a process are serialized and stale staging directories
+are left alone.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+try:
+    import fcntl
+
+    HAS_FLOCK = True
+except ImportError:  # pragma: no cover - Windows
+    HAS_FLOCK = False
+
+STAGING_PREFIX = ".egile-staging-"
+LOCK_SUFFIX = ".egile-lock"
+
+# In-process locks by target path, for threads of the same process
+_thread_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+_thread_locks_guard = threading.Lock()
+
+
+def _flock(fd: int, blocking: bool = True) -> bool:
+    """Take an exclusive advisory lock on a descriptor.
+
+    Returns:
+        False if the lock is held elsewhere and ``blocking`` is False
+    """
+    if not HAS_FLOCK:  # pragma: no cover - Windows
+        return True
+    flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+    try:
+        fcntl.flock(fd, flags)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _is_current(path: Path, fd: int) -> bool:
+    """Check that a locked descriptor still refers to the file at ``path``.
+
+    Another process may have removed (and someone recreated) the file
+    between our ``open`` and our lock, in which case the lock is worthless.
+    """
+    try:
+        return os.stat(path).st_ino == os.fstat(fd).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _thread_lock(key: str) -> threading.Lock:
+    with _thread_locks_guard:
+        lock = _thread_locks.get(key)
+        if lock is None:
+            lock = _thread_locks[key] = threading.Lock()
+        return lock
+
+
+@contextmanager
+def target_lock(target: Path) -> Iterator[None]:
+    """Hold the advisory lock of a project path.
+
+    The lock file, ``.<name>.egile-lock`` next to the target, exists only
+    while the lock is held.
+
+    Args:
+        target: Project directory about to be published
+    """
+    target = Path(target).absolute()
+    lock_path = target.with_name(f".{target.name}{LOCK_SUFFIX}")
+    with _thread_lock(str(target)):
+        while True:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            _flock(fd)
+            if _is_current(lock_path, fd):
+                break
+            os.close(fd)  # Released and removed meanwhile: try again
+        try:
+            yield
+        finally:
+            try:
+                os.unlink(lock_path)
+            finally:
+                os.close(fd)
+
+
+class StagingDirectory:
+    """A private directory in which a project is rendered before publishing."""
+
+    def __init__(self, output_dir: Path) -> None:
+        """Create the staging directory, removing stale ones first.
+
+        Args:
+            output_dir: Directory in which projects are published (created
+                if needed)
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        clean_stale_staging(self.output_dir)
+        while True:
+            self.path = Path(
+                tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=self.output_dir)
+            )
+            # Until it is locked, a concurrent generation may mistake the new
+            # directory for a stale one and remove it: start over if so
+            try:
+                self._fd: Optional[int] = os.open(self.path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            _flock(self._fd)
+            if _is_current(self.path, self._fd):
+                break
+            os.close(self._fd)
+
+    def check_target(self, name: str) -> None:
+        """Fail before rendering if the project directory already exists.
+
+        ``publish`` checks again under the target lock, for projects created
+        meanwhile.
+
+        Args:
+            name: Name of the project directory
+
+        Raises:
+            FileExistsError: If the project directory already exists
+        """
+        target = self.output_dir / name
+        if os.path.lexists(target):
+            raise FileExistsError(f'Error: "{target}" directory already exists')
+
+    def publish(self, staged_project: Path) -> Path:
+        """Move a project rendered in the staging directory into place.
+
+        Args:
+            staged_project: Project directory inside the staging directory
+
+        Returns:
+            Path to the published project, or ``staged_project`` itself if it
+            is not in the staging directory (an engine wrote it elsewhere)
+
+        Raises:
+            FileExistsError: If the project directory already exists
+        """
+        staged_project = Path(staged_project)
+        if staged_project.parent != self.path:
+            return staged_project
+        target = self.output_dir / staged_project.name
+        with target_lock(target):
+            if os.path.lexists(target):
+                raise FileExistsError(f'Error: "{target}" directory already exists')
+            os.rename(staged_project, target)
+        return target
+
+    def discard(self) -> None:
+        """Remove the staging directory and whatever was not published."""
+        if self._fd is None:
+            return
+        try:
+            shutil.rmtree(self.path, ignore_errors=True)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "StagingDirectory":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.discard()
+
+
+def clean_stale_staging(output_dir: Path) -> List[Path]:
+    """Remove the staging directories left behind by crashed generations.
+
+    A staging directory is stale when no process holds its lock.
+
+    Args:
+        output_dir: Directory in which projects are published
+
+    Returns:
+        The removed staging directories
+    """
+    if not HAS_FLOCK:  # pragma: no cover - Windows
+        return []
+    removed = []
+    for path in Path(output_dir).glob(f"{STAGING_PREFIX}*"):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue  # Removed meanwhile, or not a directory we can lock
+        try:
+            if _flock(fd, blocking=False) and _is_current(path, fd):
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path)
+        finally:
+            os.close(fd)
+    return removed
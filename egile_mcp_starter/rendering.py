@@ -0,0 +1,852 @@
+"""In-memory rendering engine for cookiecutter templates.
+
+The renderer follows the conventions of ``cookiecutter.generate.generate_files``
+(rendered path names, ``_copy_without_render``, binary passthrough, newline
+preservation and file modes) but produces an in-memory tree instead of writing
+every file as it goes. The tree can then be flushed to disk in a single pass
+or handed to callers without touching disk at all.
+
+Templates are read through ``bundles.TemplateSource``, so they can be loose
+directories or single-file bundles.
+"""
+
+import contextvars
+import fnmatch
+import hashlib
+import json
+import os
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from cookiecutter.config import get_user_config  # type: ignore
+from cookiecutter.exceptions import (  # type: ignore
+    ContextDecodingException,
+    EmptyDirNameException,
+    NonTemplatedInputDirException,
+    UndefinedVariableInTemplate,
+)
+from cookiecutter.generate import (  # type: ignore
+    apply_overwrites_to_context,
+    generate_context,
+)
+from cookiecutter.prompt import prompt_for_config  # type: ignore
+from cookiecutter.utils import create_env_with_context  # type: ignore
+from jinja2 import Environment, Template
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+from jinja2.exceptions import UndefinedError
+
+from .bundles import DirectorySource, TemplateSource, detect_newline, open_source
+from .cache import get_cache_root
+from .features import FEATURES_FILE, FeatureManifest, is_disabled
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Upper bound on concurrent file writes, whatever the number of render threads
+MAX_IO_WORKERS = 8
+
+# Template files loaded when a renderer is created: changing them requires a
+# new renderer and context
+CONTEXT_FILES = ("cookiecutter.json", FEATURES_FILE)
+
+
+def ordered_map(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int
+) -> Iterator[R]:
+    """Apply a function on a thread pool, yielding results in input order.
+
+    At most ``2 * max_workers`` items are in flight at any time, so results
+    can be consumed as a stream without buffering the whole input. Closing
+    the iterator early cancels the items that have not started yet. Threads
+    run ``func`` in a copy of the caller's context variables.
+
+    Args:
+        func: Function to apply
+        items: Inputs
+        max_workers: Number of threads (``<= 1`` runs in the calling thread)
+
+    Yields:
+        ``func(item)`` for every item, in order
+    """
+    if max_workers <= 1:
+        yield from map(func, items)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque["Future[R]"] = deque()
+        try:
+            for item in items:
+                context = contextvars.copy_context()
+                pending.append(executor.submit(context.run, func, item))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class SourceFile(NamedTuple):
+    """A template file, relative to the project template directory."""
+
+    path: str
+    # Outermost ``_copy_without_render`` directory containing the file, if any
+    copy_root: Optional[str] = None
+
+
+class VerbatimCopy(NamedTuple):
+    """A template file to copy verbatim, without loading it into memory."""
+
+    source: TemplateSource
+    path: str  # Path within the template source
+    size: int  # Bytes
+
+
+@dataclass
+class RenderedFile:
+    """A single rendered file held in memory."""
+
+    path: str  # POSIX path relative to the project directory
+    content: bytes
+    mode: int = 0o644
+    source: str = ""  # POSIX path of the template file it was rendered from
+    duration: float = field(default=0.0, compare=False)  # Seconds to render
+    # Part of the duration spent compiling (or loading) the template
+    compile_duration: float = field(default=0.0, compare=False)
+    # Set instead of ``content`` for verbatim files rendered lazily
+    copy_of: Optional[VerbatimCopy] = field(default=None, compare=False, repr=False)
+
+    @property
+    def size(self) -> int:
+        """Size of the rendered content in bytes."""
+        return self.copy_of.size if self.copy_of is not None else len(self.content)
+
+
+@dataclass
+class RenderedTree:
+    """An in-memory project tree produced by ``TemplateRenderer``."""
+
+    project_dir: str
+    files: Dict[str, RenderedFile] = field(default_factory=dict)
+    directories: Set[str] = field(default_factory=set)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all rendered files in bytes."""
+        return sum(f.size for f in self.files.values())
+
+    def __iter__(self) -> Iterator[RenderedFile]:
+        return iter(self.files[path] for path in sorted(self.files))
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def write_to(self, output_dir: Path, io_workers: int = 1) -> Path:
+        """Flush the tree to disk in one pass.
+
+        All directories are created first, then every file is written with a
+        single ``write`` call and its mode applied on the open descriptor.
+        Lazily rendered verbatim files are copied from the template with
+        ``fastcopy`` (reflinks or in-kernel copies where available).
+
+        Args:
+            output_dir: Directory in which the project directory is created
+            io_workers: Number of files written concurrently (capped at
+                ``MAX_IO_WORKERS``)
+
+        Returns:
+            Path to the written project directory
+
+        Raises:
+            FileExistsError: If the project directory already exists
+        """
+        project_path = Path(output_dir) / self.project_dir
+        if project_path.exists():
+            raise FileExistsError(f'Error: "{project_path}" directory already exists')
+
+        project_path.mkdir(parents=True)
+        for directory in sorted(self.directories):
+            (project_path / directory).mkdir(parents=True, exist_ok=True)
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+        def write(rendered: RenderedFile) -> None:
+            if rendered.copy_of is not None:
+                rendered.copy_of.source.copy_to(
+                    rendered.copy_of.path, project_path / rendered.path, rendered.mode
+                )
+                return
+            fd = os.open(project_path / rendered.path, flags, rendered.mode)
+            try:
+                os.write(fd, rendered.content)
+                if hasattr(os, "fchmod"):
+                    os.fchmod(fd, rendered.mode)
+            finally:
+                os.close(fd)
+
+        for _ in ordered_map(write, self, min(io_workers, MAX_IO_WORKERS)):
+            pass
+        return project_path
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Persistent Jinja bytecode cache shared by every generator on the host.
+
+    Buckets are keyed on the template path and the environment settings that
+    influence compilation, and are invalidated whenever the hash of the
+    template source changes.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """Initialize the bytecode cache.
+
+        Args:
+            directory: Cache directory (default: ``<cache root>/jinja``)
+        """
+        self.path = Path(directory) if directory else get_cache_root() / "jinja"
+        self.path.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.path), "%s.jinja")
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: Optional[str],
+        source: str,
+    ) -> Bucket:
+        """Return the bucket for a template, loading cached bytecode if any."""
+        fingerprint = "|".join(
+            [
+                name,
+                filename or "",
+                ",".join(sorted(environment.extensions)),
+                repr(environment.keep_trailing_newline),
+                repr(environment.trim_blocks),
+                repr(environment.lstrip_blocks),
+                environment.newline_sequence,
+            ]
+        )
+        key = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        bucket = Bucket(environment, key, self.get_source_checksum(source))
+        self.load_bytecode(bucket)
+        return bucket
+
+
+_bytecode_cache: Optional[TemplateBytecodeCache] = None
+
+
+def get_bytecode_cache() -> Optional[TemplateBytecodeCache]:
+    """Get the process-wide bytecode cache.
+
+    Returns:
+        The bytecode cache, or None if its directory cannot be created
+    """
+    global _bytecode_cache
+    expected = get_cache_root() / "jinja"
+    if _bytecode_cache is None or _bytecode_cache.path != expected:
+        try:
+            _bytecode_cache = TemplateBytecodeCache(expected)
+        except OSError:
+            return None
+    return _bytecode_cache
+
+
+def find_template_root(repo_dir: Path) -> Path:
+    """Find the templated project directory inside a cookiecutter template.
+
+    Args:
+        repo_dir: Template directory containing ``cookiecutter.json``, or
+            template bundle
+
+    Returns:
+        Path to the ``{{cookiecutter.xxx}}`` project directory (inside the
+        bundle for bundles)
+
+    Raises:
+        NonTemplatedInputDirException: If no templated directory exists
+    """
+    directories, _ = open_source(repo_dir).listdir("")
+    for name in directories:
+        if "cookiecutter" in name and "{{" in name:
+            return Path(repo_dir) / name
+    raise NonTemplatedInputDirException
+
+
+# ``(mtime_ns, size)`` of the files a renderer was created from
+_Signature = Tuple[Optional[Tuple[int, int]], ...]
+
+# Renderers by template path, with the signature they were created for
+_renderers: Dict[Path, Tuple[_Signature, "TemplateRenderer"]] = {}
+
+
+def _renderer_signature(template_dir: Path) -> _Signature:
+    """Modification times and sizes of what a renderer loads when created.
+
+    Args:
+        template_dir: Template directory or bundle
+
+    Returns:
+        ``(mtime_ns, size)`` of the template directory and its
+        ``CONTEXT_FILES``, or of the bundle file, with None for missing files
+    """
+    paths = [template_dir]
+    if template_dir.is_dir():
+        paths += [template_dir / name for name in CONTEXT_FILES]
+    signature: List[Optional[Tuple[int, int]]] = []
+    for path in paths:
+        try:
+            info = path.stat()
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((info.st_mtime_ns, info.st_size))
+    return tuple(signature)
+
+
+def get_renderer(template_dir: Path) -> "TemplateRenderer":
+    """Get a renderer for a template directory, reusing it within the process.
+
+    A renderer is replaced once the template's ``CONTEXT_FILES`` (or its
+    bundle) change, so long-running processes pick up edited defaults and
+    feature rules.
+
+    Args:
+        template_dir: Template directory containing ``cookiecutter.json``, or
+            template bundle
+
+    Returns:
+        Shared renderer for the template directory
+    """
+    key = Path(template_dir).resolve()
+    signature = _renderer_signature(key)
+    cached = _renderers.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    renderer = TemplateRenderer(key)
+    _renderers[key] = (signature, renderer)
+    return renderer
+
+
+def _generate_context(
+    source: TemplateSource,
+    default_context: Dict[str, Any],
+    extra_context: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Load ``cookiecutter.json`` like ``cookiecutter.generate_context``.
+
+    Bundled templates have no ``cookiecutter.json`` on disk, so their context
+    is loaded from the bundle and overridden the same way.
+    """
+    if isinstance(source, DirectorySource):
+        context: Dict[str, Any] = generate_context(
+            context_file=str(source.location / "cookiecutter.json"),
+            default_context=default_context,
+            extra_context=extra_context,
+        )
+        return context
+
+    try:
+        obj = json.loads(
+            source.read_bytes("cookiecutter.json").decode("utf-8"),
+            object_pairs_hook=OrderedDict,
+        )
+    except ValueError as e:
+        raise ContextDecodingException(
+            f"JSON decoding error while loading '{source.location}/"
+            f"cookiecutter.json'. Decoding error details: '{e}'"
+        ) from e
+    if default_context:
+        try:
+            apply_overwrites_to_context(obj, default_context)
+        except ValueError:
+            pass  # cookiecutter only warns about invalid user defaults
+    if extra_context:
+        apply_overwrites_to_context(obj, extra_context)
+    return OrderedDict([("cookiecutter", obj)])
+
+
+class TemplateRenderer:
+    """Render a cookiecutter template directory into memory."""
+
+    def __init__(self, template_dir: Path) -> None:
+        """Initialize the renderer.
+
+        Args:
+            template_dir: Template directory containing ``cookiecutter.json``,
+                or template bundle
+
+        Raises:
+            ValueError: If the template relies on cookiecutter hook scripts,
+                which can only run against files on disk, or if its feature
+                manifest is invalid
+        """
+        self.template_dir = Path(template_dir)
+        self.source = open_source(self.template_dir)
+        if self.source.is_dir("hooks"):
+            raise ValueError(
+                f"Template '{self.template_dir}' uses cookiecutter hooks, "
+                "which the in-memory engine does not support"
+            )
+        self.template_root = find_template_root(self.template_dir)
+        self.root_name = self.template_root.name
+        self.features = FeatureManifest.load(self.template_dir)
+        self._environments: Dict[Tuple[str, ...], Environment] = {}
+        # Compiled path templates per environment
+        self._path_templates: (
+            "weakref.WeakKeyDictionary[Environment, Dict[str, Template]]"
+        ) = weakref.WeakKeyDictionary()
+        # Binary detection per template file: (*signature, is_binary)
+        self._binary: Dict[str, Tuple[int, int, bool]] = {}
+
+    def build_context(
+        self,
+        extra_context: Optional[Dict[str, Any]] = None,
+        no_input: bool = True,
+        config_file: Optional[str] = None,
+        output_dir: str = ".",
+    ) -> Dict[str, Any]:
+        """Build the full cookiecutter context, as ``cookiecutter()`` would.
+
+        Args:
+            extra_context: Values overriding the template defaults
+            no_input: Skip interactive prompts
+            config_file: Path to cookiecutter config file
+            output_dir: Output directory recorded in the context
+
+        Returns:
+            Context dictionary with ``cookiecutter`` and ``_cookiecutter`` keys
+        """
+        config_dict = get_user_config(config_file=config_file)
+        context = _generate_context(
+            self.source, config_dict["default_context"], extra_context
+        )
+        context["_cookiecutter"] = {
+            k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")
+        }
+        context["cookiecutter"].update(prompt_for_config(context, no_input))
+
+        context["cookiecutter"]["_template"] = str(self.template_dir)
+        context["cookiecutter"]["_output_dir"] = os.path.abspath(output_dir)
+        context["cookiecutter"]["_repo_dir"] = str(self.template_dir)
+        context["cookiecutter"]["_checkout"] = None
+        return context
+
+    def create_environment(self, context: Dict[str, Any]) -> Environment:
+        """Create the Jinja environment used to render a project.
+
+        Environments are reused for contexts requesting the same extensions,
+        so compiled templates stay warm in memory across renders, and they
+        share the persistent bytecode cache across processes.
+
+        Args:
+            context: Full cookiecutter context
+
+        Returns:
+            Strict Jinja environment with cookiecutter's extensions loaded
+        """
+        extensions = tuple(context["cookiecutter"].get("_extensions", []))
+        env = self._environments.get(extensions)
+        if env is None:
+            env = create_env_with_context(context)
+            env.loader = self.source.loader([self.root_name, "templates"])
+            env.bytecode_cache = get_bytecode_cache()
+            # Keep every compiled template: Jinja's default LRU of 400 entries
+            # would reload large templates from the bytecode cache each render
+            env.cache = {}
+            self._environments[extensions] = env
+        return env
+
+    def precompile(self) -> int:
+        """Compile every renderable template file into the bytecode cache.
+
+        Returns:
+            Number of template files compiled
+        """
+        context = self.build_context()
+        env = self.create_environment(context)
+        _, sources = self.walk(context, prune=False)
+        compiled = 0
+        for source in sources:
+            if not self.is_rendered(source, context):
+                continue
+            env.get_template(source.path)
+            compiled += 1
+        return compiled
+
+    def render_project_dir(self, context: Dict[str, Any], env: Environment) -> str:
+        """Render the name of the project directory.
+
+        Args:
+            context: Full cookiecutter context
+            env: Environment from ``create_environment``
+
+        Returns:
+            Rendered project directory name
+        """
+        name = self.template_root.name
+        try:
+            project_dir = str(env.from_string(name).render(**context))
+        except UndefinedError as err:
+            msg = f"Unable to create project directory '{name}'"
+            raise UndefinedVariableInTemplate(msg, err, context) from err
+        if not project_dir:
+            raise EmptyDirNameException("Error: directory name is empty")
+        return project_dir
+
+    def walk(
+        self, context: Dict[str, Any], prune: bool = True
+    ) -> Tuple[List[str], List[SourceFile]]:
+        """Walk the template the way ``generate_files`` does.
+
+        Directories matching ``_copy_without_render`` are not descended into
+        for rendering: everything below them is copied verbatim. Paths of
+        features disabled by the context are skipped without being listed.
+
+        Args:
+            context: Full cookiecutter context (for ``_copy_without_render``
+                and the feature manifest)
+            prune: Skip the paths of disabled features
+
+        Returns:
+            Unrendered directories and template files, both sorted, as POSIX
+            paths relative to the project template directory
+        """
+        disabled = self.features.disabled_paths(context) if prune else set()
+        directories: List[str] = []
+        sources: List[SourceFile] = []
+        for root, dirs, files in self.source.walk(self.root_name):
+            rel_root = self._relative(root)
+            render_dirs = []
+            for d in dirs:
+                rel_dir = f"{rel_root}/{d}" if rel_root else d
+                if is_disabled(rel_dir, disabled):
+                    continue
+                if not self.is_copy_only(rel_dir, context):
+                    render_dirs.append(d)
+                    directories.append(rel_dir)
+                    continue
+
+                copy_root = rel_dir
+                directories.append(copy_root)
+                for sub_root, sub_dirs, sub_files in self.source.walk(
+                    f"{self.root_name}/{rel_dir}"
+                ):
+                    rel_sub = self._relative(sub_root)
+                    sub_dirs[:] = [
+                        n
+                        for n in sub_dirs
+                        if not is_disabled(f"{rel_sub}/{n}", disabled)
+                    ]
+                    directories.extend(f"{rel_sub}/{n}" for n in sub_dirs)
+                    sources.extend(
+                        SourceFile(f"{rel_sub}/{n}", copy_root)
+                        for n in sub_files
+                        if not is_disabled(f"{rel_sub}/{n}", disabled)
+                    )
+
+            dirs[:] = render_dirs
+            for f in files:
+                rel_file = f"{rel_root}/{f}" if rel_root else f
+                if not is_disabled(rel_file, disabled):
+                    sources.append(SourceFile(rel_file))
+
+        return sorted(directories), sorted(sources)
+
+    def _relative(self, path: str) -> str:
+        """Path relative to the project template directory of a source path."""
+        return path[len(self.root_name) + 1 :]
+
+    def read_source(self, source: SourceFile) -> bytes:
+        """Read the raw content of a template file.
+
+        Args:
+            source: Template file from ``walk``
+
+        Returns:
+            The unrendered file content
+        """
+        return self.source.read_bytes(f"{self.root_name}/{source.path}")
+
+    def stream_source(self, source: SourceFile) -> IO[bytes]:
+        """Open a template file for streaming its raw content.
+
+        Args:
+            source: Template file from ``walk``
+
+        Returns:
+            Binary file object, to be closed by the caller
+        """
+        return self.source.open(f"{self.root_name}/{source.path}")
+
+    def source_mode(self, source: SourceFile) -> int:
+        """Permission bits of a template file, as ``shutil.copymode`` applies them.
+
+        Args:
+            source: Template file from ``walk``
+
+        Returns:
+            The file's permission bits
+        """
+        return self.source.mode(f"{self.root_name}/{source.path}")
+
+    def disabled_outputs(self, context: Dict[str, Any], env: Environment) -> List[str]:
+        """Rendered paths of the files and directories of disabled features.
+
+        Used to prune projects rendered by cookiecutter, which renders every
+        template file regardless of the feature manifest.
+
+        Args:
+            context: Full cookiecutter context
+            env: Environment from ``create_environment``
+
+        Returns:
+            POSIX paths relative to the project directory, sorted
+        """
+        return sorted(
+            self.render_directory(path, context, env)
+            for path in self.features.disabled_paths(context)
+        )
+
+    def is_copy_only(self, path: str, context: Dict[str, Any]) -> bool:
+        """Check whether a template path must be copied without rendering.
+
+        Args:
+            path: Path relative to the project template directory
+            context: Full cookiecutter context
+
+        Returns:
+            True if the path matches a ``_copy_without_render`` pattern
+        """
+        native = os.path.normpath(path)
+        patterns = context["cookiecutter"].get("_copy_without_render", [])
+        return any(fnmatch.fnmatch(native, pattern) for pattern in patterns)
+
+    def render_directory(
+        self, directory: str, context: Dict[str, Any], env: Environment
+    ) -> str:
+        """Render an unrendered directory path from ``walk``.
+
+        Args:
+            directory: POSIX path relative to the project template directory
+            context: Full cookiecutter context
+            env: Environment from ``create_environment``
+
+        Returns:
+            Rendered POSIX path relative to the project directory
+        """
+        parts = directory.split("/")
+        for index in range(1, len(parts) + 1):
+            prefix = "/".join(parts[:index])
+            if self.is_copy_only(prefix, context):
+                rendered = self._render_path(prefix, context, env, "directory")
+                return "/".join([Path(rendered).as_posix()] + parts[index:])
+        return Path(self._render_path(directory, context, env, "directory")).as_posix()
+
+    def render_file(
+        self,
+        source: SourceFile,
+        context: Dict[str, Any],
+        env: Environment,
+        lazy_copies: bool = False,
+    ) -> Optional[RenderedFile]:
+        """Render a single template file.
+
+        Args:
+            source: Template file from ``walk``
+            context: Full cookiecutter context
+            env: Environment from ``create_environment``
+            lazy_copies: Reference verbatim files (copy-only and binary)
+                through ``RenderedFile.copy_of`` instead of reading them
+
+        Returns:
+            The rendered file, or None if its name renders to an empty path
+        """
+        start = time.perf_counter()
+        path = self.output_path(source, context, env)
+        if path is None:
+            return None  # The file name rendered to nothing
+
+        mode = self.source_mode(source)
+        if not self.is_rendered(source, context) and lazy_copies:
+            full_path = f"{self.root_name}/{source.path}"
+            copy = VerbatimCopy(self.source, full_path, self.source.size(full_path))
+            duration = time.perf_counter() - start
+            return RenderedFile(path, b"", mode, source.path, duration, copy_of=copy)
+        if not self.is_rendered(source, context):
+            content = self.read_source(source)
+            duration = time.perf_counter() - start
+            return RenderedFile(path, content, mode, source.path, duration)
+
+        try:
+            compile_start = time.perf_counter()
+            template = env.get_template(source.path)
+            compile_duration = time.perf_counter() - compile_start
+            text = template.render(**context)
+        except UndefinedError as err:
+            msg = f"Unable to create file '{source.path}'"
+            raise UndefinedVariableInTemplate(msg, err, context) from err
+
+        newline = context["cookiecutter"].get("_new_lines") or detect_newline(
+            self.read_source(source)
+        )
+        newline = newline if newline is not None else os.linesep
+        if newline and newline != "\n":
+            text = text.replace("\n", newline)
+        content = text.encode("utf-8")
+        duration = time.perf_counter() - start
+        return RenderedFile(
+            path, content, mode, source.path, duration, compile_duration
+        )
+
+    def output_path(
+        self, source: SourceFile, context: Dict[str, Any], env: Environment
+    ) -> Optional[str]:
+        """Render the path of a template file without rendering its content.
+
+        Args:
+            source: Template file from ``walk``
+            context: Full cookiecutter context
+            env: Environment from ``create_environment``
+
+        Returns:
+            POSIX path relative to the project directory, or None if the file
+            name renders to an empty path
+        """
+        if source.copy_root is not None:
+            root = self._render_path(source.copy_root, context, env, "directory")
+            return Path(root).as_posix() + source.path[len(source.copy_root) :]
+
+        path = self._render_path(source.path, context, env, "file")
+        if not path or path.endswith("/") or not Path(path).name:
+            return None
+        return Path(path).as_posix()
+
+    def is_rendered(self, source: SourceFile, context: Dict[str, Any]) -> bool:
+        """Check whether the content of a template file is rendered by Jinja.
+
+        Args:
+            source: Template file from ``walk``
+            context: Full cookiecutter context
+
+        Returns:
+            False for copy-only and binary files, which are copied verbatim
+        """
+        if source.copy_root is not None or self.is_copy_only(source.path, context):
+            return False
+
+        path = f"{self.root_name}/{source.path}"
+        signature = self.source.signature(path)
+        cached = self._binary.get(source.path)
+        if cached is None or cached[:2] != signature:
+            cached = (*signature, self.source.is_binary(path))
+            self._binary[source.path] = cached
+        return not cached[2]
+
+    def iter_files(
+        self,
+        context: Dict[str, Any],
+        env: Optional[Environment] = None,
+        max_workers: int = 1,
+        lazy_copies: bool = False,
+    ) -> Iterator[RenderedFile]:
+        """Render template files one at a time.
+
+        Files are yielded lazily in a deterministic (sorted) order so callers
+        can stream them without holding the whole project in memory. With
+        several workers, files are rendered concurrently on a thread pool but
+        still yielded in the same order.
+
+        Args:
+            context: Full cookiecutter context
+            env: Environment from ``create_environment`` (created if omitted)
+            max_workers: Number of render threads
+            lazy_copies: Do not read verbatim files (see ``render_file``)
+
+        Yields:
+            Rendered files with paths relative to the project directory
+        """
+        bound_env = env or self.create_environment(context)
+        _, sources = self.walk(context)
+
+        def render(source: SourceFile) -> Optional[RenderedFile]:
+            return self.render_file(source, context, bound_env, lazy_copies)
+
+        for rendered in ordered_map(render, sources, max_workers):
+            if rendered is not None:
+                yield rendered
+
+    def empty_tree(self, context: Dict[str, Any], env: Environment) -> RenderedTree:
+        """Create the project tree with its rendered directories but no files.
+
+        Args:
+            context: Full cookiecutter context
+            env: Environment from ``create_environment``
+
+        Returns:
+            Tree to be filled with the files from ``iter_files``
+        """
+        tree = RenderedTree(project_dir=self.render_project_dir(context, env))
+        directories, _ = self.walk(context)
+        tree.directories.update(
+            self.render_directory(directory, context, env) for directory in directories
+        )
+        return tree
+
+    def render(
+        self,
+        context: Dict[str, Any],
+        env: Optional[Environment] = None,
+        max_workers: int = 1,
+    ) -> RenderedTree:
+        """Render the whole template into memory.
+
+        Args:
+            context: Full cookiecutter context
+            env: Environment from ``create_environment`` (created if omitted)
+            max_workers: Number of render threads
+
+        Returns:
+            The rendered project tree
+        """
+        env = env or self.create_environment(context)
+        tree = self.empty_tree(context, env)
+        for rendered in self.iter_files(context, env, max_workers):
+            tree.files[rendered.path] = rendered
+        return tree
+
+    def _render_path(
+        self, path: str, context: Dict[str, Any], env: Environment, kind: str
+    ) -> str:
+        """Render a templated relative path."""
+        if "{" not in path:
+            return path  # Nothing to render
+
+        templates = self._path_templates.setdefault(env, {})
+        template = templates.get(path)
+        if template is None:
+            template = templates[path] = env.from_string(path)
+        try:
+            return str(template.render(**context))
+        except UndefinedError as err:
+            msg = f"Unable to create {kind} '{path}'"
+            raise UndefinedVariableInTemplate(msg, err, context) from err
@@ -0,0 +1,236 @@
+"""Reproducible, byte-identical project generation.
+
+Rendering the same template with the same context already yields the same
+file contents, in a deterministic order. What still varies between two
+generations is the metadata: modification times, permissions inherited from
+the umask and the installed template files, and dates rendered by
+cookiecutter's ``{% now %}`` tag. Reproducible generations pin all of them
+to a source date epoch, following the ``SOURCE_DATE_EPOCH`` convention of
+reproducible builds:
+
+- every file and directory is stamped with the epoch;
+- directories and executable files get mode 0755, other files 0644;
+- ``{% now %}`` renders the epoch, in UTC for the ``'local'`` time zone.
+
+``tree_digest`` then identifies the project by content, e.g. for a
+content-addressed artifact store.
+"""
+
+import calendar
+import contextvars
+import hashlib
+import os
+import stat
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator, Iterator, NamedTuple, Optional, TypeVar
+
+SOURCE_DATE_EPOCH_ENV = "SOURCE_DATE_EPOCH"
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Epoch being rendered by ``{% now %}`` in the current context, if frozen
+_frozen_epoch: "contextvars.ContextVar[Optional[int]]" = contextvars.ContextVar(
+    "egile_frozen_epoch", default=None
+)
+_install_lock = threading.Lock()
+
+
+class ReproducibleProject(NamedTuple):
+    """A project generated reproducibly."""
+
+    project_path: Path
+    tree_digest: str  # See ``tree_digest``
+
+
+def get_source_date_epoch() -> int:
+    """Get the timestamp that reproducible generations pin dates to.
+
+    Returns:
+        ``SOURCE_DATE_EPOCH`` if set, otherwise the start of the current
+        year in UTC, so that generations are reproducible within a year and
+        rendered copyright years stay correct
+
+    Raises:
+        ValueError: If ``SOURCE_DATE_EPOCH`` is not a non-negative integer
+    """
+    value = os.environ.get(SOURCE_DATE_EPOCH_ENV)
+    if value is None:
+        return calendar.timegm((time.gmtime().tm_year, 1, 1, 0, 0, 0))
+    try:
+        epoch = int(value)
+    except ValueError:
+        epoch = -1
+    if epoch < 0:
+        raise ValueError(
+            f"{SOURCE_DATE_EPOCH_ENV} must be a non-negative integer, got '{value}'"
+        )
+    return epoch
+
+
+def normalized_mode(mode: int) -> int:
+    """Get the canonical permissions of a file.
+
+    Args:
+        mode: Permission bits (or full ``st_mode``) of a file
+
+    Returns:
+        0755 if any execute bit is set, 0644 otherwise
+    """
+    return 0o755 if mode & 0o111 else 0o644
+
+
+def normalize_tree(path: Path, epoch: int) -> None:
+    """Give every file and directory of a tree canonical metadata.
+
+    Entries that already have the expected metadata are left untouched, so
+    normalizing a project materialized from the render cache is cheap.
+
+    Args:
+        path: Project directory, included
+        epoch: Modification time given to every entry
+    """
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files + dirs:
+            _normalize(os.path.join(root, name), epoch)
+    _normalize(str(path), epoch)
+
+
+def _normalize(path: str, epoch: int) -> None:
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode):
+        mode = None
+    elif stat.S_ISDIR(info.st_mode):
+        mode = 0o755
+    else:
+        mode = normalized_mode(info.st_mode)
+    if mode is not None and stat.S_IMODE(info.st_mode) != mode:
+        os.chmod(path, mode)
+    if info.st_mtime_ns == epoch * 10**9:
+        return
+    if mode is not None or os.utime in os.supports_follow_symlinks:
+        os.utime(path, (epoch, epoch), follow_symlinks=False)
+
+
+def tree_digest(path: Path) -> str:
+    """Compute the content digest of a project tree.
+
+    The digest covers the relative path, type and permissions of every entry,
+    the content of files and the target of symbolic links. Timestamps are
+    left out, since reproducible generations pin them all to one epoch.
+
+    Args:
+        path: Project directory
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files + dirs):
+            full = os.path.join(root, name)
+            relative = Path(full).relative_to(path).as_posix()
+            info = os.lstat(full)
+            mode = stat.S_IMODE(info.st_mode)
+            if stat.S_ISLNK(info.st_mode):
+                digest.update(f"L\0{relative}\0{os.readlink(full)}\0".encode())
+            elif stat.S_ISDIR(info.st_mode):
+                digest.update(f"D\0{relative}\0{mode:o}\0".encode())
+            else:
+                digest.update(f"F\0{relative}\0{mode:o}\0{info.st_size}\0".encode())
+                with open(full, "rb") as fh:
+                    for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _FrozenArrow:
+    """Stand-in for the ``arrow`` module used by cookiecutter's ``{% now %}``.
+
+    Delegates to ``arrow``, except that ``now`` returns the frozen epoch of
+    the current context, if any.
+    """
+
+    def __init__(self, arrow: Any) -> None:
+        self._arrow = arrow
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._arrow, name)
+
+    def now(self, tzinfo: Any = None) -> Any:
+        epoch = _frozen_epoch.get()
+        if epoch is None:
+            return self._arrow.now(tzinfo)
+        # The host's time zone would make output vary between machines
+        if tzinfo is None or tzinfo == "local":
+            tzinfo = "utc"
+        return self._arrow.get(epoch).to(tzinfo)
+
+
+def _install_frozen_arrow() -> None:
+    """Route cookiecutter's ``{% now %}`` through ``_FrozenArrow``, once."""
+    from cookiecutter import extensions  # type: ignore
+
+    with _install_lock:
+        arrow = getattr(extensions, "arrow", None)
+        if arrow is not None and not isinstance(arrow, _FrozenArrow):
+            extensions.arrow = _FrozenArrow(arrow)
+
+
+@contextmanager
+def frozen_time(epoch: Optional[int]) -> Iterator[None]:
+    """Render ``{% now %}`` as a fixed timestamp.
+
+    The timestamp only applies to the current thread and to the render
+    threads it starts (see ``rendering.ordered_map``), so concurrent
+    generations are unaffected. Do not hold it across a ``yield``: the
+    consumer would see the frozen clock too (see ``frozen_steps``).
+
+    Args:
+        epoch: Timestamp to render, or None to leave the clock alone
+    """
+    if epoch is None:
+        yield
+        return
+    _install_frozen_arrow()
+    token = _frozen_epoch.set(epoch)
+    try:
+        yield
+    finally:
+        _frozen_epoch.reset(token)
+
+
+def frozen_steps(
+    steps: Generator[T, None, R], epoch: Optional[int]
+) -> Generator[T, None, R]:
+    """Run the steps of a generator with ``{% now %}`` frozen.
+
+    The clock is only frozen while a step runs, not while the consumer
+    handles the values it yields, nor while other generators interleaved on
+    the same thread run.
+
+    Args:
+        steps: Generator to run
+        epoch: Timestamp to render, or None to leave the clock alone
+
+    Yields:
+        What ``steps`` yields
+
+    Returns:
+        What ``steps`` returns
+    """
+    try:
+        while True:
+            with frozen_time(epoch):
+                try:
+                    value = next(steps)
+                except StopIteration as stop:
+                    result: R = stop.value
+                    return result
+            yield value
+    finally:
+        steps.close()
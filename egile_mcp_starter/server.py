@@ -0,0 +1,297 @@
+"""Long-running generation service exposed as an MCP server.
+
+A resident process keeps the template registry, plugin instances and
+compiled templates warm, so each request only pays for rendering. The MCP
+transport is provided by the optional ``fastmcp`` dependency
+(``pip install egile-mcp-starter[serve]``); ``GenerationService`` itself has
+no extra dependency.
+
+Cookiecutter renders context values as Jinja templates, outside any sandbox,
+so a client able to pass ``{{ ... }}`` could run code on the host. Request
+contexts are therefore limited to plain scalar values without Jinja syntax.
+"""
+
+import asyncio
+import base64
+import os
+from dataclasses import asdict
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .aio import DEFAULT_MAX_CONCURRENCY, run_in_slot, set_max_concurrency
+from .generator import MCPProjectGenerator
+from .plugins.registry import get_registry
+
+# Markers of Jinja expressions, statements and comments
+_JINJA_MARKERS = ("{{", "{%", "{#")
+
+
+def check_context(context: Optional[Dict[str, Any]]) -> None:
+    """Check that a client-supplied context cannot inject template code.
+
+    Args:
+        context: Context values sent with a request
+
+    Raises:
+        ValueError: If a value is not a string, number, boolean or None, or
+            contains Jinja syntax
+    """
+    for key, value in (context or {}).items():
+        if not isinstance(key, str) or not (
+            value is None or isinstance(value, (str, int, float, bool))
+        ):
+            raise ValueError(f"Context value '{key}' must be a plain scalar")
+        if isinstance(value, str) and any(m in value for m in _JINJA_MARKERS):
+            raise ValueError(f"Context value '{key}' must not contain Jinja syntax")
+
+
+class GenerationService:
+    """Thread-safe generation entry points sharing the warm global registry."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        render_workers: int = 1,
+        root: Optional[str] = None,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            max_concurrency: Maximum number of generations running at once in
+                the process, shared with ``agenerate`` (see
+                ``aio.set_max_concurrency``); further requests wait for a slot
+            render_workers: Render threads used by each generation
+            root: Directory of the host that clients may plan generations in,
+                and whose files plans may read (default: the current working
+                directory)
+
+        Raises:
+            ValueError: If ``max_concurrency`` is not positive
+        """
+        set_max_concurrency(max_concurrency)
+        self.root = Path(root or os.getcwd()).resolve()
+        self.registry = get_registry()
+        self.render_workers = max(1, render_workers)
+
+    def warm_up(self) -> Dict[str, int]:
+        """Load every plugin and compile its templates ahead of requests.
+
+        Templates the in-memory renderer cannot handle are loaded but not
+        compiled.
+
+        Returns:
+            Number of compiled template files per template name
+        """
+        from .rendering import get_renderer
+
+        compiled = {}
+        for name in self.registry.get_plugin_names():
+            plugin = self.registry.get_plugin(name)
+            if plugin is None:
+                continue
+            template_path = (
+                self.registry.get_template_path(name) or plugin.get_template_path()
+            )
+            try:
+                compiled[name] = get_renderer(template_path).precompile()
+            except ValueError:
+                compiled[name] = 0
+        return compiled
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """Describe the available templates.
+
+        Returns:
+            Name, description, version and supported features of each template
+        """
+        templates = []
+        for info in self.registry.list_plugin_info():
+            plugin = self.registry.get_plugin(info.name)
+            templates.append(
+                {
+                    "name": info.name,
+                    "description": info.description,
+                    "version": info.version,
+                    "features": plugin.get_supported_features() if plugin else [],
+                }
+            )
+        return templates
+
+    def generate_project(
+        self,
+        template: str = "mcp",
+        context: Optional[Dict[str, Any]] = None,
+        archive_format: str = "zip",
+    ) -> Dict[str, Any]:
+        """Generate a project into an archive.
+
+        Args:
+            template: Name of the template to use
+            context: Context values overriding the template defaults
+            archive_format: "zip" or "tar.gz"
+
+        Returns:
+            The project directory name, archive format and size, and the
+            archive content encoded as base64
+
+        Raises:
+            ValueError: If the template or archive format is unknown, or the
+                context is not plain values (see ``check_context``)
+            Exception: If project generation fails
+        """
+        buffer = BytesIO()
+        generator = self._generator(template, context, ".")
+        project = run_in_slot(lambda: generator.write_archive(buffer, archive_format))
+
+        content = buffer.getvalue()
+        return {
+            "project": project,
+            "format": archive_format,
+            "size": len(content),
+            "archive": base64.b64encode(content).decode("ascii"),
+        }
+
+    def plan_project(
+        self,
+        template: str = "mcp",
+        context: Optional[Dict[str, Any]] = None,
+        output_dir: str = ".",
+        diff: bool = False,
+    ) -> Dict[str, Any]:
+        """Plan a generation against a directory of the server host.
+
+        Args:
+            template: Name of the template to use
+            context: Context values overriding the template defaults
+            output_dir: Directory in which the project would be generated,
+                relative to the service's root directory
+            diff: Include unified diffs of files that would change
+
+        Returns:
+            The project path and, for each file, its action, sizes and diff
+
+        Raises:
+            ValueError: If the template is unknown, if the context is not
+                plain values (see ``check_context``), or if the output
+                directory or a project file is outside the root directory
+            Exception: If rendering fails
+        """
+        from .plan import build_plan
+
+        destination = self._confine(self.root / output_dir)
+        generator = self._generator(template, context, str(destination))
+        tree = run_in_slot(generator.render)
+        # The context controls rendered paths: never read files outside the root
+        for path in [tree.project_dir, *(f"{tree.project_dir}/{f.path}" for f in tree)]:
+            self._confine(destination / path)
+        plan = build_plan(tree, destination, with_diffs=diff)
+        return {
+            "project_path": str(plan.project_path),
+            "files": [asdict(planned) for planned in plan.files],
+            "created": len(plan.created),
+            "changed": len(plan.changed),
+            "skipped": len(plan.skipped),
+            "total_bytes": plan.total_bytes,
+        }
+
+    def _confine(self, path: Path) -> Path:
+        """Resolve a path, checking that it is inside the root directory.
+
+        Args:
+            path: Path to check, symbolic links included
+
+        Returns:
+            The resolved path
+
+        Raises:
+            ValueError: If the path is outside the root directory
+        """
+        resolved = path.resolve()
+        if resolved != self.root and self.root not in resolved.parents:
+            raise ValueError(f"'{path}' is outside the server root '{self.root}'")
+        return resolved
+
+    def _generator(
+        self, template: str, context: Optional[Dict[str, Any]], output_dir: str
+    ) -> MCPProjectGenerator:
+        """Create a non-interactive in-memory generator for a request."""
+        check_context(context)
+        return MCPProjectGenerator(
+            output_dir=output_dir,
+            no_input=True,
+            template=template,
+            extra_context=context,
+            engine="memory",
+            render_workers=self.render_workers,
+        )
+
+
+def create_server(service: Optional[GenerationService] = None) -> Any:
+    """Create an MCP server exposing a generation service as tools.
+
+    Tools run on worker threads, so concurrent requests are served in
+    parallel up to the service's concurrency limit.
+
+    Args:
+        service: Generation service (default: one on the global registry)
+
+    Returns:
+        A ``fastmcp.FastMCP`` server
+
+    Raises:
+        ImportError: If fastmcp is not installed
+    """
+    try:
+        from fastmcp import FastMCP  # type: ignore
+    except ImportError:
+        raise ImportError(
+            "fastmcp is not installed. Please install it with: "
+            "pip install egile-mcp-starter[serve]"
+        ) from None
+
+    service = service or GenerationService()
+    server = FastMCP("egile-mcp-starter")
+
+    async def list_templates() -> List[Dict[str, Any]]:
+        """List the templates available for project generation."""
+        return service.list_templates()
+
+    async def generate_project(
+        template: str = "mcp",
+        context: Optional[Dict[str, Any]] = None,
+        archive_format: str = "zip",
+    ) -> Dict[str, Any]:
+        """Generate an MCP server project and return it as a base64 archive.
+
+        Args:
+            template: Name of the template to use
+            context: Template variables, e.g. {"project_name": "My Server"}
+            archive_format: "zip" or "tar.gz"
+        """
+        return await asyncio.to_thread(
+            service.generate_project, template, context, archive_format
+        )
+
+    async def plan_project(
+        template: str = "mcp",
+        context: Optional[Dict[str, Any]] = None,
+        output_dir: str = ".",
+        diff: bool = False,
+    ) -> Dict[str, Any]:
+        """Show which files a generation would create, change or skip.
+
+        Args:
+            template: Name of the template to use
+            context: Template variables, e.g. {"project_name": "My Server"}
+            output_dir: Directory to compare against, relative to the
+                server's root directory
+            diff: Include unified diffs of files that would change
+        """
+        return await asyncio.to_thread(
+            service.plan_project, template, context, output_dir, diff
+        )
+
+    for tool in (list_templates, generate_project, plan_project):
+        server.tool()(tool)
+    return server
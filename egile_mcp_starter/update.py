@@ -0,0 +1,232 @@
+"""Incremental regeneration of projects from their manifest."""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .manifest import (
+    ALL_VARIABLES,
+    ManifestEntry,
+    ProjectManifest,
+    SourceInfo,
+    analyze_source,
+    read_blob,
+    store_blob,
+    stored_context,
+    write_atomic,
+)
+from .merge import merge3
+from .plugins.registry import TemplateRegistry, get_registry
+
+# Statuses reported for files touched by an update
+ADDED = "added"  # New template file written
+UPDATED = "updated"  # Unmodified file replaced by the new rendering
+MERGED = "merged"  # Local edits and template changes merged cleanly
+CONFLICT = "conflict"  # Written with conflict markers, or left untouched
+KEPT = "kept"  # Local edits kept, the template change was not applicable
+REMOVED = "removed"  # Unmodified file no longer produced by the template
+
+
+@dataclass
+class UpdateResult:
+    """Outcome of updating a generated project."""
+
+    project_path: Path
+    changes: Dict[str, str] = field(default_factory=dict)  # Path -> status
+    rendered: int = 0  # Template files re-rendered
+    skipped: int = 0  # Template files left alone (source and inputs unchanged)
+
+    @property
+    def conflicts(self) -> List[str]:
+        """Paths that need manual conflict resolution."""
+        return sorted(p for p, status in self.changes.items() if status == CONFLICT)
+
+
+def _is_stale(
+    entry: ManifestEntry,
+    info: SourceInfo,
+    old_context: Dict[str, Any],
+    new_context: Dict[str, Any],
+) -> bool:
+    """Whether a previously generated template file must be re-rendered."""
+    if entry.source_hash != info.source_hash or entry.path != info.path:
+        return True
+    if ALL_VARIABLES in info.variables:
+        return old_context != new_context
+    return any(old_context.get(v) != new_context.get(v) for v in info.variables)
+
+
+def _read(path: Path) -> Optional[bytes]:
+    """Read a project file, or None if it does not exist."""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def prune_empty_dirs(project_path: Path, relative: str) -> None:
+    """Remove the directories of a deleted project file that became empty.
+
+    Args:
+        project_path: Project directory, never removed
+        relative: POSIX path of the deleted file, relative to the project
+    """
+    parent = (project_path / relative).parent
+    while parent != project_path and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def _move(project_path: Path, old: str, new: str) -> None:
+    """Move a project file whose rendered path changed."""
+    source, destination = project_path / old, project_path / new
+    if source.exists() and not destination.exists():
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, destination)
+        prune_empty_dirs(project_path, old)
+
+
+def update_project(
+    project_dir: Path,
+    extra_context: Optional[Dict[str, Any]] = None,
+    config_file: Optional[str] = None,
+    registry: Optional[TemplateRegistry] = None,
+) -> UpdateResult:
+    """Bring a generated project up to date with its template.
+
+    Only template files whose source, rendered path or referenced context
+    variables changed since the last generation are re-rendered. Each of
+    them is three-way merged with the user's version, using the pristine
+    rendering stored in the project manifest as the common ancestor.
+
+    Args:
+        project_dir: Project directory containing a generation manifest
+        extra_context: Context values to change during the update
+        config_file: Path to cookiecutter config file
+        registry: Template registry (default: the global registry)
+
+    Returns:
+        The files changed by the update
+
+    Raises:
+        ValueError: If the project has no manifest or its template is unknown
+    """
+    from .rendering import get_renderer
+
+    project_path = Path(project_dir).resolve()
+    manifest = ProjectManifest.load(project_path)
+    registry = registry or get_registry()
+    plugin = registry.get_plugin(manifest.template)
+    if plugin is None:
+        raise ValueError(f"Template '{manifest.template}' not found")
+
+    overrides = {k: v for k, v in manifest.context.items() if not k.startswith("_")}
+    overrides.update(extra_context or {})
+    template_dir = registry.get_template_path(plugin.name) or plugin.get_template_path()
+    renderer = get_renderer(template_dir)
+    context = renderer.build_context(
+        plugin.pre_generate_hook(overrides),
+        config_file=config_file,
+        output_dir=str(project_path.parent),
+    )
+    env = renderer.create_environment(context)
+    old_context, new_context = manifest.context, stored_context(context)
+
+    result = UpdateResult(project_path)
+    updated = ProjectManifest(plugin.name, plugin.version, new_context)
+    _, sources = renderer.walk(context)
+    for source in sources:
+        info = analyze_source(renderer, source, context, env)
+        if info is None:
+            continue
+        entry = manifest.files.get(source.path)
+        if entry is not None and not _is_stale(entry, info, old_context, new_context):
+            updated.files[source.path] = entry
+            result.skipped += 1
+            continue
+
+        if entry is not None and entry.path != info.path:
+            _move(project_path, entry.path, info.path)  # Renamed by the context
+
+        rendered = renderer.render_file(source, context, env)
+        assert rendered is not None
+        result.rendered += 1
+        base = read_blob(project_path, entry.sha256) if entry else None
+        current = _read(project_path / info.path)
+        status = _apply(
+            project_path / info.path, base, current, rendered.content, info.mode
+        )
+        if status:
+            result.changes[info.path] = status
+
+        updated.files[source.path] = ManifestEntry(
+            path=info.path,
+            sha256=store_blob(project_path, rendered.content),
+            source_hash=info.source_hash,
+            variables=info.variables,
+            mode=info.mode,
+        )
+
+    _remove_orphans(project_path, manifest, updated, result)
+    updated.save(project_path)
+    return result
+
+
+def _remove_orphans(
+    project_path: Path,
+    manifest: ProjectManifest,
+    updated: ProjectManifest,
+    result: UpdateResult,
+) -> None:
+    """Remove unmodified files that the new template no longer produces."""
+    produced = {entry.path for entry in updated.files.values()}
+    for source_path, entry in manifest.files.items():
+        if source_path in updated.files or entry.path in produced:
+            continue
+        current = _read(project_path / entry.path)
+        if current is None:
+            continue
+        if current == read_blob(project_path, entry.sha256):
+            (project_path / entry.path).unlink()
+            prune_empty_dirs(project_path, entry.path)
+            result.changes[entry.path] = REMOVED
+        else:
+            result.changes[entry.path] = KEPT
+
+
+def _apply(
+    path: Path,
+    base: Optional[bytes],
+    current: Optional[bytes],
+    new: bytes,
+    mode: int,
+) -> Optional[str]:
+    """Apply a new rendering of a file on top of the user's version.
+
+    Args:
+        path: Destination of the new rendering
+        base: Previous pristine rendering, or None for a new template file
+        current: The user's version, or None if it does not exist
+        new: New rendering
+        mode: Permission bits of the template file
+
+    Returns:
+        Status of the file, or None if nothing changed
+    """
+    if current is None:
+        if base is None:
+            write_atomic(path, new, mode)
+            return ADDED
+        return None if base == new else KEPT  # Deleted locally: keep it deleted
+    if current == new or base == new:
+        return None  # Up to date, or only edited locally
+    if current == base:
+        write_atomic(path, new, mode)
+        return UPDATED
+
+    if b"\0" in current or b"\0" in new:
+        return CONFLICT  # Binary files cannot be merged: keep the local file
+    merged = merge3(base or b"", current, new)
+    write_atomic(path, merged.content, mode)
+    return CONFLICT if merged.conflicts else MERGED
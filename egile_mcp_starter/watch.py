@@ -0,0 +1,321 @@
+"""Watch a template directory and keep a rendered project up to date.
+
+``TemplateWatcher`` renders a template once, then polls the template directory
+and re-renders only the output files affected by each change. It keeps a
+dependency map from every template file to the output it renders and the
+context variables it reads (as recorded in project manifests), so:
+
+- an edited template file re-renders its own output only;
+- an edited ``cookiecutter.json`` re-renders the outputs reading a variable
+  whose value changed;
+- any edit also re-renders the outputs whose dependencies cannot be known
+  statically, such as templates including, importing or extending others;
+- added and removed template files add and remove their outputs.
+
+The project is a preview for template authors: it is not recorded in a
+manifest and the plugin's ``post_generate_hook`` is not run.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .bundles import is_bundle
+from .manifest import (
+    ALL_VARIABLES,
+    SourceInfo,
+    analyze_source,
+    stored_context,
+    write_atomic,
+)
+from .plugins.registry import TemplateRegistry, get_registry
+from .rendering import (
+    CONTEXT_FILES,
+    RenderedFile,
+    SourceFile,
+    TemplateRenderer,
+    ordered_map,
+)
+from .update import prune_empty_dirs
+
+# Seconds between two scans of the template directory
+DEFAULT_INTERVAL = 0.2
+
+
+@dataclass
+class WatchResult:
+    """Outcome of re-rendering a project after template changes."""
+
+    project_path: Optional[Path] = None
+    changed: List[str] = field(default_factory=list)  # Template paths
+    rendered: int = 0  # Template files re-rendered
+    written: List[str] = field(default_factory=list)  # Output paths rewritten
+    removed: List[str] = field(default_factory=list)  # Output paths deleted
+    duration: float = 0.0  # Seconds
+    error: Optional[str] = None  # Why the change could not be rendered
+
+
+def _affected(variables: List[str], changed_keys: Set[str]) -> bool:
+    """Whether a file reading some variables depends on changed ones."""
+    if ALL_VARIABLES in variables:
+        return bool(changed_keys)
+    return not changed_keys.isdisjoint(variables)
+
+
+class TemplateWatcher:
+    """Keep a project rendered from a template directory up to date."""
+
+    def __init__(
+        self,
+        template: str = "mcp",
+        output_dir: str = ".",
+        extra_context: Optional[Dict[str, Any]] = None,
+        config_file: Optional[str] = None,
+        registry: Optional[TemplateRegistry] = None,
+        render_workers: int = 1,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            template: Name of the template plugin
+            output_dir: Directory in which the project directory is rendered
+            extra_context: Context values overriding the plugin defaults
+            config_file: Path to cookiecutter config file
+            registry: Template registry (default: the global registry)
+            render_workers: Number of threads re-rendering files
+
+        Raises:
+            ValueError: If the template is unknown or is a bundle
+        """
+        registry = registry or get_registry()
+        plugin = registry.get_plugin(template)
+        if plugin is None:
+            available = ", ".join(registry.get_plugin_names())
+            raise ValueError(
+                f"Template '{template}' not found. Available templates: {available}"
+            )
+        template_dir = registry.get_template_path(template) or (
+            plugin.get_template_path()
+        )
+        if is_bundle(template_dir):
+            raise ValueError(
+                f"Template '{template}' is a bundle ({template_dir}); "
+                "only template directories can be watched"
+            )
+
+        self.plugin = plugin
+        self.template_dir = Path(template_dir).resolve()
+        self.output_dir = Path(output_dir).resolve()
+        self.extra_context = dict(extra_context or {})
+        self.config_file = config_file
+        self.render_workers = max(1, render_workers)
+        self.project_path: Optional[Path] = None
+
+        self._renderer: Optional[TemplateRenderer] = None
+        self._context: Optional[Dict[str, Any]] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        # Dependency map: output path and variables of every template file
+        self._sources: Dict[str, SourceInfo] = {}
+        self._written: Dict[str, str] = {}  # Output path -> SHA-256 of content
+        self._pending: Set[str] = set()  # Changes that failed to render
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """Take a snapshot of the template directory.
+
+        Returns:
+            Modification time and size of every file, by POSIX path relative
+            to the template directory
+        """
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for root, dirs, files in os.walk(self.template_dir):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            rel_root = Path(root).relative_to(self.template_dir).as_posix()
+            for name in files:
+                try:
+                    info = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue  # Deleted while scanning
+                path = name if rel_root == "." else f"{rel_root}/{name}"
+                snapshot[path] = (info.st_mtime_ns, info.st_size)
+        return snapshot
+
+    def start(self) -> WatchResult:
+        """Render the whole project.
+
+        Returns:
+            Every output file, as written
+        """
+        self._snapshot = self.scan()
+        return self.refresh([])
+
+    def poll(self) -> Optional[WatchResult]:
+        """Re-render the project if the template changed since the last scan.
+
+        Returns:
+            The re-rendered files, or None if nothing changed
+        """
+        snapshot = self.scan()
+        changed = {
+            path
+            for path in set(snapshot) | set(self._snapshot)
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        if not changed:
+            return None
+        return self.refresh(changed)
+
+    def run(
+        self,
+        on_change: Callable[[WatchResult], None],
+        interval: float = DEFAULT_INTERVAL,
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """Watch the template until stopped.
+
+        Renders the whole project first if ``start`` was not called.
+
+        Args:
+            on_change: Called with the result of every re-render
+            interval: Seconds between two scans
+            stop: Event ending the watch when set (default: run forever)
+        """
+        stop = stop or threading.Event()
+        if self._context is None:
+            on_change(self.start())
+        while not stop.wait(interval):
+            result = self.poll()
+            if result is not None:
+                on_change(result)
+
+    def refresh(self, changed: Iterable[str]) -> WatchResult:
+        """Re-render the outputs affected by changed template files.
+
+        Rendering errors (e.g. a template being edited) are reported in the
+        result rather than raised; the failed changes are retried on the next
+        refresh.
+
+        Args:
+            changed: POSIX paths relative to the template directory
+
+        Returns:
+            The re-rendered files
+        """
+        start = time.perf_counter()
+        changes = set(changed) | self._pending
+        result = WatchResult(changed=sorted(changes))
+        try:
+            self._refresh(changes, result)
+        except Exception as e:
+            self._pending = changes
+            result.error = str(e)
+        else:
+            self._pending = set()
+        result.project_path = self.project_path
+        result.duration = time.perf_counter() - start
+        return result
+
+    def _load(self, changes: Set[str]) -> Tuple[TemplateRenderer, Dict[str, Any]]:
+        """Get the renderer and context, reloading them if their inputs changed."""
+        if (
+            self._renderer is None
+            or self._context is None
+            or (changes.intersection(CONTEXT_FILES))
+        ):
+            renderer = TemplateRenderer(self.template_dir)
+            defaults = self.plugin.get_default_context()
+            defaults.update(self.extra_context)
+            context = renderer.build_context(
+                self.plugin.pre_generate_hook(defaults),
+                config_file=self.config_file,
+                output_dir=str(self.output_dir),
+            )
+            return renderer, context
+        return self._renderer, self._context
+
+    def _refresh(self, changes: Set[str], result: WatchResult) -> None:
+        renderer, context = self._load(changes)
+        env = renderer.create_environment(context)
+        project_path = self.output_dir / renderer.render_project_dir(context, env)
+        if project_path != self.project_path:
+            self._sources, self._written = {}, {}  # Render everything anew
+
+        new_context = stored_context(context)
+        old_context = stored_context(self._context) if self._context else {}
+        changed_keys = {
+            key
+            for key in set(old_context) | set(new_context)
+            if old_context.get(key) != new_context.get(key)
+        }
+        prefix = f"{renderer.root_name}/"
+        # Any file may be included by a template reading the whole context
+        shared_changed = not changes.issubset(CONTEXT_FILES)
+
+        directories, sources = renderer.walk(context)
+        infos: Dict[str, SourceInfo] = {}
+        stale: List[SourceFile] = []
+        for source in sources:
+            old = self._sources.get(source.path)
+            edited = prefix + source.path in changes
+            if old is None or edited or _affected(old.variables, changed_keys):
+                info = analyze_source(renderer, source, context, env)
+            else:
+                info = old
+            if info is None:
+                continue
+            infos[source.path] = info
+            if (
+                old is None
+                or edited
+                or old.path != info.path
+                or _affected(info.variables, changed_keys)
+                or (shared_changed and ALL_VARIABLES in info.variables)
+            ):
+                stale.append(source)
+
+        for directory in directories:
+            rendered_dir = renderer.render_directory(directory, context, env)
+            (project_path / rendered_dir).mkdir(parents=True, exist_ok=True)
+
+        def render(source: SourceFile) -> Optional[RenderedFile]:
+            return renderer.render_file(source, context, env)
+
+        for rendered in ordered_map(render, stale, self.render_workers):
+            if rendered is not None:
+                result.rendered += 1
+                self._save(project_path, rendered, result)
+
+        self._remove_orphans(project_path, infos, result)
+        self._renderer, self._context = renderer, context
+        self._sources = infos
+        self.project_path = project_path
+
+    def _save(
+        self, project_path: Path, rendered: RenderedFile, result: WatchResult
+    ) -> None:
+        """Write a re-rendered file unless it is unchanged on disk."""
+        digest = hashlib.sha256(rendered.content).hexdigest()
+        path = project_path / rendered.path
+        if self._written.get(rendered.path) == digest and path.exists():
+            return
+        write_atomic(path, rendered.content, rendered.mode & 0o777)
+        self._written[rendered.path] = digest
+        result.written.append(rendered.path)
+
+    def _remove_orphans(
+        self, project_path: Path, infos: Dict[str, SourceInfo], result: WatchResult
+    ) -> None:
+        """Delete files written earlier that the template no longer produces."""
+        produced = {info.path for info in infos.values()}
+        for path in sorted(set(self._written) - produced):
+            del self._written[path]
+            try:
+                (project_path / path).unlink()
+            except FileNotFoundError:
+                continue
+            prune_empty_dirs(project_path, path)
+            result.removed.append(path)
@@ -1,10 +1,22 @@
 """Test configuration for the egile-mcp-starter package."""
 
+import hashlib
+import zipfile
 from pathlib import Path
 
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep every cache written during tests out of the user's home."""
+    cache_dir = tmp_path / "egile-cache"
+    monkeypatch.setenv("EGILE_MCP_STARTER_CACHE_DIR", str(cache_dir))
+    # Renderers keep warm environments bound to the previous cache directory
+    monkeypatch.setattr("egile_mcp_starter.rendering._renderers", {})
+    return cache_dir
+
+
 @pytest.fixture
 def template_dir():
     """Get the template directory path."""
@@ -29,3 +41,43 @@ def sample_cookiecutter_json():
         "include_examples": "y",
         "server_type": "full",
     }
+
+
+def _build_wheel(wheelhouse, name, version, requires=()):
+    """Write a minimal pure-Python wheel and return its SHA-256."""
+    dist_info = f"{name}-{version}.dist-info"
+    metadata = [
+        "Metadata-Version: 2.1",
+        f"Name: {name}",
+        f"Version: {version}",
+    ]
+    metadata += [f"Requires-Dist: {requirement}" for requirement in requires]
+    path = wheelhouse / f"{name}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as wheel:
+        wheel.writestr(f"{name}/__init__.py", "")
+        wheel.writestr(f"{dist_info}/METADATA", "\n".join(metadata) + "\n")
+        wheel.writestr(
+            f"{dist_info}/WHEEL",
+            "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\n"
+            "Tag: py3-none-any\n",
+        )
+        wheel.writestr(f"{dist_info}/RECORD", "")
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.fixture
+def build_wheel():
+    """Build minimal wheels into a directory."""
+    return _build_wheel
+
+
+@pytest.fixture
+def wheelhouse(tmp_path):
+    """A wheelhouse where alpha depends on beta."""
+    directory = tmp_path / "wheels"
+    directory.mkdir()
+    hashes = {
+        "alpha": _build_wheel(directory, "alpha", "1.0", ["beta>=1"]),
+        "beta": _build_wheel(directory, "beta", "1.2"),
+    }
+    return directory, hashes
@@ -0,0 +1,145 @@
+"""Test the asyncio generation API."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from egile_mcp_starter import aio
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.rendering import TemplateRenderer
+
+
+@pytest.fixture(autouse=True)
+def default_limit():
+    """Restore the shared concurrency limit after each test."""
+    yield
+    aio.set_max_concurrency(aio.DEFAULT_MAX_CONCURRENCY)
+
+
+def _generator(output_dir):
+    return MCPProjectGenerator(
+        output_dir=str(output_dir), no_input=True, use_cache=False, engine="memory"
+    )
+
+
+class TestAgenerate:
+    """Test MCPProjectGenerator.agenerate."""
+
+    def test_generates_project(self, tmp_path):
+        """Test that the async API generates the same project."""
+        project = asyncio.run(_generator(tmp_path / "out").agenerate())
+
+        assert project == tmp_path / "out" / "my_mcp_server"
+        assert (project / "pyproject.toml").is_file()
+
+    def test_event_loop_is_not_blocked(self, tmp_path, monkeypatch):
+        """Test that other coroutines keep running during a generation."""
+        original = TemplateRenderer.render_file
+
+        def slow_render_file(self, *args):
+            time.sleep(0.005)
+            return original(self, *args)
+
+        monkeypatch.setattr(TemplateRenderer, "render_file", slow_render_file)
+        ticks = []
+
+        async def main():
+            generation = asyncio.create_task(_generator(tmp_path / "out").agenerate())
+            while not generation.done():
+                ticks.append(None)
+                await asyncio.sleep(0.005)
+            return await generation
+
+        assert asyncio.run(main()).is_dir()
+        assert len(ticks) > 5
+
+    def test_cancellation_removes_partial_output(self, tmp_path, monkeypatch):
+        """Test that a cancelled generation stops and leaves nothing behind."""
+        started = threading.Event()
+        rendered = []
+        original = TemplateRenderer.render_file
+
+        def slow_render_file(self, source, *args):
+            started.set()
+            time.sleep(0.01)
+            rendered.append(source.path)
+            return original(self, source, *args)
+
+        monkeypatch.setattr(TemplateRenderer, "render_file", slow_render_file)
+        out = tmp_path / "out"
+
+        async def main():
+            generation = asyncio.create_task(_generator(out).agenerate())
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            generation.cancel()
+            await generation
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(main())
+        stopped_after = len(rendered)
+        time.sleep(0.05)
+
+        assert list(out.iterdir()) == []
+        assert len(rendered) == stopped_after  # Stopped before returning
+        rendered.clear()
+        _generator(tmp_path / "full").generate()
+        assert stopped_after < len(rendered)
+
+
+class TestConcurrencyLimit:
+    """Test the concurrency limit shared by every call."""
+
+    def test_limit_is_shared(self):
+        """Test that no more calls than the limit run at once."""
+        aio.set_max_concurrency(2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(cancelled):
+            with lock:
+                active.append(None)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+        async def main():
+            await asyncio.gather(*(aio.run_cancellable(work) for _ in range(6)))
+
+        asyncio.run(main())
+        asyncio.run(main())  # The pool outlives event loops
+
+        assert max(peak) == 2
+
+    def test_waiting_call_never_starts(self):
+        """Test that a call cancelled while waiting for a slot never runs."""
+        aio.set_max_concurrency(1)
+        release = threading.Event()
+        ran = []
+
+        def block(cancelled):
+            release.wait(5)
+
+        async def main():
+            blocker = asyncio.create_task(aio.run_cancellable(block))
+            waiting = asyncio.create_task(aio.run_cancellable(ran.append))
+            await asyncio.sleep(0.02)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            release.set()
+            await blocker
+
+        asyncio.run(main())
+
+        assert ran == []
+
+    def test_invalid_limit(self):
+        """Test that the limit must be positive."""
+        with pytest.raises(ValueError, match="must be positive"):
+            aio.set_max_concurrency(0)
+        assert aio.get_max_concurrency() == aio.DEFAULT_MAX_CONCURRENCY
@@ -0,0 +1,130 @@
+"""Test streaming generation into archives."""
+
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.archive import ArchiveWriter, ChunkSink, archive_format
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.plugins.builtin.mcp_template import MCPTemplatePlugin
+from egile_mcp_starter.plugins.registry import TemplateRegistry
+
+
+def _tree(root: Path):
+    """Map every file of a directory to its content."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+class _WriteOnly(io.RawIOBase):
+    """Unseekable binary stream, like a socket or an HTTP response body."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data.extend(data)
+        return len(data)
+
+
+class TestArchiveGeneration:
+    """Test MCPProjectGenerator.write_archive() and iter_archive()."""
+
+    @pytest.mark.parametrize("template", ["mcp", "rag"])
+    def test_zip_matches_generated_directory(self, tmp_path, template):
+        """Test that the archive holds exactly what generate() writes."""
+        generated = MCPProjectGenerator(
+            output_dir=str(tmp_path / "dir"), no_input=True, template=template
+        ).generate()
+        stream = _WriteOnly()
+        MCPProjectGenerator(
+            output_dir=str(tmp_path / "unused"), no_input=True, template=template
+        ).write_archive(stream, "zip")
+
+        extracted = tmp_path / "zip"
+        with zipfile.ZipFile(io.BytesIO(bytes(stream.data))) as archive:
+            archive.extractall(extracted)
+
+        assert _tree(extracted / generated.name) == _tree(generated)
+        assert not (tmp_path / "unused").exists()
+
+    def test_tar_chunks(self, tmp_path):
+        """Test that iter_archive yields a valid tar.gz stream in pieces."""
+        output_dir = tmp_path / "out"
+        generator = MCPProjectGenerator(
+            output_dir=str(output_dir),
+            no_input=True,
+            extra_context={"project_name": "Chunked"},
+        )
+        chunks = list(generator.iter_archive("tar.gz"))
+
+        assert len(chunks) > 1
+        with tarfile.open(fileobj=io.BytesIO(b"".join(chunks)), mode="r:gz") as tar:
+            names = tar.getnames()
+            server = tar.getmember("chunked/src/chunked/server.py")
+            assert server.isfile() and server.mode & 0o600 == 0o600
+        assert "chunked/.egile-mcp-starter/manifest.json" in names
+        assert not output_dir.exists()
+
+    def test_post_generate_hook_runs_in_staging(self, tmp_path, monkeypatch):
+        """Test that plugins with a post_generate_hook still see a project."""
+
+        class HookedPlugin(MCPTemplatePlugin):
+            def post_generate_hook(self, project_path, context):
+                (project_path / "HOOKED").write_text(context["project_name"])
+
+        registry = TemplateRegistry()
+        registry.unregister("mcp")
+        registry.register(HookedPlugin())
+        monkeypatch.setattr("egile_mcp_starter.plugins.registry._registry", registry)
+
+        output_dir = tmp_path / "out"
+        stream = io.BytesIO()
+        MCPProjectGenerator(output_dir=str(output_dir), no_input=True).write_archive(
+            stream
+        )
+
+        with zipfile.ZipFile(stream) as archive:
+            assert archive.read("my_mcp_server/HOOKED") == b"My MCP Server"
+        assert not output_dir.exists()
+
+    def test_archive_command(self, tmp_path):
+        """Test the --archive CLI option."""
+        target = tmp_path / "project.tgz"
+        result = CliRunner().invoke(main, ["--no-input", "--archive", str(target)])
+
+        assert result.exit_code == 0, result.output
+        assert "archived to" in result.output
+        with tarfile.open(target) as tar:
+            assert "my_mcp_server/README.md" in tar.getnames()
+
+
+class TestArchiveWriter:
+    """Test the archive writer."""
+
+    def test_unknown_format(self):
+        """Test that unsupported formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported archive format"):
+            ArchiveWriter(io.BytesIO(), "rar")
+        with pytest.raises(ValueError, match="Cannot infer"):
+            archive_format("project.rar")
+
+    def test_chunk_sink_drains(self):
+        """Test that drained bytes are not kept."""
+        sink = ChunkSink()
+        sink.write(b"ab")
+        sink.write(b"c")
+
+        assert list(sink.drain()) == [b"abc"]
+        assert list(sink.drain()) == []
@@ -0,0 +1,106 @@
+"""Test batch generation from manifests."""
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.batch import BatchEntry, load_manifest
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.generator import MCPProjectGenerator
+
+MANIFEST = """
+max_workers: 2
+defaults:
+  output_dir: out
+  context:
+    author_name: Platform Team
+projects:
+  - context: {project_name: Team A}
+  - template: rag
+    output_dir: rag-out
+    context: {project_name: Team B, vector_db: qdrant}
+"""
+
+
+class TestManifest:
+    """Test manifest loading."""
+
+    def test_load_manifest(self, tmp_path):
+        """Test that defaults are merged into each project."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text(MANIFEST)
+
+        loaded = load_manifest(str(manifest))
+        first, second = loaded["entries"]
+
+        assert loaded["max_workers"] == 2
+        assert first == BatchEntry(
+            "mcp",
+            {"author_name": "Platform Team", "project_name": "Team A"},
+            str(tmp_path / "out"),
+        )
+        assert second.template == "rag"
+        assert second.context["vector_db"] == "qdrant"
+        assert second.output_dir == str(tmp_path / "rag-out")
+
+    def test_load_manifest_requires_projects(self, tmp_path):
+        """Test that a manifest without projects is rejected."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("defaults: {}\n")
+
+        with pytest.raises(ValueError, match="projects"):
+            load_manifest(str(manifest))
+
+
+class TestGenerateMany:
+    """Test the generate_many API."""
+
+    def test_generate_many_in_process_pool(self, tmp_path):
+        """Test that entries are rendered in order across worker processes."""
+        entries = [
+            ("mcp", {"project_name": "Alpha"}, str(tmp_path)),
+            ("rag", {"project_name": "Beta"}, str(tmp_path)),
+            ("missing", {}, str(tmp_path)),
+        ]
+
+        results = MCPProjectGenerator.generate_many(entries, max_workers=2)
+
+        assert [r.ok for r in results] == [True, True, False]
+        assert results[0].project_path == tmp_path / "alpha"
+        assert (results[1].project_path / "src" / "beta" / "vector_store.py").exists()
+        assert "Template 'missing' not found" in results[2].error
+
+    def test_generate_many_single_worker(self, tmp_path):
+        """Test that a single worker renders inline without a pool."""
+        results = MCPProjectGenerator.generate_many(
+            [BatchEntry("mcp", {"project_name": "Solo"}, str(tmp_path))],
+            max_workers=1,
+        )
+
+        assert results[0].ok
+        assert (tmp_path / "solo" / "pyproject.toml").exists()
+
+
+class TestBatchCommand:
+    """Test the batch CLI command."""
+
+    def test_batch_command(self, tmp_path):
+        """Test generating projects from a manifest via the CLI."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text(MANIFEST)
+
+        result = CliRunner().invoke(main, ["batch", str(manifest), "--workers", "1"])
+
+        assert result.exit_code == 0, result.output
+        assert "Generated 2/2 projects" in result.output
+        assert (tmp_path / "out" / "team_a").is_dir()
+        assert (tmp_path / "rag-out" / "team_b").is_dir()
+
+    def test_batch_command_reports_failures(self, tmp_path):
+        """Test that failed entries make the command exit non-zero."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("projects:\n  - template: missing\n")
+
+        result = CliRunner().invoke(main, ["batch", str(manifest)])
+
+        assert result.exit_code == 1
+        assert "Generated 0/1 projects" in result.output
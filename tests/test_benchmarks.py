@@ -0,0 +1,166 @@
+"""Cold-start benchmarks of the CLI with regression budgets.
+
+Every scenario runs the CLI in a fresh interpreter, exactly like the
+``egile-mcp-starter`` console script, and records:
+
+* ``wall_ms``: wall time of the whole process, best of ``repeat`` runs
+* ``import_ms``: time spent importing modules after interpreter start-up,
+  as reported by ``python -X importtime`` (sum of the cumulative times of
+  the top-level imports performed once ``site`` is loaded)
+
+Results are written as JSON to ``.benchmarks/cli.json`` (override with
+``EGILE_BENCHMARK_RESULTS``) and compared with ``benchmark_budgets.json``.
+Budgets can be scaled for slow machines with ``EGILE_BENCHMARK_BUDGET_SCALE``.
+Wall-clock budgets depend on the machine, so the benchmarks are deselected by
+default and only run with ``-m benchmark``.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+BUDGETS_FILE = Path(__file__).parent / "benchmark_budgets.json"
+RESULTS_ENV = "EGILE_BENCHMARK_RESULTS"
+SCALE_ENV = "EGILE_BENCHMARK_BUDGET_SCALE"
+DEFAULT_RESULTS = Path(__file__).parent.parent / ".benchmarks" / "cli.json"
+
+CLI_LAUNCHER = "from egile_mcp_starter.cli import main; main()"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+BUDGETS = json.loads(BUDGETS_FILE.read_text())
+SCENARIOS = {
+    "help": ["--help"],
+    "list_templates": ["--list-templates"],
+    "generate_mcp": ["--no-input", "--no-cache", "--template", "mcp"],
+    "generate_rag": ["--no-input", "--no-cache", "--template", "rag"],
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """Parse ``-X importtime`` output.
+
+    Args:
+        stderr: Standard error of a ``python -X importtime`` run
+
+    Returns:
+        Total import time in milliseconds after ``site`` was loaded, and the
+        top-level imports with their cumulative time, heaviest first
+    """
+    top_level = []
+    site_loaded = False
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match or match.group(3) != " ":
+            continue  # Not a top-level import
+        name, cumulative = match.group(4), int(match.group(2)) / 1000
+        if site_loaded:
+            top_level.append((name, cumulative))
+        site_loaded = site_loaded or name == "site"
+
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return sum(ms for _, ms in top_level), top_level
+
+
+def run_cli(args: List[str], cwd: Path, importtime: bool = False) -> Tuple[float, str]:
+    """Run the CLI in a fresh interpreter.
+
+    Args:
+        args: Command-line arguments
+        cwd: Working directory of the process
+        importtime: Whether to enable ``-X importtime``
+
+    Returns:
+        Wall time in milliseconds and the captured standard error
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", CLI_LAUNCHER, *args]
+
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    assert result.returncode == 0, result.stdout + result.stderr
+    return wall_ms, result.stderr
+
+
+def measure(args: List[str], workdir: Path, repeat: int) -> Dict[str, object]:
+    """Measure one scenario, keeping the best of ``repeat`` runs."""
+    walls, imports = [], []
+    heaviest: List[Tuple[str, float]] = []
+    for run in range(repeat):
+        cwd = workdir / f"run{run}"
+        cwd.mkdir()
+        walls.append(run_cli(args, cwd)[0])
+
+        import_cwd = workdir / f"importtime{run}"
+        import_cwd.mkdir()
+        total, top_level = parse_importtime(run_cli(args, import_cwd, True)[1])
+        if not imports or total < min(imports):
+            heaviest = top_level[:10]
+        imports.append(total)
+
+    return {
+        "args": args,
+        "wall_ms": round(min(walls), 1),
+        "import_ms": round(min(imports), 1),
+        "heaviest_imports": [[name, round(ms, 1)] for name, ms in heaviest],
+    }
+
+
+@pytest.fixture(scope="module")
+def benchmark_results():
+    """Collect benchmark results and write them as JSON."""
+    results: Dict[str, object] = {}
+    yield results
+
+    path = Path(os.environ.get(RESULTS_ENV, DEFAULT_RESULTS))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "budget_scale": float(os.environ.get(SCALE_ENV, "1")),
+        "scenarios": results,
+    }
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def test_parse_importtime():
+    """Test that only imports performed after start-up are counted."""
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   _io",
+            "import time:       300 |       2000 | site",
+            "import time:       500 |       3000 | click",
+            "import time:      1500 |       1500 |   click.core",
+            "import time:       200 |       1000 | json",
+        ]
+    )
+
+    total, top_level = parse_importtime(stderr)
+
+    assert total == 4.0
+    assert top_level == [("click", 3.0), ("json", 1.0)]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_cli_cold_start(scenario, tmp_path, benchmark_results):
+    """Test that a CLI scenario stays within its time budgets."""
+    result = measure(SCENARIOS[scenario], tmp_path, BUDGETS["repeat"])
+    benchmark_results[scenario] = result
+
+    scale = float(os.environ.get(SCALE_ENV, "1"))
+    for metric, budget in BUDGETS["scenarios"][scenario].items():
+        assert result[metric] <= budget * scale, (
+            f"{scenario}: {metric} = {result[metric]} ms exceeds the budget of "
+            f"{budget * scale} ms; heaviest imports: {result['heaviest_imports']}"
+        )
@@ -0,0 +1,118 @@
+"""Test single-file template bundles."""
+
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.bundles import (
+    BundleSource,
+    TemplateSource,
+    create_bundle,
+    is_bundle,
+    open_source,
+    resolve_template_path,
+)
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.plugins.builtin.mcp_template import MCPTemplatePlugin
+from egile_mcp_starter.plugins.registry import TemplateRegistry
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "egile_mcp_starter" / "template"
+
+
+def _tree(root):
+    """Map relative paths to content and permission bits."""
+    return {
+        path.relative_to(root).as_posix(): (path.read_bytes(), path.stat().st_mode)
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and path.name != ".egile-manifest.json"
+    }
+
+
+def _use_bundle(monkeypatch, bundle):
+    """Make the builtin MCP plugin point at a bundle."""
+    monkeypatch.setattr(MCPTemplatePlugin, "get_template_path", lambda self: bundle)
+    monkeypatch.setattr(
+        "egile_mcp_starter.plugins.registry._registry", TemplateRegistry()
+    )
+
+
+@pytest.fixture
+def mcp_bundle(tmp_path, monkeypatch):
+    """The builtin MCP template, registered as a bundle."""
+    bundle = create_bundle(TEMPLATE_DIR, tmp_path / "template.zip")
+    _use_bundle(monkeypatch, bundle)
+    return bundle
+
+
+class TestBundles:
+    """Test generating projects from bundles."""
+
+    def test_create_bundle_is_deterministic(self, tmp_path):
+        """Test that bundling the same template twice gives identical files."""
+        first = create_bundle(TEMPLATE_DIR, tmp_path / "a.zip")
+        second = create_bundle(TEMPLATE_DIR, tmp_path / "b.zip")
+
+        assert is_bundle(first) and not is_bundle(TEMPLATE_DIR)
+        assert first.read_bytes() == second.read_bytes()
+        assert isinstance(open_source(first), BundleSource)
+
+    def test_template_source_interface(self, tmp_path):
+        """Test that TemplateSource is abstract and cannot be instantiated."""
+        with pytest.raises(TypeError):
+            TemplateSource(tmp_path)
+
+    def test_not_a_template(self, tmp_path):
+        """Test that only cookiecutter templates can be bundled."""
+        with pytest.raises(ValueError, match="has no cookiecutter.json"):
+            create_bundle(tmp_path, tmp_path / "bundle.zip")
+
+    @pytest.mark.parametrize("context", [{}, {"use_docker": "n", "license": "None"}])
+    def test_memory_engine_matches_directory(self, tmp_path, monkeypatch, context):
+        """Test that a bundle renders exactly like its loose directory."""
+
+        def generate(output_dir):
+            return MCPProjectGenerator(
+                output_dir=str(output_dir),
+                no_input=True,
+                engine="memory",
+                use_cache=False,
+                extra_context=context,
+            ).generate()
+
+        expected = generate(tmp_path / "dir")
+        _use_bundle(monkeypatch, create_bundle(TEMPLATE_DIR, tmp_path / "t.zip"))
+        actual = generate(tmp_path / "zip")
+
+        assert _tree(actual) == _tree(expected)
+        assert not (tmp_path / "egile-cache" / "bundles").exists()
+
+    def test_cookiecutter_engine(self, mcp_bundle, tmp_path):
+        """Test that the cookiecutter engine renders an extracted bundle."""
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"), no_input=True, use_cache=False
+        ).generate()
+
+        assert (project / "pyproject.toml").is_file()
+        assert len(list((tmp_path / "egile-cache" / "bundles").iterdir())) == 1
+
+    def test_resolve_template_path(self, tmp_path):
+        """Test that loose directories win over bundles next to them."""
+        template = tmp_path / "template"
+        bundle = tmp_path / "template.zip"
+        bundle.write_bytes(b"")
+
+        assert resolve_template_path(template) == bundle
+        template.mkdir()
+        assert resolve_template_path(template) == template
+
+    def test_cli_bundle(self, tmp_path):
+        """Test that the bundle command packs registered templates."""
+        result = CliRunner().invoke(
+            main, ["bundle", "-t", "mcp", "-o", str(tmp_path / "bundles")]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert is_bundle(tmp_path / "bundles" / "template.zip")
+        assert "mcp: bundled to" in result.output
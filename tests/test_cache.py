@@ -0,0 +1,160 @@
+"""Test the on-disk render cache."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from egile_mcp_starter.cache import (
+    RenderCache,
+    compute_cache_key,
+    get_cache_root,
+    hash_directory,
+)
+from egile_mcp_starter.generator import MCPProjectGenerator
+
+
+def _make_project(root: Path, name: str = "demo", size: int = 10) -> Path:
+    """Create a small fake rendered project."""
+    project = root / name
+    (project / "src").mkdir(parents=True)
+    (project / "README.md").write_text("x" * size)
+    (project / "src" / "main.py").write_text("print('hi')\n")
+    return project
+
+
+class TestCacheKey:
+    """Test cache key computation."""
+
+    def test_cache_root_env_override(self, isolated_cache_dir):
+        """Test that the cache root honours the environment override."""
+        assert get_cache_root() == isolated_cache_dir
+
+    def test_hash_directory_changes_with_content(self, tmp_path):
+        """Test that editing a template file changes the directory hash."""
+        project = _make_project(tmp_path)
+        before = hash_directory(project)
+        (project / "README.md").write_text("changed")
+
+        assert hash_directory(project) != before
+
+    def test_key_depends_on_context_and_version(self, template_dir):
+        """Test that context and plugin version are part of the key."""
+        base = compute_cache_key(template_dir, "1.0.0", {"project_name": "A"})
+
+        assert base == compute_cache_key(template_dir, "1.0.0", {"project_name": "A"})
+        assert base != compute_cache_key(template_dir, "1.0.1", {"project_name": "A"})
+        assert base != compute_cache_key(template_dir, "1.0.0", {"project_name": "B"})
+
+    def test_template_digest_is_memoized(self, tmp_path):
+        """Test that unchanged templates are not hashed again."""
+        template = _make_project(tmp_path)
+        with patch(
+            "egile_mcp_starter.bundles.hash_directory", side_effect=hash_directory
+        ) as hashing:
+            first = compute_cache_key(template, "1.0.0", {})
+            assert compute_cache_key(template, "1.0.0", {}) == first
+            assert hashing.call_count == 1
+
+            (template / "README.md").write_text("y" * 11)
+            assert compute_cache_key(template, "1.0.0", {}) != first
+            (template / "README.md").chmod(0o755)
+            compute_cache_key(template, "1.0.0", {})
+            assert hashing.call_count == 3
+
+
+class TestRenderCache:
+    """Test storing, materializing and evicting renders."""
+
+    def test_put_get_materialize(self, tmp_path):
+        """Test a full round trip through the cache."""
+        cache = RenderCache(tmp_path / "cache")
+        project = _make_project(tmp_path / "rendered")
+
+        assert cache.get("abc") is None
+        cache.put("abc", project)
+        cached = cache.get("abc")
+        assert cached is not None
+
+        target = cache.materialize(cached, tmp_path / "out")
+        assert target == tmp_path / "out" / "demo"
+        assert (target / "src" / "main.py").read_text() == "print('hi')\n"
+
+    def test_materialize_refuses_existing_directory(self, tmp_path):
+        """Test that an existing project directory is never overwritten."""
+        cache = RenderCache(tmp_path / "cache")
+        cache.put("abc", _make_project(tmp_path / "rendered"))
+        (tmp_path / "out" / "demo").mkdir(parents=True)
+
+        with pytest.raises(FileExistsError):
+            cache.materialize(cache.get("abc"), tmp_path / "out")
+
+    def test_materialized_projects_are_independent(self, tmp_path):
+        """Test that editing a materialized project leaves the others intact."""
+        cache = RenderCache(tmp_path / "cache")
+        cache.put("abc", _make_project(tmp_path / "rendered"))
+        first = cache.materialize(cache.get("abc"), tmp_path / "a")
+        second = cache.materialize(cache.get("abc"), tmp_path / "b")
+
+        with open(first / "README.md", "a") as fh:
+            fh.write("local edit")
+
+        assert (first / "README.md").stat().st_nlink == 1
+        assert (second / "README.md").read_text() == "x" * 10
+        cached = cache.get("abc")
+        assert cached is not None
+        assert (cached / "README.md").read_text() == "x" * 10
+
+    def test_modified_entry_is_dropped(self, tmp_path):
+        """Test that an entry edited in place is invalidated."""
+        cache = RenderCache(tmp_path / "cache")
+        cache.put("abc", _make_project(tmp_path / "rendered"))
+
+        with open(cache.get("abc") / "README.md", "a") as fh:
+            fh.write("local edit")
+
+        assert cache.get("abc") is None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entry is evicted first."""
+        cache = RenderCache(tmp_path / "cache", max_size=120)
+        cache.put("old", _make_project(tmp_path / "a", size=40))
+        cache.put("new", _make_project(tmp_path / "b", size=40))
+        assert cache.get("old") is not None  # Refresh "old"
+
+        cache.put("newest", _make_project(tmp_path / "c", size=40))
+
+        assert cache.get("new") is None
+        assert cache.get("old") is not None
+        assert cache.get("newest") is not None
+
+
+class TestGeneratorCache:
+    """Test render cache integration in the generator."""
+
+    def test_second_generation_hits_cache(self, tmp_path):
+        """Test that an identical generation is served from the cache."""
+        first = MCPProjectGenerator(output_dir=str(tmp_path / "a"), no_input=True)
+        first_path = first.generate()
+
+        with patch("egile_mcp_starter.generator.cookiecutter") as mock_cookiecutter:
+            second = MCPProjectGenerator(output_dir=str(tmp_path / "b"), no_input=True)
+            second_path = second.generate()
+
+        mock_cookiecutter.assert_not_called()
+        assert second_path == tmp_path / "b" / first_path.name
+        assert (second_path / "pyproject.toml").read_bytes() == (
+            first_path / "pyproject.toml"
+        ).read_bytes()
+
+    def test_no_cache_always_renders(self, tmp_path):
+        """Test that disabling the cache always calls cookiecutter."""
+        MCPProjectGenerator(output_dir=str(tmp_path / "a"), no_input=True).generate()
+
+        with patch("egile_mcp_starter.generator.cookiecutter") as mock_cookiecutter:
+            mock_cookiecutter.return_value = str(tmp_path / "b" / "my_mcp_server")
+            MCPProjectGenerator(
+                output_dir=str(tmp_path / "b"), no_input=True, use_cache=False
+            ).generate()
+
+        mock_cookiecutter.assert_called_once()
@@ -40,6 +40,11 @@ class TestCLI:
             verbose=False,
             template="mcp",
             project_name=None,
+            use_cache=True,
+            engine="cookiecutter",
+            render_workers=1,
+            lock_source=None,
+            bootstrap_env=False,
         )
         mock_generator.generate.assert_called_once()
 
@@ -64,6 +69,11 @@ class TestCLI:
             verbose=True,
             template="mcp",
             project_name=None,
+            use_cache=True,
+            engine="cookiecutter",
+            render_workers=1,
+            lock_source=None,
+            bootstrap_env=False,
         )
 
     @patch("egile_mcp_starter.cli.MCPProjectGenerator")
@@ -123,4 +133,22 @@ class TestCLI:
                 verbose=False,
                 template="mcp",
                 project_name=None,
+                use_cache=True,
+                engine="cookiecutter",
+                render_workers=1,
+                lock_source=None,
+                bootstrap_env=False,
             )
+
+    @patch("egile_mcp_starter.cli.MCPProjectGenerator")
+    def test_cli_no_cache(self, mock_generator_class):
+        """Test that --no-cache disables the render cache."""
+        mock_generator = MagicMock()
+        mock_generator.generate.return_value = "/tmp/test-project"
+        mock_generator_class.return_value = mock_generator
+
+        runner = CliRunner()
+        result = runner.invoke(main, ["--no-input", "--no-cache"])
+
+        assert result.exit_code == 0
+        assert mock_generator_class.call_args.kwargs["use_cache"] is False
@@ -0,0 +1,155 @@
+"""Test cached discovery of external template plugins."""
+
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.plugins import discovery
+from egile_mcp_starter.plugins import registry as registry_module
+from egile_mcp_starter.plugins.registry import TemplateRegistry, get_registry
+
+PLUGIN_MODULE = """
+from pathlib import Path
+
+from egile_mcp_starter.plugins.base import TemplatePlugin
+
+
+class ExternalPlugin(TemplatePlugin):
+    def __init__(self):
+        super().__init__("external", "External template", "2.0.0")
+
+    def get_template_path(self):
+        return Path(__file__).parent
+
+    def get_default_context(self):
+        return {}
+
+    def get_supported_features(self):
+        return ["external"]
+"""
+
+
+@pytest.fixture
+def site_dir(tmp_path, monkeypatch):
+    """A site directory with one installed distribution exposing a plugin."""
+    site = tmp_path / "site"
+    dist_info = site / "external_plugin-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text("Name: external-plugin\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[egile_mcp_starter.templates]\nexternal = external_plugin:ExternalPlugin\n"
+    )
+    (site / "external_plugin.py").write_text(PLUGIN_MODULE)
+
+    monkeypatch.syspath_prepend(str(site))
+    yield site
+    sys.modules.pop("external_plugin", None)
+
+
+@pytest.fixture
+def scan_calls(monkeypatch):
+    """Count entry-point scans."""
+    calls = []
+    scan = discovery.scan_entry_points
+
+    def counting_scan():
+        calls.append(1)
+        return scan()
+
+    monkeypatch.setattr(discovery, "scan_entry_points", counting_scan)
+    return calls
+
+
+class TestEntryPointDiscovery:
+    """Test the entry-point discovery cache."""
+
+    def test_discovers_plugin_metadata(self, site_dir):
+        """Test that entry-point plugins are described by their metadata."""
+        (info,) = discovery.discover_entry_point_plugins()
+
+        assert info.name == "external"
+        assert info.version == "2.0.0"
+        assert info.features == ["external"]
+        assert (info.module, info.class_name) == ("external_plugin", "ExternalPlugin")
+        assert discovery.get_discovery_cache_path().exists()
+
+    def test_cache_skips_scan_and_import(self, site_dir, scan_calls):
+        """Test that a fresh cache neither scans nor imports plugins."""
+        discovery.discover_entry_point_plugins()
+        sys.modules.pop("external_plugin", None)
+
+        registry = TemplateRegistry()
+        registry.discover_external_plugins()
+
+        assert len(scan_calls) == 1
+        assert "external" in registry.get_plugin_names()
+        assert "external_plugin" not in sys.modules
+        assert registry.get_plugin("external").description == "External template"
+
+    def test_new_distribution_invalidates_cache(self, site_dir, scan_calls):
+        """Test that installing a distribution triggers a rescan."""
+        discovery.discover_entry_point_plugins()
+        (site_dir / "other-1.0.dist-info").mkdir()
+        discovery.discover_entry_point_plugins()
+
+        assert len(scan_calls) == 2
+
+    def test_refresh_forces_scan(self, site_dir, scan_calls):
+        """Test that refresh rescans even with a fresh cache."""
+        discovery.discover_entry_point_plugins()
+        discovery.discover_entry_point_plugins(refresh=True)
+
+        assert len(scan_calls) == 2
+
+    def test_cache_per_environment(self, site_dir, scan_calls, monkeypatch):
+        """Test that environments sharing a cache root keep separate caches."""
+        discovery.discover_entry_point_plugins()
+        first = discovery.get_discovery_cache_path()
+        monkeypatch.setattr(sys, "prefix", str(site_dir / "venv"))
+        discovery.discover_entry_point_plugins()
+
+        assert discovery.get_discovery_cache_path() != first
+        assert first.exists() and discovery.get_discovery_cache_path().exists()
+        assert len(scan_calls) == 2
+
+    @pytest.mark.parametrize("enabled", [False, True])
+    def test_global_registry_discovery_is_opt_in(
+        self, site_dir, scan_calls, monkeypatch, enabled
+    ):
+        """Test that only an opted-in global registry scans entry points."""
+        monkeypatch.setattr(registry_module, "_registry", None)
+        if enabled:
+            monkeypatch.setenv(registry_module.DISCOVER_ENV, "1")
+
+        names = get_registry().get_plugin_names()
+
+        assert ("external" in names) is enabled
+        assert len(scan_calls) == int(enabled)
+
+    def test_builtin_plugins_take_precedence(self, site_dir):
+        """Test that an external plugin cannot replace a built-in one."""
+        (site_dir / "external_plugin.py").write_text(
+            PLUGIN_MODULE.replace('"external", ', '"mcp", ')
+        )
+
+        registry = TemplateRegistry()
+        registry.discover_external_plugins()
+
+        assert registry.get_plugin_info("mcp").module.startswith("egile_mcp_starter")
+
+
+class TestRebuildPluginCacheCommand:
+    """Test the rebuild-plugin-cache CLI command."""
+
+    def test_rebuild_plugin_cache(self, site_dir, scan_calls):
+        """Test that the command rescans and reports external plugins."""
+        discovery.discover_entry_point_plugins()
+
+        result = CliRunner().invoke(main, ["rebuild-plugin-cache"])
+
+        assert result.exit_code == 0, result.output
+        assert "external: external_plugin.ExternalPlugin" in result.output
+        assert "Discovered 1 external template plugins" in result.output
+        assert len(scan_calls) == 2
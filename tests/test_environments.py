@@ -0,0 +1,89 @@
+"""Test the shared environment cache."""
+
+import subprocess
+
+import pytest
+
+from egile_mcp_starter.environments import (
+    VENV_DIR,
+    EnvironmentCache,
+    bootstrap_environment,
+    environment_key,
+)
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.lock import LOCK_FILE
+
+
+def _import(env_dir, *modules):
+    """Import modules with the interpreter of an environment."""
+    code = "import " + ", ".join(modules)
+    return subprocess.run([str(env_dir / "bin" / "python"), "-c", code]).returncode
+
+
+class TestEnvironmentCache:
+    """Test creating project environments from cached ones."""
+
+    def test_environment_key(self):
+        """Test what the environment key depends on."""
+        key = environment_key(["chromadb", "sqlite3"], "3.11")
+
+        assert key == environment_key(["chromadb", "chromadb"], "3.11")
+        assert key != environment_key(["chromadb"], "3.12")
+        assert key != environment_key(["chromadb"], "3.11", lock="alpha==1.0\n")
+
+    def test_projects_share_installed_files(self, wheelhouse, tmp_path):
+        """Test that site-packages are hardlinked and scripts rewritten."""
+        directory, _ = wheelhouse
+        projects = [tmp_path / "one", tmp_path / "two"]
+        envs = []
+        for project in projects:
+            project.mkdir()
+            envs.append(
+                bootstrap_environment(project, ["alpha"], source=str(directory))
+            )
+
+        inodes = {
+            next(env.glob("lib/python*/site-packages/alpha/__init__.py")).stat().st_ino
+            for env in envs
+        }
+        pip_script = (envs[1] / "bin" / "pip").read_text()
+
+        assert len(list(EnvironmentCache().directory.iterdir())) == 1
+        assert len(inodes) == 1
+        assert _import(envs[1], "alpha", "beta", "pip") == 0
+        assert str(envs[1] / "bin" / "python") in pip_script
+        assert "egile-cache" not in pip_script
+        assert (
+            subprocess.run([str(envs[1] / "bin" / "pip"), "--version"]).returncode == 0
+        )
+
+    def test_unavailable_interpreter(self, tmp_path):
+        """Test that a missing Python version raises ValueError."""
+        with pytest.raises(ValueError, match="Python 1.0 was not found"):
+            bootstrap_environment(tmp_path, ["alpha"], python_version="1.0")
+
+    def test_generator_bootstraps_from_lock(self, wheelhouse, tmp_path, monkeypatch):
+        """Test that generated projects get an environment matching the lock."""
+        directory, _ = wheelhouse
+        plugin = "egile_mcp_starter.plugins.builtin.rag_template.RAGTemplatePlugin"
+        hook_contexts = []
+        monkeypatch.setattr(
+            f"{plugin}.get_dependencies", lambda self, context: ["alpha"]
+        )
+        # An override not calling the base hook still gets the environment
+        monkeypatch.setattr(
+            f"{plugin}.post_generate_hook",
+            lambda self, project_path, context: hook_contexts.append(context),
+        )
+
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"),
+            no_input=True,
+            template="rag",
+            lock_source=str(directory),
+            bootstrap_env=True,
+        ).generate()
+
+        assert (project / LOCK_FILE).is_file()
+        assert _import(project / VENV_DIR, "alpha", "beta") == 0
+        assert not any(key.startswith("_bootstrap") for key in hook_contexts[0])
@@ -0,0 +1,71 @@
+"""Test the streaming generation event API."""
+
+import pytest
+
+from egile_mcp_starter.events import (
+    CacheHit,
+    ContextFinalized,
+    FileRendered,
+    HookRun,
+    PluginResolved,
+    ProjectGenerated,
+)
+from egile_mcp_starter.generator import MCPProjectGenerator
+
+
+class TestGenerateIter:
+    """Test MCPProjectGenerator.generate_iter()."""
+
+    @pytest.mark.parametrize("engine", ["cookiecutter", "memory"])
+    def test_event_order(self, tmp_path, engine):
+        """Test that events follow the phases of a generation."""
+        generator = MCPProjectGenerator(
+            output_dir=str(tmp_path), no_input=True, use_cache=False, engine=engine
+        )
+        events = list(generator.generate_iter())
+        kinds = [event.kind for event in events]
+
+        assert kinds[:3] == ["plugin_resolved", "hook_run", "context_finalized"]
+        assert kinds[-2:] == ["hook_run", "project_generated"]
+        assert set(kinds[3:-2]) == {"file_rendered"}
+
+        resolved, pre_hook, finalized = events[:3]
+        assert isinstance(resolved, PluginResolved)
+        assert resolved.template == "mcp"
+        assert isinstance(pre_hook, HookRun) and pre_hook.hook == "pre_generate"
+        assert isinstance(finalized, ContextFinalized)
+        assert finalized.context["project_name"] == "My MCP Server"
+
+        done = events[-1]
+        assert isinstance(done, ProjectGenerated)
+        assert done.project_path == tmp_path / "my_mcp_server"
+        files = {e.path: e for e in events if isinstance(e, FileRendered)}
+        assert "src/my_mcp_server/server.py" in files
+        assert not any(path.startswith(".egile-mcp-starter") for path in files)
+        readme = files["README.md"]
+        assert readme.size == (done.project_path / "README.md").stat().st_size
+        if engine == "memory":
+            assert readme.duration is not None and readme.duration >= 0
+        else:
+            assert readme.duration is None
+
+    def test_cache_hit_replaces_file_events(self, tmp_path):
+        """Test that a cached render reports a cache hit instead of files."""
+        first = MCPProjectGenerator(output_dir=str(tmp_path / "a"), no_input=True)
+        assert not any(isinstance(e, CacheHit) for e in first.generate_iter())
+
+        second = MCPProjectGenerator(output_dir=str(tmp_path / "b"), no_input=True)
+        events = list(second.generate_iter())
+
+        assert [e.kind for e in events][3:5] == ["cache_hit", "hook_run"]
+        assert not any(isinstance(e, FileRendered) for e in events)
+        assert (tmp_path / "b" / "my_mcp_server" / "README.md").exists()
+
+    def test_errors_raised_while_iterating(self, tmp_path):
+        """Test that failures surface from the iterator."""
+        generator = MCPProjectGenerator(output_dir=str(tmp_path), no_input=True)
+        generator.template_name = "missing"
+        events = generator.generate_iter()
+
+        with pytest.raises(Exception, match="Template 'missing' not found"):
+            next(events)
@@ -0,0 +1,142 @@
+"""Test fast copies of verbatim template files."""
+
+import errno
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from egile_mcp_starter import fastcopy
+from egile_mcp_starter.bundles import TemplateSource, create_bundle
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.manifest import ProjectManifest, read_blob, sha256_bytes
+from egile_mcp_starter.plugins.builtin.mcp_template import MCPTemplatePlugin
+from egile_mcp_starter.plugins.registry import TemplateRegistry
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "egile_mcp_starter" / "template"
+ASSET = "assets/model.bin"
+
+
+def _unsupported(src_fd, dst_fd, offset, size):
+    return offset
+
+
+def _half(src_fd, dst_fd, offset, size):
+    """Copy the first half of the file, then give up."""
+    os.pwrite(dst_fd, os.pread(src_fd, size // 2, offset), offset)
+    return size // 2
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A file larger than a chunk."""
+    path = tmp_path / "source.bin"
+    path.write_bytes(os.urandom(fastcopy.CHUNK_SIZE * 2 + 123))
+    return path
+
+
+class TestCopyFile:
+    """Test the copy mechanisms and their fallbacks."""
+
+    def test_copy(self, source, tmp_path):
+        """Test that the content and mode are copied."""
+        method = fastcopy.copy_file(source, tmp_path / "copy", mode=0o640)
+
+        assert method in [name for name, _ in fastcopy.METHODS]
+        assert (tmp_path / "copy").read_bytes() == source.read_bytes()
+        assert (tmp_path / "copy").stat().st_mode & 0o777 == 0o640
+
+    def test_fallbacks_resume(self, source, tmp_path, monkeypatch):
+        """Test that unsupported mechanisms fall back, keeping copied data."""
+        monkeypatch.setattr(
+            fastcopy,
+            "METHODS",
+            [
+                ("reflink", _unsupported),
+                ("copy_file_range", _half),
+                ("sendfile", _unsupported),
+                ("chunked", fastcopy._chunked),
+            ],
+        )
+
+        assert fastcopy.copy_file(source, tmp_path / "copy") == "chunked"
+        assert (tmp_path / "copy").read_bytes() == source.read_bytes()
+
+    def test_unsupported_kernel_copies(self, source, tmp_path, monkeypatch):
+        """Test that EXDEV from copy_file_range falls back to sendfile."""
+
+        def cross_device(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        methods = [("reflink", _unsupported)] + fastcopy.METHODS[1:]
+        monkeypatch.setattr(fastcopy, "METHODS", methods)
+        monkeypatch.setattr(os, "copy_file_range", cross_device, raising=False)
+
+        assert fastcopy.copy_file(source, tmp_path / "copy") in ("sendfile", "chunked")
+        assert (tmp_path / "copy").read_bytes() == source.read_bytes()
+
+    def test_copy_errors_are_raised(self, source, tmp_path, monkeypatch):
+        """Test that errors other than unsupported mechanisms propagate."""
+
+        def disk_full(*args):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        monkeypatch.setattr(fastcopy, "METHODS", [("sendfile", disk_full)])
+
+        with pytest.raises(OSError, match="No space left"):
+            fastcopy.copy_file(source, tmp_path / "copy")
+
+    def test_link_or_copy(self, source, tmp_path, monkeypatch):
+        """Test that files are hardlinked, or copied where links fail."""
+        fastcopy.link_or_copy(source, tmp_path / "link")
+
+        def cross_device(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "link", cross_device)
+        fastcopy.link_or_copy(source, tmp_path / "copy")
+
+        assert (tmp_path / "link").stat().st_ino == source.stat().st_ino
+        assert (tmp_path / "copy").stat().st_ino != source.stat().st_ino
+        assert (tmp_path / "copy").read_bytes() == source.read_bytes()
+
+
+class TestVerbatimAssets:
+    """Test that the memory engine streams verbatim template files."""
+
+    @pytest.mark.parametrize("bundled", [False, True])
+    def test_assets_are_not_loaded(self, tmp_path, monkeypatch, bundled):
+        """Test that a large binary asset is copied without being read whole."""
+        template = shutil.copytree(TEMPLATE_DIR, tmp_path / "template")
+        asset = template / "{{cookiecutter.project_slug}}" / ASSET
+        asset.parent.mkdir()
+        asset.write_bytes(b"\0" + os.urandom(3 * fastcopy.CHUNK_SIZE))
+        if bundled:
+            template = create_bundle(template, tmp_path / "template.zip")
+        monkeypatch.setattr(
+            MCPTemplatePlugin, "get_template_path", lambda self: template
+        )
+        monkeypatch.setattr(
+            "egile_mcp_starter.plugins.registry._registry", TemplateRegistry()
+        )
+        read = []
+        for cls in TemplateSource.__subclasses__():
+            original = cls.read_bytes
+            monkeypatch.setattr(
+                cls,
+                "read_bytes",
+                lambda self, path, original=original: read.append(path)
+                or original(self, path),
+            )
+
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"), no_input=True, engine="memory"
+        ).generate()
+
+        content = (project / ASSET).read_bytes()
+        entry = ProjectManifest.load(project).files[ASSET]
+        assert content == asset.read_bytes()
+        assert not any(path.endswith(ASSET) for path in read)
+        assert entry.sha256 == sha256_bytes(content)
+        assert read_blob(project, entry.sha256) == content
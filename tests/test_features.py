@@ -0,0 +1,173 @@
+"""Test feature-aware pruning of template files."""
+
+import json
+import tempfile
+
+import pytest
+
+from egile_mcp_starter.features import FeatureManifest, FeatureRule
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.manifest import ProjectManifest
+from egile_mcp_starter.plugins.builtin import MCPTemplatePlugin
+from egile_mcp_starter.plugins.registry import get_registry
+from egile_mcp_starter.rendering import TemplateRenderer, get_renderer
+from egile_mcp_starter.update import update_project
+
+DISABLED = {
+    "use_docker": "n",
+    "use_github_actions": "n",
+    "license": "None",
+    "server_type": "tools",
+    "include_examples": "n",
+}
+
+
+def _files(project_path):
+    return sorted(
+        p.relative_to(project_path).as_posix()
+        for p in project_path.rglob("*")
+        if p.is_file() and ".egile-mcp-starter" not in p.parts
+    )
+
+
+class TestFeatureManifest:
+    """Test loading and evaluating feature manifests."""
+
+    def test_rule_conditions(self):
+        """Test when and unless conditions."""
+        rule = FeatureRule("x", ["a"], when={"k": ["y"]}, unless={"l": ["None"]})
+
+        assert rule.is_enabled({"k": "y", "l": "MIT"})
+        assert not rule.is_enabled({"k": "n", "l": "MIT"})
+        assert not rule.is_enabled({"k": "y", "l": "None"})
+
+    def test_missing_and_invalid(self, tmp_path):
+        """Test that templates without manifest have no rules."""
+        assert FeatureManifest.load(tmp_path).rules == []
+
+        (tmp_path / "features.json").write_text(json.dumps({"version": 1}))
+        with pytest.raises(ValueError, match="Invalid feature manifest"):
+            FeatureManifest.load(tmp_path)
+
+    def test_unsupported_feature(self):
+        """Test that rules must use features declared by the plugin."""
+        manifest = FeatureManifest([FeatureRule("docker", ["Dockerfile"])])
+
+        with pytest.raises(ValueError, match="unsupported features: docker"):
+            manifest.check(["testing"])
+
+    @pytest.mark.parametrize("name", ["mcp", "rag"])
+    def test_builtin_manifests_match_supported_features(self, name):
+        """Test that built-in manifests only use supported features."""
+        plugin = get_registry().get_plugin(name)
+        manifest = plugin.get_feature_manifest()
+
+        assert set(manifest.features) <= set(plugin.get_supported_features())
+
+
+class TestPruning:
+    """Test that disabled features are not generated."""
+
+    def test_disabled_paths_are_never_read(self, monkeypatch):
+        """Test that disabled subtrees are skipped before rendering."""
+        template_dir = get_registry().get_template_path("mcp")
+        renderer = TemplateRenderer(template_dir)
+        context = renderer.build_context(DISABLED)
+        rendered = []
+        original = TemplateRenderer.render_file
+
+        def render_file(self, source, ctx, env, *args):
+            rendered.append(source.path)
+            return original(self, source, ctx, env, *args)
+
+        monkeypatch.setattr(TemplateRenderer, "render_file", render_file)
+        tree = renderer.render(context)
+        paths = [f.path for f in tree]
+
+        assert "Dockerfile" not in paths and "LICENSE" not in paths
+        assert not any(
+            p.startswith((".github", "src/my_mcp_server/prompts")) for p in paths
+        )
+        assert "src/my_mcp_server/tools/__init__.py" in paths
+        assert "src/my_mcp_server/tools/example_tools.py" not in paths
+        assert not any("resources" in path or "Dockerfile" in path for path in rendered)
+        assert "src/my_mcp_server/resources" not in tree.directories
+
+    def test_engines_agree(self, tmp_path):
+        """Test that cookiecutter output is pruned like the memory engine's."""
+        projects = {}
+        for engine in ("cookiecutter", "memory"):
+            projects[engine] = MCPProjectGenerator(
+                output_dir=str(tmp_path / engine),
+                no_input=True,
+                use_cache=False,
+                engine=engine,
+                extra_context=DISABLED,
+            ).generate()
+
+        assert _files(projects["cookiecutter"]) == _files(projects["memory"])
+        assert not (projects["cookiecutter"] / ".github").exists()
+        assert not (projects["cookiecutter"] / "src/my_mcp_server/prompts").exists()
+        manifest = ProjectManifest.load(projects["cookiecutter"])
+        assert "Dockerfile" not in manifest.files
+
+    def test_cookiecutter_skips_disabled_paths(self, tmp_path, monkeypatch):
+        """Test that cookiecutter never renders the files of disabled features."""
+        import cookiecutter.generate
+
+        rendered = []
+        original = cookiecutter.generate.generate_file
+
+        def generate_file(project_dir, infile, *args, **kwargs):
+            rendered.append(infile)
+            return original(project_dir, infile, *args, **kwargs)
+
+        monkeypatch.setattr(cookiecutter.generate, "generate_file", generate_file)
+        (tmp_path / "tmp").mkdir()
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "tmp"))
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"),
+            no_input=True,
+            use_cache=False,
+            extra_context=DISABLED,
+        ).generate()
+
+        assert any(path.endswith("pyproject.toml") for path in rendered)
+        assert not any("Dockerfile" in path or "resources" in path for path in rendered)
+        assert not any(path.endswith("LICENSE") for path in rendered)
+        assert (project / "README.md").is_file()
+        assert list((tmp_path / "tmp").iterdir()) == []  # Mirror removed
+
+    @pytest.mark.parametrize("engine", ["cookiecutter", "memory"])
+    def test_unsupported_feature_fails_generation(self, tmp_path, monkeypatch, engine):
+        """Test that generations check the manifest against the plugin."""
+        monkeypatch.setattr(MCPTemplatePlugin, "get_supported_features", lambda s: [])
+
+        with pytest.raises(Exception, match="unsupported features"):
+            MCPProjectGenerator(
+                output_dir=str(tmp_path / "out"),
+                no_input=True,
+                use_cache=False,
+                engine=engine,
+            ).generate()
+        assert not (tmp_path / "out" / "my_mcp_server").exists()
+
+    def test_precompile_ignores_features(self):
+        """Test that precompiling covers the files of every feature."""
+        renderer = get_renderer(get_registry().get_template_path("mcp"))
+        context = renderer.build_context()
+        _, sources = renderer.walk(context, prune=False)
+        rendered = [s for s in sources if renderer.is_rendered(s, context)]
+
+        assert renderer.precompile() == len(rendered)
+
+    def test_update_removes_disabled_files(self, tmp_path):
+        """Test that disabling a feature removes its unmodified files."""
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path), no_input=True
+        ).generate()
+
+        result = update_project(project, {"use_docker": "n"})
+
+        assert result.changes["Dockerfile"] == "removed"
+        assert not (project / "docker-compose.yml").exists()
@@ -0,0 +1,179 @@
+"""Test isolated execution of external plugin hooks."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from egile_mcp_starter.batch import BatchEntry
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.plugins import registry as registry_module
+from egile_mcp_starter.plugins.builtin import MCPTemplatePlugin
+from egile_mcp_starter.plugins.isolation import HookError, HookLimits, HookPool
+from egile_mcp_starter.plugins.registry import PluginInfo, TemplateRegistry
+
+
+class HookedPlugin(MCPTemplatePlugin):
+    """External plugin whose hooks misbehave on request."""
+
+    instances = 0
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.name = "hooked"
+        type(self).instances += 1
+
+    def pre_generate_hook(self, context):
+        behavior = context.get("behavior")
+        if behavior == "sleep":
+            time.sleep(30)
+        elif behavior == "raise":
+            raise RuntimeError("hook exploded")
+        elif behavior == "allocate":
+            context["blob"] = bytearray(512 * 1024 * 1024)
+        elif behavior == "crash":
+            os._exit(3)
+        return {**context, "hook_pid": os.getpid(), "instances": self.instances}
+
+    def post_generate_hook(self, project_path, context):
+        (project_path / "HOOKED").write_text(str(os.getpid()))
+
+
+INFO = PluginInfo(
+    "hooked", "Misbehaving plugin", module=__name__, class_name="HookedPlugin"
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Register the plugin as if discovered via entry points."""
+    registry = TemplateRegistry()
+    registry.register_lazy(INFO, external=True)
+    monkeypatch.setattr(registry_module, "_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def pool():
+    """A hook pool with a single worker."""
+    with HookPool(HookLimits(timeout=10)) as pool:
+        yield pool
+
+
+class TestHookPool:
+    """Test HookPool."""
+
+    def test_plugin_is_instantiated_once_per_worker(self, pool):
+        """Test that workers keep their plugin instances across calls."""
+        first = pool.call(INFO, "pre_generate_hook", {})
+        second = pool.call(INFO, "pre_generate_hook", {})
+
+        assert first["hook_pid"] == second["hook_pid"] != os.getpid()
+        assert first["instances"] == second["instances"] == 1
+
+    def test_error(self, pool):
+        """Test that exceptions are reported with the worker's traceback."""
+        with pytest.raises(HookError, match="hook exploded") as info:
+            pool.call(INFO, "pre_generate_hook", {"behavior": "raise"})
+        failure = info.value.failure
+
+        assert (failure.plugin, failure.hook, failure.reason) == (
+            "hooked",
+            "pre_generate_hook",
+            "error",
+        )
+        assert "RuntimeError: hook exploded" in failure.traceback
+        assert pool.call(INFO, "pre_generate_hook", {})["instances"] == 1
+
+    def test_timeout_replaces_worker(self):
+        """Test that a hung hook is killed and its worker replaced."""
+        with HookPool(HookLimits(timeout=0.5)) as pool:
+            pid = pool.call(INFO, "pre_generate_hook", {})["hook_pid"]
+            start = time.perf_counter()
+            with pytest.raises(HookError) as info:
+                pool.call(INFO, "pre_generate_hook", {"behavior": "sleep"})
+            elapsed = time.perf_counter() - start
+
+            assert info.value.failure.reason == "timeout"
+            assert elapsed < 10
+            assert pool.call(INFO, "pre_generate_hook", {})["hook_pid"] != pid
+            assert len(pool._workers) == 1 and pool._idle.qsize() == 1
+
+    def test_crash(self, pool):
+        """Test that a worker exiting mid-hook is reported and replaced."""
+        with pytest.raises(HookError, match="exited with code 3") as info:
+            pool.call(INFO, "pre_generate_hook", {"behavior": "crash"})
+
+        assert info.value.failure.reason == "crash"
+        assert pool.call(INFO, "pre_generate_hook", {})["instances"] == 1
+
+    def test_dead_idle_worker_is_replaced(self, pool):
+        """Test that a worker that died while idle is dropped from the pool."""
+        pid = pool.call(INFO, "pre_generate_hook", {})["hook_pid"]
+        (dead,) = pool._workers
+        dead.process.kill()
+        dead.process.join()
+
+        assert pool.call(INFO, "pre_generate_hook", {})["hook_pid"] != pid
+        assert len(pool._workers) == 1 and dead not in pool._workers
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="Relies on RLIMIT_AS")
+    def test_memory_limit(self):
+        """Test that a hook exceeding the memory limit fails cleanly."""
+        with HookPool(HookLimits(memory_limit=384 * 1024 * 1024)) as pool:
+            with pytest.raises(HookError) as info:
+                pool.call(INFO, "pre_generate_hook", {"behavior": "allocate"})
+
+            assert info.value.failure.reason == "memory"
+            assert pool.call(INFO, "pre_generate_hook", {})["instances"] == 1
+
+    def test_unknown_hook(self, pool):
+        """Test that only generation hooks can be called."""
+        with pytest.raises(ValueError, match="Unknown plugin hook"):
+            pool.call(INFO, "get_template_path")
+
+
+class TestIsolatedGeneration:
+    """Test generations running external hooks in a pool."""
+
+    def test_external_hooks_run_in_pool(self, tmp_path, registry, pool):
+        """Test that both hooks of an external plugin run in a worker."""
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"),
+            no_input=True,
+            template="hooked",
+            hook_pool=pool,
+        ).generate()
+
+        assert int((project / "HOOKED").read_text()) != os.getpid()
+
+    def test_builtin_hooks_run_in_process(self, tmp_path, registry, pool):
+        """Test that the hooks of built-in plugins are not isolated."""
+        registry.unregister("hooked")
+        registry.register_lazy(INFO)
+
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"),
+            no_input=True,
+            template="hooked",
+            hook_pool=pool,
+        ).generate()
+
+        assert int((project / "HOOKED").read_text()) == os.getpid()
+
+    def test_batch_reports_hook_failures(self, tmp_path, registry):
+        """Test that batch results carry the structured hook failure."""
+        entries = [
+            BatchEntry("hooked", {"behavior": "raise"}, str(tmp_path / "a")),
+            BatchEntry("hooked", {}, str(tmp_path / "b")),
+        ]
+
+        failed, generated = MCPProjectGenerator.generate_many(
+            entries, max_workers=1, hook_limits=HookLimits(timeout=10)
+        )
+
+        assert failed.hook_failure.reason == "error"
+        assert "hook exploded" in failed.error
+        assert generated.ok and generated.hook_failure is None
+        assert (generated.project_path / "HOOKED").is_file()
@@ -0,0 +1,178 @@
+"""Test offline dependency locks."""
+
+import subprocess
+import sys
+
+import pytest
+
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.lock import (
+    LOCK_FILE,
+    LockedPackage,
+    LockSource,
+    format_lock,
+    get_lock_source,
+    lock_dependencies,
+    normalize_requirements,
+)
+
+
+class TestLock:
+    """Test resolving and caching locks."""
+
+    def test_normalize_requirements(self):
+        """Test that duplicates and standard library modules are dropped."""
+        requirements = [
+            "fastmcp",
+            "sqlite3",
+            "PyYAML>=6",
+            "pyyaml",
+            "zope_interface",
+            "Zope.Interface",
+            "chromadb",
+        ]
+
+        assert normalize_requirements(requirements) == [
+            "chromadb",
+            "fastmcp",
+            "PyYAML>=6",
+            "zope_interface",
+        ]
+
+    def test_resolves_transitive_dependencies(self, wheelhouse):
+        """Test that every distribution is pinned with its hash."""
+        directory, hashes = wheelhouse
+
+        content = lock_dependencies(["alpha", "sqlite3"], str(directory))
+
+        assert f"alpha==1.0 \\\n    --hash=sha256:{hashes['alpha']}" in content
+        assert f"beta==1.2 \\\n    --hash=sha256:{hashes['beta']}" in content
+        assert "--require-hashes" in content
+
+    def test_unhashed_lock_header(self):
+        """Test that hash checking is only advertised when hashes are written."""
+        source = LockSource("https://pypi.internal/simple", [], "")
+        packages = [
+            LockedPackage("alpha", "1.0", "ab" * 32),
+            LockedPackage("beta", "1.2"),
+        ]
+
+        content = format_lock(packages, source, "3.11")
+
+        assert f"pip install --no-deps -r {LOCK_FILE}\n" in content
+        assert "--require-hashes" not in content and "--hash=" not in content
+
+    def test_cached_per_dependency_set(self, wheelhouse, build_wheel, monkeypatch):
+        """Test that pip only runs for new dependency sets or sources."""
+        directory, _ = wheelhouse
+        calls = []
+        run = subprocess.run
+
+        def counting_run(*args, **kwargs):
+            calls.append(args)
+            return run(*args, **kwargs)
+
+        monkeypatch.setattr(subprocess, "run", counting_run)
+        first = lock_dependencies(["alpha"], str(directory))
+        second = lock_dependencies(["alpha", "alpha"], str(directory))
+        lock_dependencies(["beta"], str(directory))
+        build_wheel(directory, "beta", "1.3")
+        third = lock_dependencies(["alpha"], str(directory))
+
+        assert first == second
+        assert "beta==1.3" in third
+        assert len(calls) == 3
+
+    def test_invalid_source_and_unresolvable(self, wheelhouse, tmp_path):
+        """Test that bad sources and missing packages raise ValueError."""
+        directory, _ = wheelhouse
+
+        with pytest.raises(ValueError, match="neither a wheelhouse"):
+            get_lock_source(str(tmp_path / "missing"))
+        with pytest.raises(ValueError, match="Could not resolve dependencies"):
+            lock_dependencies(["gamma"], str(directory))
+
+    def test_generated_project_gets_lock(self, wheelhouse, tmp_path, monkeypatch):
+        """Test that the plugin's computed dependencies are locked."""
+        directory, _ = wheelhouse
+        monkeypatch.setattr(
+            "egile_mcp_starter.plugins.builtin.rag_template.RAGTemplatePlugin"
+            ".get_dependencies",
+            lambda self, context: ["alpha", "sqlite3"],
+        )
+
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"),
+            no_input=True,
+            template="rag",
+            lock_source=str(directory),
+        ).generate()
+
+        assert "beta==1.2" in (project / LOCK_FILE).read_text()
+
+    def test_lock_targets_project_python(self, wheelhouse, tmp_path, monkeypatch):
+        """Test that the lock is resolved for the project's Python version."""
+        directory, _ = wheelhouse
+        monkeypatch.setattr(
+            "egile_mcp_starter.plugins.builtin.mcp_template.MCPTemplatePlugin"
+            ".get_dependencies",
+            lambda self, context: ["alpha"],
+        )
+        other = "3.10" if sys.version_info[:2] != (3, 10) else "3.12"
+
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"),
+            no_input=True,
+            extra_context={"python_version": other},
+            lock_source=str(directory),
+        ).generate()
+        running = lock_dependencies(["alpha"], str(directory))
+
+        content = (project / LOCK_FILE).read_text()
+        assert f"for Python {other} " in content
+        assert "beta==1.2" in content
+        assert f"for Python {other} " not in running
+
+    @pytest.mark.parametrize("engine", ["cookiecutter", "memory"])
+    def test_interactive_lock_follows_answers(
+        self, wheelhouse, tmp_path, monkeypatch, engine
+    ):
+        """Test that prompted choices, not the defaults, decide the lock."""
+        directory, _ = wheelhouse
+        other = "3.10" if sys.version_info[:2] != (3, 10) else "3.12"
+        answers = {"python_version": other, "vector_db": "qdrant"}
+        config = tmp_path / "config.yaml"
+        config.write_text(f"replay_dir: {tmp_path / 'replay'}\n")
+        locked = []
+
+        def get_dependencies(self, context):
+            locked.append(context["_computed_dependencies"])
+            return ["alpha"]
+
+        monkeypatch.setattr(
+            "egile_mcp_starter.plugins.builtin.rag_template.RAGTemplatePlugin"
+            ".get_dependencies",
+            get_dependencies,
+        )
+        monkeypatch.setattr(
+            "cookiecutter.prompt.read_user_variable",
+            lambda name, default, *args, **kwargs: default,
+        )
+        monkeypatch.setattr(
+            "cookiecutter.prompt.read_user_choice",
+            lambda name, options, *args, **kwargs: answers.get(name, options[0]),
+        )
+
+        project = MCPProjectGenerator(
+            output_dir=str(tmp_path / "out"),
+            no_input=False,
+            template="rag",
+            config_file=str(config),
+            use_cache=False,
+            engine=engine,
+            lock_source=str(directory),
+        ).generate()
+
+        assert f"for Python {other} " in (project / LOCK_FILE).read_text()
+        assert any("qdrant" in dependency for dependency in locked[0])
+        assert not any("chroma" in dependency for dependency in locked[0])
@@ -0,0 +1,132 @@
+"""Test validation of template choice matrices."""
+
+import itertools
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.matrix import (
+    Combination,
+    count_combinations,
+    expand_full,
+    expand_pairwise,
+    expand_sampled,
+    run_matrix,
+    summarize,
+    validate_combination,
+)
+from egile_mcp_starter.plugins.base import TemplatePlugin
+from egile_mcp_starter.plugins.registry import TemplateRegistry
+
+CHOICES = {
+    "a": ["1", "2", "3"],
+    "b": ["x", "y"],
+    "c": ["p", "q", "r"],
+    "d": ["y", "n"],
+}
+
+
+class BrokenTemplatePlugin(TemplatePlugin):
+    """Plugin whose template renders invalid Python for one choice."""
+
+    def __init__(self, template_dir: Path):
+        super().__init__("broken", "Template with a bad combination", "1.0.0")
+        self.template_dir = template_dir
+
+    def get_template_path(self) -> Path:
+        return self.template_dir
+
+    def get_default_context(self):
+        return {}
+
+
+@pytest.fixture
+def broken_template(tmp_path, monkeypatch):
+    """A template rendering a syntax error when flavor is 'bad'."""
+    template = tmp_path / "template"
+    root = template / "{{cookiecutter.slug}}"
+    root.mkdir(parents=True)
+    (template / "cookiecutter.json").write_text(
+        json.dumps({"slug": "demo", "flavor": ["good", "bad"], "size": ["s", "m"]})
+    )
+    (root / "app.py").write_text(
+        "{% if cookiecutter.flavor == 'bad' %}def broken(:\n"
+        "{% else %}SIZE = '{{ cookiecutter.size }}'\n{% endif %}"
+    )
+
+    registry = TemplateRegistry()
+    registry.register(BrokenTemplatePlugin(template))
+    monkeypatch.setattr("egile_mcp_starter.plugins.registry._registry", registry)
+    return template
+
+
+class TestExpansion:
+    """Test the ways of choosing combinations."""
+
+    def test_full(self):
+        """Test that the full matrix has every combination once."""
+        combinations = expand_full(CHOICES)
+
+        assert len(combinations) == count_combinations(CHOICES) == 36
+        assert len({tuple(c.values()) for c in combinations}) == 36
+
+    def test_sampled(self):
+        """Test that samples are distinct, reproducible and capped."""
+        sample = expand_sampled(CHOICES, 10, seed=3)
+
+        assert sample == expand_sampled(CHOICES, 10, seed=3)
+        assert len({tuple(c.values()) for c in sample}) == 10
+        assert all(c in expand_full(CHOICES) for c in sample)
+        assert len(expand_sampled(CHOICES, 1000)) == 36
+
+    def test_pairwise_covers_every_pair(self):
+        """Test that every pair of values appears in some combination."""
+        combinations = expand_pairwise(CHOICES)
+
+        assert len(combinations) < 36
+        for first, second in itertools.combinations(CHOICES, 2):
+            seen = {(c[first], c[second]) for c in combinations}
+            assert seen == set(itertools.product(CHOICES[first], CHOICES[second]))
+
+
+class TestValidation:
+    """Test rendering and compiling combinations."""
+
+    def test_syntax_errors_are_reported(self, broken_template):
+        """Test that invalid Python is reported with its location."""
+        good = validate_combination(Combination("broken", {"flavor": "good"}))
+        bad = validate_combination(Combination("broken", {"flavor": "bad"}))
+
+        assert good.ok and good.files == 1
+        assert not bad.ok
+        assert bad.failures[0].startswith("app.py:1: ")
+
+    def test_passing_combinations_are_cached(self, broken_template):
+        """Test that only combinations that passed are skipped next time."""
+        first = run_matrix(["broken"], "full", max_workers=1)
+        second = run_matrix(["broken"], "full", max_workers=1)
+
+        assert summarize(first)["failed"] == 2
+        assert summarize(first)["cached"] == 0
+        assert [r.cached for r in second] == [not r.failures for r in first]
+        assert summarize(second)["failed"] == 2
+
+    def test_process_pool(self):
+        """Test that combinations are validated across worker processes."""
+        results = run_matrix(["mcp"], "sampled", size=4, max_workers=2)
+
+        assert len(results) == 4
+        assert all(result.ok and result.files > 0 for result in results)
+
+    def test_validate_matrix_command(self, broken_template):
+        """Test the validate-matrix CLI command."""
+        result = CliRunner().invoke(
+            main, ["validate-matrix", "-t", "broken", "--mode", "full", "-j", "1"]
+        )
+
+        assert result.exit_code == 1
+        assert "broken [flavor=bad, size=s]" in result.output
+        assert "broken: 2/4 combinations passed" in result.output
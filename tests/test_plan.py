@@ -0,0 +1,62 @@
+"""Test dry-run planning of generations."""
+
+from click.testing import CliRunner
+
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.plan import CHANGE, CREATE, SKIP, GenerationPlan
+
+
+class TestGenerationPlan:
+    """Test generate(plan_only=True)."""
+
+    def test_plan_for_new_project(self, tmp_path):
+        """Test that every file would be created and nothing is written."""
+        output_dir = tmp_path / "out"
+        generator = MCPProjectGenerator(output_dir=str(output_dir), no_input=True)
+
+        plan = generator.generate(plan_only=True)
+
+        assert isinstance(plan, GenerationPlan)
+        assert plan.project_path == output_dir / "my_mcp_server"
+        assert {planned.action for planned in plan.files} == {CREATE}
+        assert "src/my_mcp_server/server.py" in [p.path for p in plan.files]
+        assert plan.total_bytes > 0
+        assert not output_dir.exists()
+
+    def test_plan_against_existing_project(self, tmp_path):
+        """Test changed and skipped files, with diffs of the changes."""
+        generator = MCPProjectGenerator(output_dir=str(tmp_path), no_input=True)
+        project_path = generator.generate()
+        readme = project_path / "README.md"
+        readme.write_text(readme.read_text() + "Local line\n")
+        (project_path / "Dockerfile").unlink()
+
+        plan = generator.generate(plan_only=True, diff=True)
+        by_path = {planned.path: planned for planned in plan.files}
+
+        assert by_path["README.md"].action == CHANGE
+        assert by_path["README.md"].existing_size == readme.stat().st_size
+        assert "-Local line\n" in by_path["README.md"].diff
+        assert by_path["Dockerfile"].action == CREATE
+        assert by_path["pyproject.toml"].action == SKIP
+        assert by_path["pyproject.toml"].diff is None
+        assert not (project_path / "Dockerfile").exists()
+
+
+class TestDryRunCommand:
+    """Test the --dry-run CLI option."""
+
+    def test_dry_run(self, tmp_path):
+        """Test that --dry-run reports the plan without generating."""
+        output_dir = tmp_path / "out"
+        result = CliRunner().invoke(
+            main,
+            ["--no-input", "--dry-run", "--template", "rag", "-o", str(output_dir)],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "(nothing written)" in result.output
+        assert "create src/my_rag_mcp_server/vector_store.py" in result.output
+        assert "change 0 and skip 0 files" in result.output
+        assert not output_dir.exists()
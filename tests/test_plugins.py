@@ -1,5 +1,8 @@
 """Test the plugin system functionality."""
 
+import json
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -9,7 +12,13 @@ from egile_mcp_starter.generator import MCPProjectGenerator
 from egile_mcp_starter.plugins.base import TemplatePlugin
 from egile_mcp_starter.plugins.builtin.mcp_template import MCPTemplatePlugin
 from egile_mcp_starter.plugins.builtin.rag_template import RAGTemplatePlugin
-from egile_mcp_starter.plugins.registry import TemplateRegistry, get_registry
+from egile_mcp_starter.plugins.registry import (
+    BUILTIN_INDEX,
+    PluginInfo,
+    TemplateRegistry,
+    build_builtin_index,
+    get_registry,
+)
 
 
 class TestTemplatePlugin:
@@ -112,6 +121,67 @@ class TestTemplateRegistry:
         assert registry1 is registry2
 
 
+class TestLazyRegistry:
+    """Test index-backed lazy loading of plugins."""
+
+    def test_builtin_index_is_up_to_date(self):
+        """Test that the precomputed index matches the built-in plugins.
+
+        Regenerate it with ``write_builtin_index()`` after changing a plugin.
+        """
+        assert json.loads(BUILTIN_INDEX.read_text()) == build_builtin_index()
+
+    def test_listing_does_not_import_plugins(self):
+        """Test that listing templates imports neither plugins nor cookiecutter."""
+        code = (
+            "import sys\n"
+            "from egile_mcp_starter.cli import main\n"
+            "from egile_mcp_starter.plugins.registry import get_registry\n"
+            "infos = get_registry().list_plugin_info()\n"
+            "print(sorted(i.name for i in infos))\n"
+            "print(sorted(m for m in sys.modules if m.endswith('_template')"
+            " or m.startswith('cookiecutter')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.splitlines() == ["['mcp', 'rag']", "[]"]
+
+    def test_plugin_loaded_on_first_use(self):
+        """Test that a lazily registered plugin is imported on demand."""
+        registry = TemplateRegistry()
+        registry.unregister("mcp")
+        registry.register_lazy(
+            PluginInfo(
+                name="mcp",
+                description="Lazy MCP",
+                module="egile_mcp_starter.plugins.builtin.mcp_template",
+                class_name="MCPTemplatePlugin",
+            )
+        )
+
+        assert registry.get_plugin_info("mcp").description == "Lazy MCP"
+        assert isinstance(registry.get_plugin("mcp"), MCPTemplatePlugin)
+
+    def test_broken_lazy_plugin_is_skipped(self):
+        """Test that a plugin failing to import is dropped, not raised."""
+        registry = TemplateRegistry()
+        registry.register_lazy(
+            PluginInfo(name="broken", description="", module="does.not.exist")
+        )
+
+        assert registry.get_plugin("broken") is None
+        assert "broken" not in registry.get_plugin_names()
+
+    def test_register_lazy_duplicate_raises_error(self):
+        """Test that lazy registration also rejects duplicate names."""
+        registry = TemplateRegistry()
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register_lazy(PluginInfo(name="rag", description="Duplicate"))
+
+
 class TestMCPTemplatePlugin:
     """Test the MCP template plugin."""
 
@@ -180,6 +250,19 @@ class TestMCPTemplatePlugin:
             # Should not raise any exceptions
             self.plugin.post_generate_hook(project_path, context)
 
+    def test_dependencies_match_pyproject(self, tmp_path):
+        """Test that locked dependencies are those of the generated project."""
+        tomllib = pytest.importorskip("tomllib")
+        generator = MCPProjectGenerator(output_dir=str(tmp_path), no_input=True)
+        project = generator.generate()
+        context = self.plugin.pre_generate_hook(self.plugin.get_default_context())
+
+        pyproject = tomllib.loads((project / "pyproject.toml").read_text())
+
+        assert self.plugin.get_dependencies(context) == (
+            pyproject["project"]["dependencies"]
+        )
+
 
 class TestRAGTemplatePlugin:
     """Test the RAG template plugin."""
@@ -0,0 +1,91 @@
+"""Test per-phase generation profiles."""
+
+import json
+import time
+
+from click.testing import CliRunner
+
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.events import PhaseCompleted
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.plugins.builtin.mcp_template import MCPTemplatePlugin
+from egile_mcp_starter.profiling import GenerationProfile
+
+
+def _generator(output_dir, **kwargs):
+    return MCPProjectGenerator(output_dir=str(output_dir), no_input=True, **kwargs)
+
+
+class TestGenerationProfile:
+    """Test generate(profile=True)."""
+
+    def test_memory_engine_phases(self, tmp_path):
+        """Test that every phase and file of a memory render is timed."""
+        profile = _generator(tmp_path / "out", engine="memory").generate(profile=True)
+
+        assert isinstance(profile, GenerationProfile)
+        assert list(profile.phases) == [
+            "engine_import",
+            "registry_lookup",
+            "default_context",
+            "pre_generate_hook",
+            "template_context",
+            "template_compile",
+            "render",
+            "write",
+            "manifest",
+            "cache_store",
+            "publish",
+            "post_generate_hook",
+        ]
+        assert profile.files_written == len(profile.files)
+        sizes = sum(
+            (profile.project_path / f.path).stat().st_size for f in profile.files
+        )
+        assert profile.bytes_written == sizes
+        slowest = profile.slowest_files(3)
+        assert len(slowest) == 3
+        assert slowest[0].duration >= slowest[-1].duration
+        assert all(f.compile_duration <= f.duration for f in profile.files)
+
+    def test_cookiecutter_engine_and_cache(self, tmp_path):
+        """Test profiles of cookiecutter renders and cache hits."""
+        first = _generator(tmp_path / "a").generate(profile=True)
+        second = _generator(tmp_path / "b").generate(profile=True)
+
+        assert "cookiecutter" in first.phases and not first.files
+        assert first.files_written > 0 and not first.cached
+        assert second.cached and "cookiecutter" not in second.phases
+
+    def test_slow_plugin_hook_is_visible(self, tmp_path, monkeypatch):
+        """Test that time spent in plugin code is attributed to its hook."""
+        original = MCPTemplatePlugin.pre_generate_hook
+
+        def slow_hook(self, context):
+            time.sleep(0.05)
+            return original(self, context)
+
+        monkeypatch.setattr(MCPTemplatePlugin, "pre_generate_hook", slow_hook)
+        profile = _generator(tmp_path / "out", use_cache=False).generate(profile=True)
+
+        assert profile.phases["pre_generate_hook"] >= 0.05
+        assert profile.phases["default_context"] < 0.05
+
+    def test_phase_events_are_opt_in(self, tmp_path):
+        """Test that plain generate_iter does not yield phase events."""
+        generator = _generator(tmp_path / "out", use_cache=False)
+
+        assert not any(isinstance(e, PhaseCompleted) for e in generator.generate_iter())
+
+    def test_cli_profile(self, tmp_path):
+        """Test that --profile prints the profile as JSON."""
+        result = CliRunner().invoke(
+            main,
+            ["--no-input", "--output-dir", str(tmp_path / "out"), "--profile"],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["template"] == "mcp"
+        assert data["bytes_written"] > 0
+        assert "post_generate_hook" in data["phases"]
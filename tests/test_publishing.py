@@ -0,0 +1,124 @@
+"""Test atomic publication of generated projects."""
+
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.publishing import (
+    STAGING_PREFIX,
+    StagingDirectory,
+    clean_stale_staging,
+    target_lock,
+)
+from egile_mcp_starter.rendering import RenderedTree
+
+
+def _generate(output_dir, **kwargs):
+    return MCPProjectGenerator(
+        output_dir=str(output_dir), no_input=True, use_cache=False, **kwargs
+    ).generate()
+
+
+@pytest.fixture
+def out(tmp_path):
+    """The output directory of generations."""
+    return tmp_path / "out"
+
+
+class TestPublishing:
+    """Test staging, publishing and locking."""
+
+    @pytest.mark.parametrize("engine", ["cookiecutter", "memory"])
+    def test_generate_publishes_complete_project(self, out, engine):
+        """Test that generation leaves only the finished project behind."""
+        project = _generate(out, engine=engine)
+
+        assert project == out / "my_mcp_server"
+        assert (project / "pyproject.toml").is_file()
+        assert sorted(p.name for p in out.iterdir()) == ["my_mcp_server"]
+
+    def test_failed_generation_leaves_nothing(self, out, monkeypatch):
+        """Test that a generation failing after writing files is discarded."""
+        original = RenderedTree.write_to
+
+        def write_then_fail(self, output_dir, io_workers=1):
+            original(self, output_dir, io_workers)
+            raise OSError("disk on fire")
+
+        monkeypatch.setattr(RenderedTree, "write_to", write_then_fail)
+
+        with pytest.raises(Exception, match="disk on fire"):
+            _generate(out, engine="memory")
+        assert list(out.iterdir()) == []
+
+    @pytest.mark.parametrize("engine", ["cookiecutter", "memory"])
+    def test_existing_project_is_kept(self, out, engine, monkeypatch):
+        """Test that an existing project is detected before any rendering."""
+        existing = out / "my_mcp_server"
+        existing.mkdir(parents=True)
+        (existing / "mine.txt").write_text("keep")
+        rendered = []
+        monkeypatch.setattr(
+            MCPProjectGenerator,
+            "_render_project",
+            lambda self, *args: rendered.append(args),
+        )
+
+        with pytest.raises(Exception, match="already exists"):
+            _generate(out, engine=engine)
+        assert rendered == []
+        assert [p.name for p in existing.iterdir()] == ["mine.txt"]
+        assert sorted(p.name for p in out.iterdir()) == ["my_mcp_server"]
+
+    def test_stale_staging_is_cleaned(self, out):
+        """Test that leftovers of crashed runs are removed, live ones kept."""
+        crashed = out / f"{STAGING_PREFIX}crashed"
+        (crashed / "my_mcp_server").mkdir(parents=True)
+
+        with StagingDirectory(out) as live:
+            assert not crashed.exists()
+            assert clean_stale_staging(out) == []
+            assert live.path.is_dir()
+        assert not live.path.exists()
+
+    def test_concurrent_generations(self, out):
+        """Test that exactly one of several racing generations publishes."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(_generate, out, engine="memory") for _ in range(4)
+            ]
+        errors = [f.exception() for f in futures]
+
+        assert sum(error is None for error in errors) == 1
+        assert all("already exists" in str(e) for e in errors if e is not None)
+        assert sorted(p.name for p in out.iterdir()) == ["my_mcp_server"]
+
+    def test_target_lock_across_processes(self, out):
+        """Test that the target lock excludes other processes."""
+        out.mkdir()
+        target = out / "project"
+        code = (
+            "import sys, time\n"
+            "from egile_mcp_starter.publishing import target_lock\n"
+            "with target_lock(sys.argv[1]):\n"
+            "    print('locked', flush=True)\n"
+            "    time.sleep(0.5)\n"
+        )
+        holder = subprocess.Popen(
+            [sys.executable, "-c", code, str(target)],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        assert holder.stdout.readline().strip() == "locked"
+
+        start = time.perf_counter()
+        with target_lock(target):
+            waited = time.perf_counter() - start
+        holder.wait()
+
+        assert waited > 0.2
+        assert list(out.iterdir()) == []
@@ -0,0 +1,241 @@
+"""Test the in-memory rendering engine."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from cookiecutter.main import cookiecutter
+
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.plugins.registry import get_registry
+from egile_mcp_starter.rendering import (
+    TemplateRenderer,
+    get_bytecode_cache,
+    get_renderer,
+    ordered_map,
+)
+
+
+def _tree(path: Path) -> dict:
+    """Map relative file paths to (content, mode) for comparison."""
+    return {
+        p.relative_to(path).as_posix(): (p.read_bytes(), os.stat(p).st_mode)
+        for p in sorted(path.rglob("*"))
+        if p.is_file()
+    }
+
+
+@pytest.fixture
+def custom_template(tmp_path):
+    """A small template exercising copy-only paths and conditional contents."""
+    template = tmp_path / "template"
+    root = template / "{{cookiecutter.slug}}"
+    (root / "assets").mkdir(parents=True)
+    (root / "{{cookiecutter.slug}}").mkdir()
+    (template / "cookiecutter.json").write_text(
+        json.dumps(
+            {
+                "slug": "demo",
+                "feature": ["y", "n"],
+                "_copy_without_render": ["assets", "*.raw"],
+            }
+        )
+    )
+    (root / "assets" / "{{raw}}.txt").write_text("{{ not rendered }}")
+    (root / "keep.raw").write_text("{{ cookiecutter.slug }}")
+    (root / "{{cookiecutter.slug}}" / "app.py").write_text(
+        "{% if cookiecutter.feature == 'y' %}FEATURE = True\n{% endif %}NAME = "
+        "'{{ cookiecutter.slug }}'\n"
+    )
+    script = root / "run.sh"
+    script.write_text("#!/bin/sh\r\necho {{ cookiecutter.slug }}\r\n")
+    script.chmod(0o755)
+    return template
+
+
+class TestTemplateRenderer:
+    """Test rendering templates into memory."""
+
+    def test_render_matches_cookiecutter(self, custom_template, tmp_path):
+        """Test byte-for-byte parity with cookiecutter, modes included."""
+        expected = cookiecutter(
+            str(custom_template), output_dir=str(tmp_path / "cc"), no_input=True
+        )
+
+        renderer = TemplateRenderer(custom_template)
+        context = renderer.build_context(output_dir=str(tmp_path / "mem"))
+        written = renderer.render(context).write_to(tmp_path / "mem")
+
+        assert _tree(written) == _tree(Path(expected))
+
+    def test_shared_renderer_follows_context_files(self, custom_template):
+        """Test that edited defaults replace the renderer shared by a process."""
+        renderer = get_renderer(custom_template)
+        assert get_renderer(custom_template) is renderer
+
+        config = custom_template / "cookiecutter.json"
+        config.write_text(config.read_text().replace('"demo"', '"edited"'))
+        os.utime(config, ns=(0, 0))  # Even with an unchanged or older mtime
+        fresh = get_renderer(custom_template)
+
+        assert fresh is not renderer
+        assert fresh.build_context()["cookiecutter"]["slug"] == "edited"
+        assert get_renderer(custom_template) is fresh
+
+    def test_copy_without_render_and_conditionals(self, custom_template):
+        """Test copy-only paths and conditional file contents."""
+        renderer = TemplateRenderer(custom_template)
+        tree = renderer.render(renderer.build_context({"feature": "n"}))
+
+        assert tree.project_dir == "demo"
+        assert tree.files["assets/{{raw}}.txt"].content == b"{{ not rendered }}"
+        assert tree.files["keep.raw"].content == b"{{ cookiecutter.slug }}"
+        assert tree.files["demo/app.py"].content == b"NAME = 'demo'\n"
+        assert tree.files["run.sh"].content == b"#!/bin/sh\r\necho demo\r\n"
+        assert tree.files["run.sh"].mode == 0o755
+
+    def test_write_refuses_existing_project(self, custom_template, tmp_path):
+        """Test that an existing project directory is never overwritten."""
+        renderer = TemplateRenderer(custom_template)
+        tree = renderer.render(renderer.build_context())
+        (tmp_path / "demo").mkdir()
+
+        with pytest.raises(FileExistsError):
+            tree.write_to(tmp_path)
+
+    @pytest.mark.parametrize("template", ["mcp", "rag"])
+    def test_bundled_templates_match_cookiecutter(self, template, tmp_path):
+        """Test parity with cookiecutter for the bundled templates."""
+        plugin = get_registry().get_plugin(template)
+        context = plugin.pre_generate_hook(plugin.get_default_context())
+        expected = cookiecutter(
+            str(plugin.get_template_path()),
+            output_dir=str(tmp_path / "cc"),
+            no_input=True,
+            extra_context=context,
+        )
+
+        renderer = TemplateRenderer(plugin.get_template_path())
+        tree = renderer.render(renderer.build_context(context))
+
+        assert tree.write_to(tmp_path / "mem").name == Path(expected).name
+        assert _tree(tmp_path / "mem" / tree.project_dir) == _tree(Path(expected))
+
+
+class TestParallelRendering:
+    """Test rendering files concurrently on a thread pool."""
+
+    def test_ordered_map_keeps_order_and_bounds_work(self):
+        """Test that results keep input order with a bounded window."""
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work(item):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.001 * (item % 3))
+            with lock:
+                in_flight[0] -= 1
+            return item * 2
+
+        assert list(ordered_map(work, range(50), 4)) == list(range(0, 100, 2))
+        assert peak[0] <= 8
+
+    @pytest.mark.parametrize("template", ["mcp", "rag"])
+    def test_parallel_render_is_deterministic(self, template, tmp_path):
+        """Test that threads change neither contents nor order."""
+        plugin = get_registry().get_plugin(template)
+        renderer = TemplateRenderer(plugin.get_template_path())
+        context = renderer.build_context(plugin.get_default_context())
+
+        sequential = renderer.render(context)
+        parallel = renderer.render(context, max_workers=8)
+
+        assert list(parallel.files) == list(sequential.files)
+        assert parallel == sequential
+        written = parallel.write_to(tmp_path / "parallel", io_workers=8)
+        sequential.write_to(tmp_path / "sequential")
+        assert _tree(written) == _tree(tmp_path / "sequential" / written.name)
+
+    def test_generate_with_render_workers(self, tmp_path):
+        """Test generating a project with several render threads."""
+        generator = MCPProjectGenerator(
+            output_dir=str(tmp_path),
+            no_input=True,
+            engine="memory",
+            render_workers=4,
+            use_cache=False,
+        )
+
+        assert (generator.generate() / "src" / "my_mcp_server" / "server.py").exists()
+
+
+class TestGeneratorMemoryEngine:
+    """Test the memory engine through the generator."""
+
+    def test_render_does_not_touch_disk(self, tmp_path):
+        """Test that render() returns a tree without writing anything."""
+        output_dir = tmp_path / "out"
+        generator = MCPProjectGenerator(
+            output_dir=str(output_dir), no_input=True, template="rag"
+        )
+        tree = generator.render()
+
+        assert tree.project_dir == "my_rag_mcp_server"
+        assert "src/my_rag_mcp_server/vector_store.py" in tree.files
+        assert not output_dir.exists()
+
+    def test_generate_with_memory_engine(self, tmp_path):
+        """Test generating a project with the memory engine."""
+        generator = MCPProjectGenerator(
+            output_dir=str(tmp_path), no_input=True, engine="memory", use_cache=False
+        )
+        project_path = generator.generate()
+
+        assert project_path == tmp_path / "my_mcp_server"
+        assert (project_path / "src" / "my_mcp_server" / "server.py").exists()
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine is rejected."""
+        with pytest.raises(ValueError, match="Unknown engine"):
+            MCPProjectGenerator(engine="nope")
+
+
+class TestBytecodeCache:
+    """Test the persistent Jinja bytecode cache."""
+
+    def test_compiled_templates_are_persisted(self, custom_template, tmp_path):
+        """Test that rendering stores bytecode in the shared cache."""
+        cache = get_bytecode_cache()
+        renderer = TemplateRenderer(custom_template)
+        renderer.render(renderer.build_context())
+
+        assert cache is not None
+        assert len(list(cache.path.glob("*.jinja"))) == 2  # app.py and run.sh
+
+    def test_cache_invalidated_by_template_hash(self, custom_template):
+        """Test that editing a template invalidates its cached bytecode."""
+        renderer = TemplateRenderer(custom_template)
+        renderer.render(renderer.build_context())
+
+        app = custom_template / "{{cookiecutter.slug}}" / "{{cookiecutter.slug}}"
+        (app / "app.py").write_text("VERSION = 2\n")
+        fresh = TemplateRenderer(custom_template)
+        tree = fresh.render(fresh.build_context())
+
+        assert tree.files["demo/app.py"].content == b"VERSION = 2\n"
+
+    def test_precompile_command(self):
+        """Test that precompile fills the cache for every template."""
+        result = CliRunner().invoke(main, ["precompile"])
+
+        assert result.exit_code == 0, result.output
+        assert "mcp: compiled" in result.output
+        assert "rag: compiled 7 template files" in result.output
+        assert list(get_bytecode_cache().path.glob("*.jinja"))
@@ -0,0 +1,150 @@
+"""Test reproducible, byte-identical generation."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.events import CacheHit, FileRendered
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.manifest import ProjectManifest
+from egile_mcp_starter.reproducible import (
+    ReproducibleProject,
+    get_source_date_epoch,
+    tree_digest,
+)
+
+EPOCH = 1700000000  # 2023-11-14T22:13:20Z
+
+
+@pytest.fixture(autouse=True)
+def source_date_epoch(monkeypatch):
+    """Pin reproducible generations to a known epoch."""
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", str(EPOCH))
+
+
+def _generator(output_dir, **kwargs):
+    return MCPProjectGenerator(output_dir=str(output_dir), no_input=True, **kwargs)
+
+
+def _snapshot(project_path):
+    """Every entry of a tree with its mode, mtime and content."""
+    entries = {}
+    for root, dirs, files in os.walk(project_path):
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            info = os.lstat(path)
+            content = Path(path).read_bytes() if name in files else None
+            relative = os.path.relpath(path, project_path)
+            entries[relative] = (info.st_mode, info.st_mtime_ns, content)
+    return entries
+
+
+class TestReproducibleGeneration:
+    """Test generate(reproducible=True)."""
+
+    def test_generations_are_identical(self, tmp_path):
+        """Test that engines, umasks and output directories do not matter."""
+        umask = os.umask(0o077)
+        try:
+            first = _generator(tmp_path / "a", use_cache=False).generate(
+                reproducible=True
+            )
+            os.umask(0o002)
+            second = _generator(
+                tmp_path / "b", use_cache=False, engine="memory", render_workers=4
+            ).generate(reproducible=True)
+        finally:
+            os.umask(umask)
+
+        assert isinstance(first, ReproducibleProject)
+        assert first.project_path == tmp_path / "a" / "my_mcp_server"
+        assert first.tree_digest == second.tree_digest
+        assert _snapshot(first.project_path) == _snapshot(second.project_path)
+        assert first.project_path.stat().st_mtime == EPOCH
+        assert "Copyright (c) 2023" in (first.project_path / "LICENSE").read_text()
+        manifest = ProjectManifest.load(first.project_path)
+        assert {entry.mode for entry in manifest.files.values()} <= {0o644, 0o755}
+
+    def test_cache_hits(self, tmp_path):
+        """Test that cached renders are reused without being modified."""
+        first = _generator(tmp_path / "a").generate(reproducible=True)
+        events = list(_generator(tmp_path / "b").generate_iter(reproducible=True))
+        digest = events[-1].tree_digest
+        regular = list(_generator(tmp_path / "c").generate_iter())
+
+        assert any(isinstance(event, CacheHit) for event in events)
+        assert digest == first.tree_digest
+        assert _snapshot(tmp_path / "a" / "my_mcp_server") == _snapshot(
+            tmp_path / "b" / "my_mcp_server"
+        )
+        assert not any(isinstance(event, CacheHit) for event in regular)
+        assert regular[-1].tree_digest is None
+
+    def test_clock_is_only_frozen_while_generating(self, tmp_path):
+        """Test that regular generations still render the current date."""
+        _generator(tmp_path / "a", use_cache=False).generate(reproducible=True)
+        project = _generator(tmp_path / "b", use_cache=False).generate()
+
+        year = time.gmtime().tm_year
+        assert f"Copyright (c) {year}" in (project / "LICENSE").read_text()
+        assert project.stat().st_mtime > EPOCH
+
+    @pytest.mark.parametrize("engine", ["cookiecutter", "memory"])
+    def test_clock_is_not_frozen_between_events(self, tmp_path, engine):
+        """Test that consumers and interleaved generations see the real date."""
+        year = time.gmtime().tm_year
+        interleaved = None
+        for event in _generator(
+            tmp_path / "a", use_cache=False, engine=engine
+        ).generate_iter(reproducible=True):
+            if isinstance(event, FileRendered) and interleaved is None:
+                interleaved = _generator(tmp_path / "b", use_cache=False).generate()
+
+        assert f"Copyright (c) {year}" in (interleaved / "LICENSE").read_text()
+        license = (tmp_path / "a" / "my_mcp_server" / "LICENSE").read_text()
+        assert "Copyright (c) 2023" in license
+
+    def test_digest_covers_modes_and_content(self, tmp_path):
+        """Test that the digest changes with permissions and content."""
+        project, digest = _generator(tmp_path / "out").generate(reproducible=True)
+
+        (project / "README.md").chmod(0o755)
+        executable = tree_digest(project)
+        (project / "README.md").write_text("changed")
+
+        assert len({digest, executable, tree_digest(project)}) == 3
+
+    def test_cli_reproducible(self, tmp_path):
+        """Test that --reproducible prints the tree digest."""
+        result = CliRunner().invoke(
+            main,
+            ["--no-input", "--output-dir", str(tmp_path / "out"), "--reproducible"],
+        )
+
+        digest = tree_digest(tmp_path / "out" / "my_mcp_server")
+        assert result.exit_code == 0
+        assert f"Tree digest: sha256:{digest}" in result.output
+
+
+class TestSourceDateEpoch:
+    """Test how the source date epoch is chosen."""
+
+    def test_default_is_start_of_year(self, monkeypatch):
+        """Test the default epoch, without SOURCE_DATE_EPOCH."""
+        monkeypatch.delenv("SOURCE_DATE_EPOCH")
+        start = time.gmtime(get_source_date_epoch())
+
+        assert start.tm_year == time.gmtime().tm_year
+        assert (start.tm_yday, start.tm_hour, start.tm_min) == (1, 0, 0)
+
+    @pytest.mark.parametrize("value", ["soon", "-1"])
+    def test_invalid(self, monkeypatch, value):
+        """Test that SOURCE_DATE_EPOCH must be a non-negative integer."""
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", value)
+
+        with pytest.raises(ValueError, match="non-negative integer"):
+            get_source_date_epoch()
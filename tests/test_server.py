@@ -0,0 +1,205 @@
+"""Test the long-running generation service and its MCP server."""
+
+import asyncio
+import base64
+import io
+import sys
+import threading
+import types
+import zipfile
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter import aio
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.server import GenerationService, create_server
+
+
+class FakeFastMCP:
+    """Stand-in for ``fastmcp.FastMCP`` recording tools and runs."""
+
+    def __init__(self, name):
+        self.name = name
+        self.tools = {}
+        self.runs = []
+
+    def tool(self):
+        def register(func):
+            self.tools[func.__name__] = func
+            return func
+
+        return register
+
+    def run(self, **kwargs):
+        self.runs.append(kwargs)
+
+
+@pytest.fixture
+def fake_fastmcp(monkeypatch):
+    """Install a fake fastmcp module."""
+    module = types.ModuleType("fastmcp")
+    module.FastMCP = FakeFastMCP
+    monkeypatch.setitem(sys.modules, "fastmcp", module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def default_limit():
+    """Restore the shared concurrency limit after each test."""
+    yield
+    aio.set_max_concurrency(aio.DEFAULT_MAX_CONCURRENCY)
+
+
+class TestGenerationService:
+    """Test GenerationService."""
+
+    def test_list_templates(self):
+        """Test that every template is described."""
+        templates = {t["name"]: t for t in GenerationService().list_templates()}
+
+        assert set(templates) >= {"mcp", "rag"}
+        assert templates["rag"]["features"]
+
+    def test_generate_project(self, tmp_path, monkeypatch):
+        """Test that projects come back as base64 archives, nothing on disk."""
+        workdir = tmp_path / "work"
+        workdir.mkdir()
+        monkeypatch.chdir(workdir)
+        result = GenerationService().generate_project(
+            "mcp", {"project_name": "Served"}, "zip"
+        )
+
+        assert result["project"] == "served"
+        content = base64.b64decode(result["archive"])
+        assert len(content) == result["size"]
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            assert "served/src/served/server.py" in archive.namelist()
+        assert list(workdir.iterdir()) == []
+
+    def test_plan_project(self, tmp_path):
+        """Test that plans are returned as plain data."""
+        (tmp_path / "out").mkdir()
+        service = GenerationService(root=str(tmp_path))
+        plan = service.plan_project(output_dir="out")
+
+        assert plan["project_path"] == str(tmp_path / "out" / "my_mcp_server")
+        assert plan["created"] == len(plan["files"]) > 0
+        assert plan["files"][0]["action"] == "create"
+        assert service.plan_project(output_dir=str(tmp_path))["created"] > 0
+
+    @pytest.mark.parametrize(
+        "output_dir, context",
+        [
+            ("..", None),
+            ("/", None),
+            ("link", None),
+            (".", {"project_name": "../outside"}),
+        ],
+    )
+    def test_plan_project_is_confined_to_root(self, tmp_path, output_dir, context):
+        """Test that plans never read files outside the server root."""
+        root = tmp_path / "root"
+        root.mkdir()
+        (root / "link").symlink_to(tmp_path)
+        (tmp_path / "outside").mkdir()
+        (tmp_path / "outside" / "README.md").write_text("secret")
+        service = GenerationService(root=str(root))
+
+        with pytest.raises(ValueError, match="outside the server root"):
+            service.plan_project(context=context, output_dir=output_dir, diff=True)
+
+    @pytest.mark.parametrize(
+        "context",
+        [
+            {"project_name": "{{ cycler.__init__.__globals__.os.getcwd() }}"},
+            {"project_description": "{% set x = 1 %}"},
+            {"project_name": ["a", "b"]},
+            {"project_name": {"nested": "value"}},
+        ],
+    )
+    def test_template_code_is_rejected(self, tmp_path, context):
+        """Test that request contexts cannot carry Jinja code or structures."""
+        service = GenerationService(root=str(tmp_path))
+
+        with pytest.raises(ValueError, match="Context value"):
+            service.generate_project(context=context)
+        with pytest.raises(ValueError, match="Context value"):
+            service.plan_project(context=context)
+
+    def test_concurrency_limit(self, monkeypatch):
+        """Test that at most max_concurrency generations run at once."""
+        service = GenerationService(max_concurrency=2)
+        assert aio.get_max_concurrency() == 2
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def render(self):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.05)
+            with lock:
+                running[0] -= 1
+            raise RuntimeError("stop")
+
+        monkeypatch.setattr(
+            "egile_mcp_starter.generator.MCPProjectGenerator.render", render
+        )
+
+        def call():
+            with pytest.raises(RuntimeError):
+                service.plan_project()
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] == 2
+
+    def test_warm_up(self):
+        """Test that templates are compiled ahead of requests."""
+        compiled = GenerationService().warm_up()
+
+        assert compiled["mcp"] > 0 and compiled["rag"] > 0
+
+
+class TestMCPServer:
+    """Test create_server() and the serve command."""
+
+    def test_tools(self, fake_fastmcp):
+        """Test that the generation tools are registered and callable."""
+        server = create_server()
+
+        assert set(server.tools) == {
+            "list_templates",
+            "generate_project",
+            "plan_project",
+        }
+        result = asyncio.run(server.tools["generate_project"](archive_format="tar.gz"))
+        assert result["project"] == "my_mcp_server"
+        assert result["format"] == "tar.gz"
+
+    def test_missing_fastmcp(self, monkeypatch):
+        """Test the error raised without the optional dependency."""
+        monkeypatch.setitem(sys.modules, "fastmcp", None)
+
+        with pytest.raises(ImportError, match="egile-mcp-starter\\[serve\\]"):
+            create_server()
+
+    def test_serve_command(self, fake_fastmcp, monkeypatch):
+        """Test that serve warms up and runs the requested transport."""
+        servers = []
+        monkeypatch.setattr(
+            fake_fastmcp,
+            "FastMCP",
+            lambda name: servers.append(FakeFastMCP(name)) or servers[-1],
+        )
+        result = CliRunner().invoke(main, ["serve", "--transport", "http"])
+
+        assert result.exit_code == 0, result.output
+        assert "compiled" in result.output
+        assert servers[0].runs == [
+            {"transport": "http", "host": "127.0.0.1", "port": 8000}
+        ]
@@ -0,0 +1,234 @@
+"""Test generation manifests and incremental project updates."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.manifest import (
+    MANIFEST_DIR,
+    ProjectManifest,
+    find_variables,
+    read_blob,
+)
+from egile_mcp_starter.merge import merge3
+from egile_mcp_starter.plugins.base import TemplatePlugin
+from egile_mcp_starter.plugins.registry import TemplateRegistry
+from egile_mcp_starter.rendering import TemplateRenderer
+from egile_mcp_starter.update import update_project
+
+
+class LocalTemplatePlugin(TemplatePlugin):
+    """Plugin serving a template from a temporary directory."""
+
+    def __init__(self, template_dir: Path):
+        super().__init__("local", "Local test template", "1.0.0")
+        self.template_dir = template_dir
+
+    def get_template_path(self) -> Path:
+        return self.template_dir
+
+    def get_default_context(self):
+        return {}
+
+
+@pytest.fixture
+def local_template(tmp_path, monkeypatch):
+    """A small template registered in a fresh global registry."""
+    template = tmp_path / "template"
+    root = template / "{{cookiecutter.slug}}"
+    (root / "{{cookiecutter.slug}}").mkdir(parents=True)
+    (template / "cookiecutter.json").write_text(
+        json.dumps({"slug": "demo", "description": "A demo", "version": "0.1.0"})
+    )
+    (root / "README.md").write_text(
+        "# {{ cookiecutter.slug }}\n\n{{ cookiecutter.description }}\n\nUsage\n"
+    )
+    (root / "VERSION").write_text("{{ cookiecutter.version }}\n")
+    (root / "{{cookiecutter.slug}}" / "app.py").write_text("NAME = 'app'\n")
+
+    registry = TemplateRegistry()
+    registry.register(LocalTemplatePlugin(template))
+    monkeypatch.setattr("egile_mcp_starter.plugins.registry._registry", registry)
+    return template
+
+
+@pytest.fixture
+def project(local_template, tmp_path):
+    """A project generated from the local template."""
+    generator = MCPProjectGenerator(
+        output_dir=str(tmp_path / "out"), no_input=True, template="local"
+    )
+    return generator.generate()
+
+
+class TestMerge3:
+    """Test the three-way merge."""
+
+    def test_merges_changes_on_both_sides(self):
+        """Test that non-overlapping changes are combined."""
+        base = b"a\nb\nc\nd\n"
+        result = merge3(base, b"a\nB\nc\nd\n", b"a\nb\nc\nD\ne\n")
+
+        assert result.content == b"a\nB\nc\nD\ne\n"
+        assert result.conflicts == 0
+
+    def test_marks_conflicts(self):
+        """Test that overlapping changes are kept with conflict markers."""
+        result = merge3(b"a\nb\n", b"a\nlocal\n", b"a\ntemplate\n")
+
+        assert result.conflicts == 1
+        assert result.content == (
+            b"a\n<<<<<<< local\nlocal\n||||||| base\nb\n=======\n"
+            b"template\n>>>>>>> template\n"
+        )
+
+
+class TestManifest:
+    """Test the manifest written during generation."""
+
+    def test_generate_writes_manifest(self, project):
+        """Test that every rendered file is recorded with its dependencies."""
+        manifest = ProjectManifest.load(project)
+
+        assert manifest.template == "local"
+        assert manifest.template_version == "1.0.0"
+        assert manifest.context["slug"] == "demo"
+        assert "_output_dir" not in manifest.context
+
+        readme = manifest.files["README.md"]
+        assert readme.variables == ["description", "slug"]
+        assert read_blob(project, readme.sha256) == (project / "README.md").read_bytes()
+        assert manifest.files["{{cookiecutter.slug}}/app.py"].path == "demo/app.py"
+        assert manifest.files["{{cookiecutter.slug}}/app.py"].variables == ["slug"]
+
+    @pytest.mark.parametrize("engine", ["cookiecutter", "memory"])
+    def test_manifest_is_engine_independent(self, local_template, tmp_path, engine):
+        """Test that both engines record the same manifest."""
+        generator = MCPProjectGenerator(
+            output_dir=str(tmp_path / engine),
+            no_input=True,
+            template="local",
+            use_cache=False,
+            engine=engine,
+        )
+        manifest = ProjectManifest.load(generator.generate())
+
+        assert sorted(manifest.files) == [
+            "README.md",
+            "VERSION",
+            "{{cookiecutter.slug}}/app.py",
+        ]
+
+    def test_find_variables(self, local_template):
+        """Test static detection of context dependencies."""
+        renderer = TemplateRenderer(local_template)
+        env = renderer.create_environment(renderer.build_context())
+
+        assert find_variables(env, "{{ cookiecutter['a'] }}{{ cookiecutter.b }}") == [
+            "a",
+            "b",
+        ]
+        assert find_variables(env, "{% for k in cookiecutter %}{% endfor %}") == ["*"]
+        assert find_variables(env, "{% include 'x.txt' %}") == ["*"]
+
+    def test_missing_manifest(self, tmp_path):
+        """Test that updating a project without manifest is rejected."""
+        with pytest.raises(ValueError, match="has no"):
+            ProjectManifest.load(tmp_path)
+
+
+class TestUpdateProject:
+    """Test incremental updates."""
+
+    def test_noop_update(self, project):
+        """Test that nothing is re-rendered when nothing changed."""
+        result = update_project(project)
+
+        assert result.rendered == 0
+        assert result.skipped == 3
+        assert result.changes == {}
+
+    def test_only_dependent_files_rerendered(self, project):
+        """Test that a context change re-renders only files using it."""
+        result = update_project(project, {"version": "0.2.0"})
+
+        assert result.rendered == 1
+        assert result.changes == {"VERSION": "updated"}
+        assert (project / "VERSION").read_text() == "0.2.0\n"
+        assert ProjectManifest.load(project).context["version"] == "0.2.0"
+
+    def test_update_leaves_other_projects_alone(self, project, tmp_path):
+        """Test that updating a cached project never writes through to others."""
+        other = MCPProjectGenerator(
+            output_dir=str(tmp_path / "other"), no_input=True, template="local"
+        ).generate()
+        os.link(project / "VERSION", tmp_path / "linked")
+        manifest = (other / MANIFEST_DIR / "manifest.json").read_text()
+
+        update_project(project, {"version": "0.2.0"})
+
+        assert (project / "VERSION").read_text() == "0.2.0\n"
+        assert (other / "VERSION").read_text() == "0.1.0\n"
+        assert (tmp_path / "linked").read_text() == "0.1.0\n"
+        assert (other / MANIFEST_DIR / "manifest.json").read_text() == manifest
+
+    def test_template_change_merged_with_local_edits(self, project, local_template):
+        """Test a three-way merge of template changes and user edits."""
+        readme = project / "README.md"
+        readme.write_text(readme.read_text() + "\nLocal notes\n")
+        template_readme = local_template / "{{cookiecutter.slug}}" / "README.md"
+        template_readme.write_text(
+            "# {{ cookiecutter.slug }} server\n\n{{ cookiecutter.description }}\n\n"
+            "Usage\n"
+        )
+
+        result = update_project(project)
+
+        assert result.changes == {"README.md": "merged"}
+        assert readme.read_text() == "# demo server\n\nA demo\n\nUsage\n\nLocal notes\n"
+
+    def test_conflicts_are_reported(self, project):
+        """Test that conflicting edits are marked and reported."""
+        (project / "VERSION").write_text("9.9.9\n")
+
+        result = update_project(project, {"version": "0.2.0"})
+
+        assert result.conflicts == ["VERSION"]
+        assert "<<<<<<< local\n9.9.9\n" in (project / "VERSION").read_text()
+
+    def test_added_and_removed_files(self, project, local_template):
+        """Test that new template files are added and dropped ones removed."""
+        root = local_template / "{{cookiecutter.slug}}"
+        (root / "VERSION").unlink()
+        (root / "CHANGELOG.md").write_text("# {{ cookiecutter.slug }}\n")
+
+        result = update_project(project)
+
+        assert result.changes == {"CHANGELOG.md": "added", "VERSION": "removed"}
+        assert not (project / "VERSION").exists()
+        assert (project / "CHANGELOG.md").read_text() == "# demo\n"
+
+    def test_renamed_paths_are_moved(self, project):
+        """Test that files follow a renamed directory, keeping local edits."""
+        (project / "demo" / "app.py").write_text("NAME = 'edited'\n")
+
+        update_project(project, {"slug": "renamed"})
+
+        assert (project / "renamed" / "app.py").read_text() == "NAME = 'edited'\n"
+        assert not (project / "demo").exists()
+
+    def test_update_command(self, project):
+        """Test the update CLI command."""
+        result = CliRunner().invoke(
+            main, ["update", str(project), "--set", "version=1.0.0"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "updated: VERSION" in result.output
+        assert "Re-rendered 1/3 template files" in result.output
+        assert (project / MANIFEST_DIR / "manifest.json").exists()
@@ -0,0 +1,163 @@
+"""Test template watch mode."""
+
+import json
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from egile_mcp_starter.bundles import create_bundle
+from egile_mcp_starter.cli import main
+from egile_mcp_starter.generator import MCPProjectGenerator
+from egile_mcp_starter.plugins.builtin.mcp_template import MCPTemplatePlugin
+from egile_mcp_starter.plugins.registry import TemplateRegistry
+from egile_mcp_starter.watch import TemplateWatcher
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "egile_mcp_starter" / "template"
+ROOT = "{{cookiecutter.project_slug}}"
+
+
+def _tree(root):
+    """Map relative paths to file content."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and not path.is_relative_to(root / ".egile-mcp-starter")
+    }
+
+
+def _use_template(monkeypatch, template_dir):
+    """Make the builtin MCP plugin point at another template."""
+    monkeypatch.setattr(
+        MCPTemplatePlugin, "get_template_path", lambda self: template_dir
+    )
+    monkeypatch.setattr(
+        "egile_mcp_starter.plugins.registry._registry", TemplateRegistry()
+    )
+
+
+@pytest.fixture
+def template(tmp_path, monkeypatch):
+    """An editable copy of the builtin MCP template."""
+    template_dir = shutil.copytree(TEMPLATE_DIR, tmp_path / "template")
+    _use_template(monkeypatch, template_dir)
+    return template_dir
+
+
+@pytest.fixture
+def watcher(template, tmp_path):
+    """A watcher that rendered the template once."""
+    watcher = TemplateWatcher(output_dir=str(tmp_path / "out"))
+    assert watcher.start().error is None
+    return watcher
+
+
+class TestTemplateWatcher:
+    """Test incremental re-rendering of watched templates."""
+
+    def test_start_renders_like_generate(self, watcher, tmp_path):
+        """Test that the first render matches a regular generation."""
+        expected = MCPProjectGenerator(
+            output_dir=str(tmp_path / "expected"), no_input=True, engine="memory"
+        ).generate()
+
+        assert _tree(watcher.project_path) == _tree(expected)
+        assert watcher.poll() is None
+
+    def test_edited_file_renders_alone(self, watcher, template):
+        """Test that editing a template file re-renders only its output."""
+        readme = template / ROOT / "README.md"
+        readme.write_text(readme.read_text() + "\nEdited {{ cookiecutter.version }}\n")
+
+        result = watcher.poll()
+
+        assert result.changed == [f"{ROOT}/README.md"]
+        assert result.rendered == 1
+        assert result.written == ["README.md"]
+        assert result.duration < 1
+        assert "Edited 0.1.0" in (watcher.project_path / "README.md").read_text()
+
+    def test_context_change_renders_dependents(self, watcher, template):
+        """Test that a changed variable re-renders the files reading it only."""
+        notes = template / ROOT / "NOTES.md"
+        notes.write_text("{{ cookiecutter.maintainer | default('nobody') }}")
+        watcher.poll()
+        context_file = template / "cookiecutter.json"
+        context = json.loads(context_file.read_text())
+        context["maintainer"] = "Ada"
+        context_file.write_text(json.dumps(context))
+
+        result = watcher.poll()
+
+        assert result.changed == ["cookiecutter.json"]
+        assert result.rendered == 1
+        assert result.written == ["NOTES.md"]
+        assert (watcher.project_path / "NOTES.md").read_text() == "Ada"
+
+    def test_added_and_removed_files(self, watcher, template):
+        """Test that outputs follow template files being added and removed."""
+        (template / ROOT / "NOTES.md").write_text("{{ cookiecutter.project_name }}")
+        (template / ROOT / "README.md").unlink()
+
+        result = watcher.poll()
+
+        assert result.written == ["NOTES.md"]
+        assert result.removed == ["README.md"]
+        assert not (watcher.project_path / "README.md").exists()
+
+    def test_errors_are_retried(self, watcher, template):
+        """Test that a broken template is reported, then re-rendered when fixed."""
+        readme = template / ROOT / "README.md"
+        original = readme.read_text()
+        readme.write_text("{% if %}")
+
+        broken = watcher.poll()
+        (template / ROOT / "LICENSE").touch()
+        readme.write_text(original + "fixed\n")
+        fixed = watcher.poll()
+
+        assert broken.error and not broken.written
+        assert fixed.error is None
+        assert fixed.changed == [f"{ROOT}/LICENSE", f"{ROOT}/README.md"]
+        assert (watcher.project_path / "README.md").read_text().endswith("fixed\n")
+
+    def test_run_until_stopped(self, watcher, template):
+        """Test that run reports changes until the stop event is set."""
+        stop = threading.Event()
+        results = []
+
+        def on_change(result):
+            results.append(result)
+            stop.set()
+
+        (template / ROOT / "README.md").write_text("changed")
+        watcher.run(on_change, interval=0.01, stop=stop)
+
+        assert [r.written for r in results] == [["README.md"]]
+
+    def test_bundles_cannot_be_watched(self, tmp_path, monkeypatch):
+        """Test that watching a bundled template raises ValueError."""
+        _use_template(monkeypatch, create_bundle(TEMPLATE_DIR, tmp_path / "t.zip"))
+
+        with pytest.raises(ValueError, match="only template directories"):
+            TemplateWatcher(output_dir=str(tmp_path / "out"))
+
+    def test_cli_watch(self, template, tmp_path, monkeypatch):
+        """Test that the watch command renders and stops on Ctrl+C."""
+
+        def interrupt(self, on_change, interval, stop=None):
+            on_change(self.start())
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(TemplateWatcher, "run", interrupt)
+        result = CliRunner().invoke(
+            main,
+            ["watch", "-o", str(tmp_path / "out"), "--set", "project_name=Demo"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "re-rendered" in result.output
+        assert "Stopped watching" in result.output
+        assert (tmp_path / "out" / "demo" / "README.md").is_file()